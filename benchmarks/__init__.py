@@ -0,0 +1,19 @@
+"""Micro-benchmarks of the game engines. They are run from the top-level directory
+(see bin/bench.sh) and print plain-text results to the standard output."""
+import time
+
+
+def best_of(fun, repeat=5):
+    """Runs fun() repeatedly and returns the shortest wall time in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fun()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(name, count, unit, seconds):
+    print("{:40} {:>12.0f} {}/s ({} {} in {:.3f} s)".format(name, count / seconds, unit, count, unit, seconds))
@@ -0,0 +1,46 @@
+"""Appends to the columnar throw archive and vectorised analytics over it."""
+import tempfile
+
+import numpy as np
+
+from dartscorer.stats import analytics
+from dartscorer.stats.archive import ThrowArchive
+
+from . import best_of, report
+
+ROWS = 10000000
+APPENDS = 10
+PLAYERS = 50
+
+
+def synthetic_columns(rows, seed=1):
+    """ Rounds of three throws of two alternating players, a new pair every 40 rounds. """
+    rng = np.random.default_rng(seed)
+    positions = np.arange(rows) % 3
+    rounds = np.arange(rows) // 3
+    return dict(player=(rounds % 2 + rounds // 40 * 2) % PLAYERS,
+                time=1.6e9 + np.arange(rows, dtype=np.float64),
+                points=rng.integers(0, 21, rows), multiplier=rng.integers(1, 4, rows),
+                position=positions, game=np.ones(rows), remaining=rng.integers(0, 502, rows))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        archive = ThrowArchive(tmp_dir)
+        chunk = synthetic_columns(ROWS // APPENDS)
+
+        def append():
+            for _ in range(APPENDS):
+                archive.append_leg(**chunk)
+
+        report("archive append", ROWS, "throws", best_of(append, repeat=1))
+        columns = ThrowArchive(tmp_dir).columns()
+        for name, fun in (("three-dart average", analytics.three_dart_average),
+                          ("first-nine average", analytics.first_nine_average),
+                          ("checkout percentage", analytics.checkout_percentage),
+                          ("segment hit rates", analytics.segment_hit_rates)):
+            report("archive " + name, ROWS, "throws", best_of(lambda: fun(columns), repeat=3))
+
+
+if __name__ == "__main__":
+    main()
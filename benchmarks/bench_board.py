@@ -0,0 +1,22 @@
+"""Classification of board coordinates, exact and by the raster lookup table."""
+import numpy as np
+
+from dartscorer.logic.board import build_raster, classify, coords_to_codes, load_raster
+
+from . import best_of, report
+
+POINTS = 1000000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    xs = rng.normal(0, 60, POINTS)
+    ys = rng.normal(0, 60, POINTS)
+    raster = load_raster()
+    report("board raster generation", 1, "rasters", best_of(build_raster, repeat=1))
+    report("board exact classification", POINTS, "points", best_of(lambda: classify(xs, ys)))
+    report("board raster lookup", POINTS, "points", best_of(lambda: coords_to_codes(xs, ys, raster)))
+
+
+if __name__ == "__main__":
+    main()
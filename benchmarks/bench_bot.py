@@ -0,0 +1,22 @@
+"""Speed of the tree search of the Cricket bot."""
+from dartscorer.logic.cricket import Cricket
+from dartscorer.sim.accuracy import AccuracyModel
+from dartscorer.sim.cricket_bot import CricketBot, _State, _search
+
+from . import report
+
+TIME_BUDGET = 1.0
+
+
+def main():
+    for num_players in (2, 4):
+        game = Cricket(num_players, None, None, scoring=True)
+        bot = CricketBot([AccuracyModel.from_skill()] * num_players, range(num_players))
+        bot.attach(game)
+        # every iteration of the search visits exactly one child of the root
+        iterations = sum(_search(bot.sampler, _State.from_game(game), TIME_BUDGET, 0))
+        report("cricket bot search, {} players".format(num_players), iterations, "iterations", TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Generation of the X01 checkout table and lookups in it."""
+from dartscorer.logic.checkout import build_checkout_table, checkout, MAX_CHECKOUT
+
+from . import best_of, report
+
+LOOKUPS = 100
+
+
+def lookups():
+    for _ in range(LOOKUPS):
+        for remaining in range(1, MAX_CHECKOUT + 1):
+            checkout(remaining, 3)
+            checkout(remaining, 2)
+            checkout(remaining, 1)
+
+
+def main():
+    report("checkout table generation", 1, "tables", best_of(build_checkout_table))
+    report("checkout lookup", LOOKUPS * MAX_CHECKOUT * 3, "lookups", best_of(lookups))
+
+
+if __name__ == "__main__":
+    main()
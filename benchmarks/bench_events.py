@@ -0,0 +1,59 @@
+"""Events per second processed by GameX01 and Cricket through Game.apply(), i.e. without any rendering."""
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier, ZERO_THROW
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+
+from . import best_of, report
+
+LEGS = 2000
+
+
+def x01_leg(num_players):
+    """The first player finishes in nine darts, the others score very little. Corrections
+ (clear, undo) are keyed in as well so that all visitors get exercised."""
+    t20 = throw_to_events(throw_of(20, Multiplier.TRIPLE))
+    clear = [Event(EventType.NUMBER, 5), Event(EventType.ACTION, Action.CLEAR)]
+    weak_round = throw_to_events(throw_of(1, Multiplier.SINGLE)) * 2 + throw_to_events(ZERO_THROW)
+    events = []
+    for _ in range(2):
+        events += clear + t20 * 3 + weak_round * (num_players - 1)
+    events += t20 + throw_to_events(throw_of(17, Multiplier.DOUBLE)) + [Event(EventType.ACTION, Action.UNDO)]
+    events += t20 + throw_to_events(throw_of(7, Multiplier.TRIPLE))
+    return events
+
+
+def cricket_leg(num_players):
+    """The first player closes everything in seven rounds, the others close all numbers but the bull."""
+    events = []
+    for points in range(15, 21):
+        events += throw_to_events(throw_of(points, Multiplier.TRIPLE)) + throw_to_events(ZERO_THROW) * 2
+        events += throw_to_events(throw_of(points, Multiplier.SINGLE)) * 3 * (num_players - 1)
+    events += throw_to_events(throw_of(25, Multiplier.SINGLE)) * 3
+    return events
+
+
+def bench(name, factory, events):
+    output_ctrl = NullDisplayController()
+
+    def run():
+        for _ in range(LEGS):
+            game = factory(output_ctrl)
+            remaining = iter(events)
+            state, _ = game.apply(remaining)
+            assert state.over and next(remaining, None) is None
+
+    report(name, LEGS * len(events), "events", best_of(run))
+
+
+def main():
+    for num_players in (2, 8):
+        bench("GameX01 (501, {} players)".format(num_players),
+              lambda out: GameX01(num_players, None, out), x01_leg(num_players))
+        bench("Cricket ({} players)".format(num_players),
+              lambda out: Cricket(num_players, None, out), cricket_leg(num_players))
+
+
+if __name__ == "__main__":
+    main()
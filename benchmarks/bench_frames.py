@@ -0,0 +1,54 @@
+"""Frames pushed to (and suppressed before) the displays during a game, with fake devices."""
+import time
+
+from dartscorer.display.controller import DisplayController
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.game_x01 import GameX01
+
+KEYPRESSES = 2000
+# redraws per keypress, Game.loop() redraws once, a UI polling for input redraws more often
+REDRAWS = 3
+
+
+class CountingDevice:
+    def __init__(self):
+        self.writes = 0
+
+    def first_line(self, text):
+        self.writes += 1
+
+    def second_line(self, text):
+        self.writes += 1
+
+    def show_message(self, text):
+        self.writes += 1
+
+    def clean_up(self):
+        pass
+
+
+def bench(max_fps):
+    lcd, segment = CountingDevice(), CountingDevice()
+    ctrl = DisplayController(segment, lcd, max_fps)
+    game = GameX01(2, None, ctrl, init_score=10 ** 6)
+    events = throw_to_events(throw_of(20, Multiplier.TRIPLE)) * (KEYPRESSES // 4)
+    start = time.perf_counter()
+    for event in events:
+        for _ in range(REDRAWS):
+            game.redraw()
+        game.step(event)
+    ctrl.flush()
+    elapsed = time.perf_counter() - start
+    ctrl.clean_up()
+    print("{:30} {:>8.0f} redraws/s, {} pushed, {} suppressed, {} coalesced, {} device writes".format(
+        "frames (max fps {})".format(max_fps), len(events) * REDRAWS / elapsed, ctrl.frames_pushed,
+        ctrl.frames_suppressed, ctrl.frames_coalesced, lcd.writes + segment.writes))
+
+
+def main():
+    bench(None)
+    bench(30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Bytes per second the LCD transports achieve writing whole lines, driving a fake RPi.GPIO
+(so the numbers show the cost of the transport itself: the calls and the waiting)."""
+import time
+
+from dartscorer.display import fake_gpio
+from dartscorer.display.transport import GpioTransport, LegacyTransport, TIMING_PROFILES
+
+fake_gpio.install()
+from dartscorer.display import lcd  # noqa: E402 (needs the fake RPi.GPIO)
+
+PINS = (lcd.LCD_RS, lcd.LCD_E, (lcd.LCD_D4, lcd.LCD_D5, lcd.LCD_D6, lcd.LCD_D7))
+LINES = ("501 441 T20 S5", "20 19 18 17 16 ", "checkout T20 D20")
+
+
+def bench(name, transport, duration):
+    fake_gpio.reset()
+    controller = fake_gpio.watch(*PINS)
+    display = lcd.LcdDisplay(transport)
+    controller.bytes = 0
+    start = time.perf_counter()
+    lines = 0
+    while time.perf_counter() - start < duration:
+        display.invalidate()
+        display.first_line(LINES[lines % len(LINES)])
+        lines += 1
+    elapsed = time.perf_counter() - start
+    rate = controller.bytes / elapsed
+    print("{:40} {:>12.0f} bytes/s {:>8.2f} ms/line".format(name, rate, 1000 * elapsed / lines))
+    return rate
+
+
+def main():
+    legacy = bench("LCD legacy transport", LegacyTransport(fake_gpio, *PINS), 1.0)
+    for name, timing in TIMING_PROFILES.items():
+        rate = bench("LCD transport ({} timing)".format(name), GpioTransport(fake_gpio, *PINS, timing=timing), 0.5)
+        print("{:40} {:>12.1f}x".format("", rate / legacy))
+
+
+if __name__ == "__main__":
+    main()
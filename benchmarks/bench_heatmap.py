@@ -0,0 +1,37 @@
+"""Counting hits into memory-mapped heatmaps and queries over them."""
+import tempfile
+
+from dartscorer.logic.common import LEGAL_THROWS, Multiplier
+from dartscorer.stats.heatmap import HeatmapStore
+
+from . import best_of, report
+
+THROWS = 100000
+PLAYERS = 1000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = HeatmapStore(tmp_dir)
+        names = ["player {}".format(i) for i in range(PLAYERS)]
+        for name in names:
+            store.record(name, LEGAL_THROWS[0])
+        store.close()
+
+        def record():
+            for i in range(THROWS):
+                store.record(names[i % 8], LEGAL_THROWS[i % len(LEGAL_THROWS)])
+
+        def queries():
+            for name in names:
+                store.favourite_double(name)
+                store.hit_rate(name, 20, Multiplier.TRIPLE)
+
+        report("heatmap record", THROWS, "throws", best_of(record))
+        report("heatmap favourite double + T20 rate", PLAYERS, "players", best_of(queries))
+        report("heatmap merge", PLAYERS, "players", best_of(store.merged))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
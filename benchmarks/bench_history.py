@@ -0,0 +1,39 @@
+"""Recording of the undo history during a long match and undoing/redoing it."""
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+
+from . import best_of, report
+
+THROWS = 3000
+STEPS = 1000
+
+
+def bench(name, factory, throw):
+    events = throw_to_events(throw) * THROWS
+    undo = [Event(EventType.ACTION, Action.UNDO)] * STEPS
+    redo = [Event(EventType.ACTION, Action.REDO)] * STEPS
+    game = factory()
+    game.apply(events)
+
+    def undo_redo():
+        game.apply(undo)
+        game.apply(redo)
+
+    report("{} undo + redo".format(name), 2 * STEPS, "steps", best_of(undo_redo))
+
+
+def main():
+    for num_players in (2, 8):
+        bench("GameX01 ({} players)".format(num_players),
+              lambda: GameX01(num_players, None, NullDisplayController(), init_score=10 ** 6),
+              throw_of(20, Multiplier.SINGLE))
+        bench("Cricket ({} players)".format(num_players),
+              lambda: Cricket(num_players, None, NullDisplayController(), scoring=True),
+              throw_of(25, Multiplier.SINGLE))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Recording of events into the journal and headless replay of whole journals."""
+import os
+import tempfile
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.journal import Journal, JournalRecorder
+
+from . import best_of, report
+from .bench_events import x01_leg
+
+LEGS = 2000
+
+
+def main():
+    events = x01_leg(2)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.dsj")
+        game = GameX01(2, None, NullDisplayController())
+        recorder = JournalRecorder.start(game, path)
+
+        def record():
+            for _ in range(LEGS):
+                for event in events:
+                    recorder.event_applied(game, event)
+
+        report("journal recording", LEGS * len(events), "events", best_of(record, repeat=1))
+        recorder.writer.close()
+        data = open(path, "rb").read()
+        report("journal parsing", LEGS * len(events), "events", best_of(lambda: Journal.parse(data)))
+
+        # a whole leg per journal, replayed from the first checkpoint rather than the final one
+        leg_path = os.path.join(tmp_dir, "leg.dsj")
+        game = GameX01(2, None, NullDisplayController())
+        recorder = JournalRecorder.start(game, leg_path)
+        for event in events:
+            game.step(event)
+            recorder.event_applied(game, event)
+        recorder.game_closed(game)
+        journal = Journal.load(leg_path)
+
+        _, start = journal.checkpoints[0]
+
+        def replay():
+            for _ in range(LEGS):
+                game = journal.new_game(output_ctrl=NullDisplayController())
+                game.restore(start)
+                game.apply(journal.events)
+
+        report("journal replay", LEGS * len(events), "events", best_of(replay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Bytes sent to the LCD and wall time per refresh() of typical frames, with the shadow copy
+of the display and with every line resent (the LCD is driven through a fake RPi.GPIO, the
+delays of the driver are real). Cricket is measured both with the marks of the current player
+written as digits and with the marks of two players as custom glyphs (uploads included)."""
+import time
+
+from dartscorer.display import fake_gpio
+from dartscorer.display.glyphs import MARK_CELLS
+from dartscorer.display.null import NullDisplayController
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+
+fake_gpio.install()
+from dartscorer.display import lcd  # noqa: E402 (needs the fake RPi.GPIO)
+
+FRAMES = 30
+
+
+class LcdOnlyController(NullDisplayController):
+    def __init__(self, display):
+        self.display = display
+
+    def lcd_set_first_line(self, text, duration=-1.0):
+        self.display.first_line(text)
+
+    def lcd_set_second_line(self, text, duration=-1.0):
+        self.display.second_line(text)
+
+
+class GlyphLcdController(LcdOnlyController):
+    lcd_glyphs = True
+    mark_cells = MARK_CELLS
+
+
+def frames(game, throws):
+    """ Plays the throws keypress by keypress, yields after every keypress. """
+    for thrw in throws:
+        for event in throw_to_events(thrw):
+            game.step(event)
+            yield
+
+
+def bench(name, factory, throws, controller_class=LcdOnlyController):
+    for full in (True, False):
+        fake_gpio.reset()
+        controller = fake_gpio.watch(lcd.LCD_RS, lcd.LCD_E, (lcd.LCD_D4, lcd.LCD_D5, lcd.LCD_D6, lcd.LCD_D7))
+        display = lcd.LcdDisplay()
+        game = factory(controller_class(display))
+        game.refresh()
+        controller.bytes = 0
+        count = 0
+        start = time.perf_counter()
+        for _ in frames(game, throws):
+            if full:
+                display.invalidate()
+            game.refresh()
+            count += 1
+            if count == FRAMES:
+                break
+        elapsed = time.perf_counter() - start
+        print("{:40} {:>8.1f} bytes/refresh {:>8.2f} ms/refresh".format(
+            "{} ({})".format(name, "full lines" if full else "changes only"), controller.bytes / count,
+            1000 * elapsed / count))
+
+
+def main():
+    x01_throws = [throw_of(20, Multiplier.TRIPLE), throw_of(20, Multiplier.SINGLE), throw_of(5, Multiplier.SINGLE),
+                  throw_of(19, Multiplier.TRIPLE)] * 10
+    bench("GameX01", lambda ctrl: GameX01(2, None, ctrl), x01_throws)
+    cricket_throws = [throw_of(points, Multiplier.SINGLE) for points in (20, 19, 18, 17, 16, 15, 25)] * 5
+    bench("Cricket", lambda ctrl: Cricket(2, None, ctrl), cricket_throws)
+    bench("Cricket glyphs", lambda ctrl: Cricket(2, None, ctrl), cricket_throws, GlyphLcdController)
+
+
+if __name__ == "__main__":
+    main()
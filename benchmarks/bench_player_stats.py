@@ -0,0 +1,34 @@
+"""Cost of keeping live player statistics during a long match."""
+from dartscorer.display.null import NullDisplayController
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.stats.player_stats import StatsTracker
+
+from . import best_of, report
+
+THROWS = 30000
+
+
+def bench(name, factory, throw):
+    events = throw_to_events(throw) * THROWS
+    for tracked in (False, True):
+        def play():
+            game = factory()
+            if tracked:
+                StatsTracker.start(game)
+            game.apply(events)
+
+        report("{} {}".format(name, "with stats" if tracked else "without stats"), THROWS, "throws",
+               best_of(play))
+
+
+def main():
+    bench("GameX01", lambda: GameX01(2, None, NullDisplayController(), init_score=10 ** 6),
+          throw_of(20, Multiplier.TRIPLE))
+    bench("Cricket", lambda: Cricket(2, None, NullDisplayController(), scoring=True),
+          throw_of(25, Multiplier.SINGLE))
+
+
+if __name__ == "__main__":
+    main()
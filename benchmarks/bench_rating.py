@@ -0,0 +1,31 @@
+"""Recomputation of ratings from a long history of legs and incremental updates."""
+import numpy as np
+
+from dartscorer.stats.rating import RatingBook, batch_ratings
+
+from . import best_of, report
+
+LEGS = 300000
+PLAYERS = 500
+DAYS = 730
+UPDATES = 2000
+
+
+def main():
+    rng = np.random.default_rng(1)
+    periods = np.sort(rng.integers(0, DAYS, LEGS))
+    winners = rng.integers(0, PLAYERS, LEGS)
+    losers = (winners + rng.integers(1, PLAYERS, LEGS)) % PLAYERS
+    report("ratings batch ({} days)".format(DAYS), LEGS, "legs",
+           best_of(lambda: batch_ratings(periods, winners, losers, PLAYERS), repeat=3))
+
+    def incremental():
+        book = RatingBook("/nonexistent/ratings.json")
+        for i in range(UPDATES):
+            book.rate_leg(["p{}".format(winners[i]), "p{}".format(losers[i])], 0, periods[i] * 86400.0)
+
+    report("ratings incremental", UPDATES, "legs", best_of(incremental))
+
+
+if __name__ == "__main__":
+    main()
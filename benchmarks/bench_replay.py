@@ -0,0 +1,47 @@
+"""Replay of a corpus of recorded games with an increasing number of processes."""
+import os
+import tempfile
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.journal import JournalRecorder
+from dartscorer.persistence.replay import find_journals, replay_all
+
+from . import best_of, report
+from .bench_events import cricket_leg, x01_leg
+
+GAMES = 2000
+
+
+def write_corpus(directory):
+    events = 0
+    for i in range(GAMES):
+        if i % 2:
+            game, leg = GameX01(4, None, NullDisplayController()), x01_leg(4)
+        else:
+            game, leg = Cricket(4, None, NullDisplayController()), cricket_leg(4)
+        recorder = JournalRecorder.start(game, os.path.join(directory, "{:05}.dsj".format(i)))
+        for event in leg:
+            game.step(event)
+            recorder.event_applied(game, event)
+        recorder.game_closed(game)
+        events += len(leg)
+    return events
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        events = write_corpus(directory)
+        processes = 1
+        while processes <= os.cpu_count():
+            def run():
+                for result in replay_all(find_journals(directory), processes):
+                    assert not result["violations"]
+
+            report("corpus replay ({} processes)".format(processes), events, "events", best_of(run, repeat=3))
+            processes *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Latency of updating a whole chain of MAX7219 modules (a fake SPI bus counts the bytes, the
+time on the wire is computed for a 10 MHz clock)."""
+import time
+
+from dartscorer.display.segment import MAX7219
+
+FRAMES = 20000
+SPI_HZ = 10000000
+
+
+class FakeSpiBus:
+    def __init__(self):
+        self.bytes = 0
+        self.calls = 0
+
+    def write_rows(self, rows):
+        self.calls += 1
+        for row in rows:
+            self.bytes += len(row)
+
+
+def bench(cascaded, cached):
+    bus = FakeSpiBus()
+    display = MAX7219(cascaded, bus)
+    players = cascaded * 2
+    # a different text for every frame, or two texts shown in turns
+    texts = ["{:<8}".format(i) + "501 " * (players - 2) for i in range(FRAMES)]
+    alternate = ["", texts[0]] * (FRAMES // 2)
+    bus.bytes = bus.calls = 0
+    start = time.perf_counter()
+    for text in alternate if cached else texts:
+        display.show_message(text)
+    elapsed = time.perf_counter() - start
+    per_frame = bus.bytes / bus.calls
+    print("{:40} {:>8.1f} us/frame {:>6.0f} bytes/frame, {:.1f} us on the wire".format(
+        "MAX7219 x{} ({})".format(cascaded, "cached" if cached else "new text"), 1e6 * elapsed / FRAMES,
+        per_frame, 1e6 * per_frame * 8 / SPI_HZ))
+
+
+def main():
+    for cascaded in (2, 4, 8):
+        for cached in (False, True):
+            bench(cascaded, cached)
+
+
+if __name__ == "__main__":
+    main()
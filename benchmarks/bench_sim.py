@@ -0,0 +1,33 @@
+"""Legs per minute simulated by dartscorer.sim (two players of the default skill)."""
+import os
+
+import numpy as np
+
+from dartscorer.sim.accuracy import AccuracyModel
+from dartscorer.sim.cricket import simulate_cricket
+from dartscorer.sim.pool import simulate_sharded
+from dartscorer.sim.x01 import simulate_x01
+
+from . import best_of
+
+LEGS = 200000
+
+
+def report_legs(name, seconds):
+    print("{:40} {:>12.0f} legs/min ({} legs in {:.3f} s)".format(name, LEGS / seconds * 60, LEGS, seconds))
+
+
+def main():
+    models = [AccuracyModel.from_skill()] * 2
+    rng = np.random.default_rng(0)
+    report_legs("X01 (501, 1 process)", best_of(lambda: simulate_x01(models, LEGS, rng=rng), 3))
+    report_legs("Cricket (1 process)", best_of(lambda: simulate_cricket(models, LEGS, rng=rng), 3))
+    processes = os.cpu_count()
+    report_legs("X01 (501, {} processes)".format(processes),
+                best_of(lambda: simulate_sharded(simulate_x01, LEGS, processes, models=models), 3))
+    report_legs("Cricket ({} processes)".format(processes),
+                best_of(lambda: simulate_sharded(simulate_cricket, LEGS, processes, models=models), 3))
+
+
+if __name__ == "__main__":
+    main()
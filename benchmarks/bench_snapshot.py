@@ -0,0 +1,60 @@
+"""Encoding and decoding of the snapshot of a game in progress (see persistence.snapshot),
+both have to stay well under a millisecond on a Raspberry Pi. Writes are measured both done
+directly and queued to the SnapshotWriter, which is what the game thread pays for."""
+import os
+import tempfile
+
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.snapshot import Snapshot, SnapshotWriter, write_snapshot
+
+from . import best_of, report
+
+COUNT = 10000
+
+
+def bench(name, game):
+    data = Snapshot.of(game).encode()
+
+    def encode():
+        for _ in range(COUNT):
+            Snapshot.of(game).encode()
+
+    def decode():
+        for _ in range(COUNT):
+            Snapshot.decode(data).new_game()
+
+    report("{} snapshot encoding".format(name), COUNT, "snapshots", best_of(encode))
+    report("{} snapshot decoding".format(name), COUNT, "snapshots", best_of(decode))
+
+
+def main():
+    game = GameX01(8, None, None)
+    game.apply(throw_to_events(throw_of(20, Multiplier.TRIPLE)) * 5)
+    bench("GameX01 (8 players)", game)
+    game = Cricket(8, None, None, scoring=True)
+    game.apply(throw_to_events(throw_of(20, Multiplier.TRIPLE)) * 5)
+    bench("Cricket (8 players)", game)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "snapshot.bin")
+        for fsync in (False, True):
+            count = 200
+
+            def write():
+                for _ in range(count):
+                    write_snapshot(game, path, fsync)
+
+            report("snapshot write (fsync={})".format(fsync), count, "snapshots", best_of(write, repeat=3))
+            writer = SnapshotWriter(path, fsync)
+
+            def queue():
+                for _ in range(count):
+                    writer.write(Snapshot.of(game).encode())
+
+            report("snapshot queued (fsync={})".format(fsync), count, "snapshots", best_of(queue, repeat=3))
+            writer.close()
+
+
+if __name__ == "__main__":
+    main()
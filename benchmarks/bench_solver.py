@@ -0,0 +1,21 @@
+"""Time needed to solve the optimal X01 policy and to load it from the cache."""
+import tempfile
+
+from dartscorer.sim.accuracy import AccuracyModel
+from dartscorer.sim.solver import solve_x01, load_or_solve_x01
+
+from . import best_of, report
+
+
+def main():
+    model = AccuracyModel.from_skill()
+    for init_score in (301, 501, 701):
+        report("solve X01 policy ({})".format(init_score), 1, "solves",
+               best_of(lambda: solve_x01(model, init_score), 3))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        load_or_solve_x01(model, 501, cache_dir)
+        report("load cached X01 policy (501)", 1, "loads", best_of(lambda: load_or_solve_x01(model, 501, cache_dir)))
+
+
+if __name__ == "__main__":
+    main()
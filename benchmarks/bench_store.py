@@ -0,0 +1,60 @@
+"""Bulk inserts into the match history store and latency of its queries."""
+import os
+import tempfile
+import time
+
+from dartscorer.logic.common import LEGAL_THROWS
+from dartscorer.persistence.match_store import Leg, MatchStore
+
+from . import best_of, report
+
+LEGS = 5000
+THROWS_PER_LEG = 60
+PLAYERS = 20
+QUERIES = 200
+
+
+def legs(now):
+    for i in range(LEGS):
+        names = ["player {}".format(i % PLAYERS), "player {}".format((i + 1) % PLAYERS)]
+        throws = [(seq % 2, seq // 6, LEGAL_THROWS[(i + seq) % len(LEGAL_THROWS)]) for seq in range(THROWS_PER_LEG)]
+        finished = now - (LEGS - i) * 600
+        yield Leg("X01", {"init_score": 501}, names, finished - 600, finished, i % 2, throws)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = MatchStore(os.path.join(tmp_dir, "matches.sqlite"), retention_days=None)
+        now = time.time()
+        prepared = list(legs(now))
+
+        def insert():
+            for leg in prepared:
+                store.save_leg(leg)
+            store.flush()
+
+        elapsed = best_of(insert, repeat=1)
+        report("store bulk insert", LEGS, "legs", elapsed)
+        report("store bulk insert", LEGS * THROWS_PER_LEG, "throws", elapsed)
+
+        def per_player():
+            for i in range(QUERIES):
+                store.player_legs("player {}".format(i % PLAYERS), limit=50)
+
+        def per_date():
+            for i in range(QUERIES):
+                start = now - (i % 30 + 1) * 86400
+                store.legs_between(start, start + 86400)
+
+        def player_throws():
+            for i in range(QUERIES // 10):
+                store.player_throws("player {}".format(i % PLAYERS), since=now - 7 * 86400)
+
+        report("store per-player legs query", QUERIES, "queries", best_of(per_player))
+        report("store per-date legs query", QUERIES, "queries", best_of(per_date))
+        report("store player throws (7 days)", QUERIES // 10, "queries", best_of(player_throws))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
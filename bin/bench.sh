@@ -0,0 +1,5 @@
+#!/usr/bin/env bash
+# This script must be run from the top-level directory.
+for bench in benchmarks/bench_*.py; do
+    python3 -m benchmarks.$(basename ${bench} .py)
+done
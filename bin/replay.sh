@@ -0,0 +1,4 @@
+#!/usr/bin/env bash
+# Replays all recorded games below the given directory, see dartscorer/persistence/replay.py.
+# This script must be run from the top-level directory.
+python3 -m dartscorer.persistence.replay "$@"
@@ -1,26 +1,96 @@
-from time import sleep
+from collections import namedtuple
+import heapq
+import threading
+import time
+
+from .glyphs import MARK_CELLS
+
+# Content of all the displays at a time.
+Frame = namedtuple("Frame", ["first_line", "second_line", "segment"])
+# Seconds the statistics cover the LCD for.
+STATS_DURATION = 1.5
 
 
 class DisplayController:
     """ Class used for controlling output devices used in the game.
  This class shouldn't be used in tests since it is dependent on
- modules which directly work with physical displays. """
+ modules which directly work with physical displays (unless the devices are given).
+
+ The game thread never waits for a display: every call only changes the content the
+ displays should show and wakes up a worker thread which writes whatever has changed since
+ its last pass, so writes made while the displays are busy are coalesced into one. Timed
+ messages cover a line until their deadline, then the line the game has set meanwhile is
+ shown again.
+
+ Changes made between begin_frame() and end_frame() (Game.redraw() puts refresh() between
+ them) are committed as one frame, changes outside of frames are frames of their own. A frame
+ which does not change anything is suppressed, and with max_fps the displays are not written
+ more often than that (frames committed meanwhile are coalesced into the latest one). The
+ counters frames_pushed, frames_suppressed and frames_coalesced tell what became of them.
+
+ segment_modules is the length of the chain of MAX7219 modules of the default seven-segment
+ display (segment.CASCADED unless given), it is not used when segment_d is given."""
+
+    def __init__(self, segment_d=None, lcd_d=None, max_fps=None, segment_modules=None):
+        if segment_d is None or lcd_d is None:
+            # We want to be able to run tests (HW dependless) everywhere
+            from ..display import segment
+            from ..display import lcd
+            segment_d = segment_d or segment.MAX7219(segment_modules or segment.CASCADED)
+            lcd_d = lcd_d or lcd.LcdDisplay()
+        self.segment_d = segment_d
+        self.lcd_d = lcd_d
+        # digits of the seven-segment display, there may be several modules in a chain
+        self.segment_digits = getattr(segment_d, "digits", 8)
+        # whether the LCD shows custom glyphs (see glyphs.py) and the cells of Cricket marks
+        self.lcd_glyphs = hasattr(lcd_d, "glyph_bank")
+        self.mark_cells = MARK_CELLS
+        self.__condition = threading.Condition()
+        # what the game wants shown, and timed messages as [text, deadline] (None if none)
+        self.__lines = ["", ""]
+        self.__segment = ""
+        self.__messages = [None, None]
+        # heap of (deadline, line) of the timed messages, stale entries are skipped
+        self.__deadlines = []
+        self.__version = 0
+        self.__written = 0
+        self.__stopped = False
+        self.__frame_depth = 0
+        self.__dirty = False
+        self.__min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.frames_pushed = 0
+        self.frames_suppressed = 0
+        self.frames_coalesced = 0
+        self.__thread = threading.Thread(target=self.__run, name="display-worker", daemon=True)
+        self.__thread.start()
+
+    def begin_frame(self):
+        with self.__condition:
+            self.__frame_depth += 1
+
+    def end_frame(self):
+        with self.__condition:
+            self.__frame_depth -= 1
+            self.__commit()
 
-    def __init__(self):
-        # We want to be able to run tests (HW dependless) everywhere
-        from ..display import segment
-        from ..display import lcd
-        self.segment_d = segment.MAX7219()
-        self.lcd_d = lcd.LcdDisplay()
+    def frame(self):
+        """ What the displays are going to show (once the worker gets to it). """
+        with self.__condition:
+            lines, segment = self.__content()
+            return Frame(lines[0], lines[1], segment)
 
     def segment_set_text(self, text):
-        self.segment_d.show_message(text)
+        with self.__condition:
+            if text != self.__segment:
+                self.__segment = text
+                self.__dirty = True
+            self.__commit()
 
     def lcd_set_first_line(self, text, duration=-1.0):
-        self.__lcd_set_line(self.lcd_d.first_line, text, duration)
+        self.__lcd_set_line(0, text, duration)
 
     def lcd_set_second_line(self, text, duration=-1.0):
-        self.__lcd_set_line(self.lcd_d.second_line, text, duration)
+        self.__lcd_set_line(1, text, duration)
 
     def warning(self, text):
         """ Just a simple shortcut to displaying a message to the
@@ -28,12 +98,108 @@ second row of the LCD display which will disapear after a given
 magic time constant."""
         self.lcd_set_second_line(text, 0.75)
 
+    def show_stats(self, first_line, second_line):
+        """ Statistics cover the whole LCD for STATS_DURATION seconds, the game goes on meanwhile
+ and its lines are shown again afterwards. """
+        with self.__condition:
+            self.__show_message(0, first_line, STATS_DURATION)
+            self.__show_message(1, second_line, STATS_DURATION)
+            self.__commit()
+
+    def flush(self, timeout=None):
+        """ Waits until everything set so far has been written to the displays. """
+        with self.__condition:
+            version = self.__version
+            return self.__condition.wait_for(lambda: self.__written >= version or self.__stopped, timeout)
+
     def clean_up(self):
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify_all()
+        self.__thread.join()
         self.lcd_d.clean_up()
         self.segment_d.clean_up()
 
-    def __lcd_set_line(self, set_fun, text, duration):
-        set_fun(text)
-        if duration > 0:
-            sleep(duration)
-            set_fun("")
+    def __lcd_set_line(self, line, text, duration):
+        with self.__condition:
+            if duration > 0:
+                self.__show_message(line, text, duration)
+            elif text != self.__lines[line]:
+                self.__lines[line] = text
+                self.__dirty = True
+            self.__commit()
+
+    def __show_message(self, line, text, duration):
+        deadline = time.monotonic() + duration
+        self.__messages[line] = [text, deadline]
+        heapq.heappush(self.__deadlines, (deadline, line))
+        self.__dirty = True
+
+    def __commit(self):
+        """ Hands the frame over to the worker unless a frame is being built. """
+        if self.__frame_depth > 0:
+            return
+        if not self.__dirty:
+            self.frames_suppressed += 1
+            return
+        self.__dirty = False
+        self.__version += 1
+        self.__condition.notify_all()
+
+    def __expire(self, now):
+        """ Drops timed messages past their deadline (the lines behind them have to be shown
+ again), returns the time until the next deadline. """
+        deadlines = self.__deadlines
+        while deadlines and deadlines[0][0] <= now:
+            deadline, line = heapq.heappop(deadlines)
+            message = self.__messages[line]
+            if message is not None and message[1] == deadline:
+                self.__messages[line] = None
+                self.__version += 1
+        return deadlines[0][0] - now if deadlines else None
+
+    def __content(self):
+        lines = tuple(message[0] if message is not None else text
+                      for text, message in zip(self.__lines, self.__messages))
+        return lines, self.__segment
+
+    def __run(self):
+        # the devices start blank
+        shown_lines = ["", ""]
+        shown_segment = ""
+        written = 0
+        pushed = -self.__min_interval
+        while True:
+            with self.__condition:
+                while True:
+                    now = time.monotonic()
+                    timeout = self.__expire(now)
+                    if self.__stopped:
+                        break
+                    if self.__version != written:
+                        delay = pushed + self.__min_interval - now
+                        if delay <= 0:
+                            break
+                        timeout = delay if timeout is None else min(timeout, delay)
+                    self.__condition.wait(timeout)
+                if self.__stopped:
+                    self.__written = self.__version
+                    self.__condition.notify_all()
+                    return
+                self.frames_coalesced += self.__version - written - 1
+                written = self.__version
+                lines, segment = self.__content()
+                self.frames_pushed += 1
+                pushed = now
+            # the displays are written without the lock, the game goes on meanwhile
+            if lines[0] != shown_lines[0]:
+                self.lcd_d.first_line(lines[0])
+            if lines[1] != shown_lines[1]:
+                self.lcd_d.second_line(lines[1])
+            if segment != shown_segment:
+                self.segment_d.show_message(segment)
+            shown_lines = list(lines)
+            shown_segment = segment
+            with self.__condition:
+                self.__written = written
+                self.__condition.notify_all()
@@ -0,0 +1,131 @@
+"""Stand-in for RPi.GPIO used by tests and benchmarks of the display drivers on machines
+without the Raspberry Pi pins. install() puts this module into sys.modules as RPi.GPIO, so it
+has to be called before the drivers are imported. Levels of the pins are only remembered, an
+HD44780 attached by watch() decodes what is written to it (4-bit mode) into its DDRAM and CGRAM."""
+import sys
+import types
+
+BCM = 11
+BOARD = 10
+OUT = 0
+IN = 1
+HIGH = 1
+LOW = 0
+
+levels = {}
+output_calls = 0
+controller = None
+
+
+class HD44780:
+    """ The controller as far as the drivers use it: DDRAM and CGRAM writes, addressing and clearing. """
+
+    def __init__(self, rs, e, data):
+        self.rs = rs
+        self.e = e
+        self.data = tuple(data)
+        self.ddram = bytearray(b" " * 0x80)
+        self.cgram = bytearray(0x40)
+        self.address = 0
+        # whether data go to the CGRAM (after a CGRAM address was set)
+        self.to_cgram = False
+        self.bytes = 0
+        # (RS level, byte) of everything written, if record is set
+        self.received = []
+        self.record = False
+        self.__high = None
+
+    def latch(self):
+        nibble = sum(1 << bit for bit, pin in enumerate(self.data) if levels.get(pin))
+        if self.__high is None:
+            self.__high = nibble
+            return
+        value = self.__high << 4 | nibble
+        self.__high = None
+        self.bytes += 1
+        if self.record:
+            self.received.append((levels.get(self.rs), value))
+        if levels.get(self.rs):
+            if self.to_cgram:
+                self.cgram[self.address & 0x3F] = value
+                self.address = (self.address + 1) & 0x3F
+            else:
+                self.ddram[self.address & 0x7F] = value
+                self.address = (self.address + 1) & 0x7F
+        elif value & 0x80:
+            self.address = value & 0x7F
+            self.to_cgram = False
+        elif value & 0x40:
+            self.address = value & 0x3F
+            self.to_cgram = True
+        elif value == 0x01:
+            self.ddram[:] = b" " * len(self.ddram)
+            self.address = 0
+            self.to_cgram = False
+
+    def line(self, number, width=16):
+        start = 0x40 * number
+        return self.ddram[start:start + width].decode("latin-1")
+
+    def glyph(self, code):
+        """ Rows of the custom character shown by the code (0-15). """
+        start = (code & 0x07) * 8
+        return tuple(self.cgram[start:start + 8])
+
+    def cells(self, number, width=16):
+        """ The line with custom characters given as their rows, other characters as strings. """
+        return [self.glyph(char) if char < 0x10 else chr(char) for char in self.ddram[0x40 * number:][:width]]
+
+
+def install():
+    package = sys.modules.get("RPi") or types.ModuleType("RPi")
+    package.GPIO = sys.modules[__name__]
+    sys.modules["RPi"] = package
+    sys.modules["RPi.GPIO"] = sys.modules[__name__]
+
+
+def watch(rs, e, data):
+    """ Attaches a simulated HD44780 to the given pins and returns it. """
+    global controller
+    controller = HD44780(rs, e, data)
+    return controller
+
+
+def reset():
+    global output_calls, controller
+    levels.clear()
+    output_calls = 0
+    controller = None
+
+
+def setwarnings(_flag):
+    pass
+
+
+def setmode(_mode):
+    pass
+
+
+def setup(channel, _direction, initial=LOW):
+    for pin in channel if isinstance(channel, (list, tuple)) else (channel,):
+        levels[pin] = initial
+
+
+def output(channel, value):
+    """ Like RPi.GPIO, both arguments may be sequences. """
+    global output_calls
+    output_calls += 1
+    if isinstance(channel, (list, tuple)):
+        values = value if isinstance(value, (list, tuple)) else [value] * len(channel)
+        pairs = zip(channel, values)
+    else:
+        pairs = ((channel, value),)
+    for pin, level in pairs:
+        was = levels.get(pin)
+        levels[pin] = 1 if level else 0
+        if controller is not None and pin == controller.e and was and not level:
+            controller.latch()
+
+
+def cleanup():
+    levels.clear()
@@ -0,0 +1,84 @@
+"""Custom characters of the HD44780 LCD. The controller has room for eight 5x8 glyphs in its
+CGRAM (shown by the character codes 0-7); a GlyphBank keeps track of which glyphs are there,
+so a glyph is only uploaded when a text needs it and it is not resident yet.
+
+Texts refer to glyphs by the characters of GLYPH_CHARS (from the Unicode private use area),
+devices which cannot show glyphs fall back to FALLBACKS."""
+
+# Rows of every glyph, top to bottom, five pixels each.
+GLYPHS = {
+    "mark1": (0b00001, 0b00010, 0b00010, 0b00100, 0b01000, 0b01000, 0b10000, 0b00000),
+    "mark2": (0b10001, 0b01010, 0b01010, 0b00100, 0b01010, 0b01010, 0b10001, 0b00000),
+    "closed": (0b01110, 0b10001, 0b11011, 0b10101, 0b11011, 0b10001, 0b01110, 0b00000),
+}
+for _width in range(1, 6):
+    GLYPHS["bar{}".format(_width)] = ((0x1F << (5 - _width)) & 0x1F,) * 8
+FALLBACKS = {"mark1": "/", "mark2": "X", "closed": "O", "bar1": "|", "bar2": "|", "bar3": "|", "bar4": "|",
+             "bar5": "#"}
+GLYPH_CHARS = {name: chr(0xE000 + index) for index, name in enumerate(GLYPHS)}
+CHAR_GLYPHS = {char: name for name, char in GLYPH_CHARS.items()}
+CGRAM_SLOTS = 8
+# Cricket marks of a target shown in a single cell
+MARK_CELLS = (" ", GLYPH_CHARS["mark1"], GLYPH_CHARS["mark2"], GLYPH_CHARS["closed"])
+
+
+def progress_bar(fraction, cells):
+    """ A bar of the given number of cells filled to the fraction, five steps per cell. """
+    steps = max(0, min(5 * cells, int(round(fraction * 5 * cells))))
+    full, rest = divmod(steps, 5)
+    bar = GLYPH_CHARS["bar5"] * full
+    if rest:
+        bar += GLYPH_CHARS["bar{}".format(rest)]
+    return bar.ljust(cells)
+
+
+def with_fallbacks(text):
+    """ The text with all glyphs replaced by plain characters. """
+    return "".join(FALLBACKS[CHAR_GLYPHS[char]] if char in CHAR_GLYPHS else char for char in text)
+
+
+class GlyphBank:
+    """ Which glyph is in which CGRAM slot. Glyphs which are needed but not resident replace
+ those used the longest time ago, except the pinned ones (e.g. still on the display). """
+
+    def __init__(self, slots=CGRAM_SLOTS):
+        self.slots = [None] * slots
+        self.resident = {}
+        self.uploads = 0
+        self.__used = [0] * slots
+        self.__clock = 0
+
+    def allocate(self, names, pinned=()):
+        """ Makes the glyphs resident as far as there is room.
+:return: dict of the slots of the glyphs which are resident and a list of (slot, name) to upload"""
+        self.__clock += 1
+        slots = {}
+        uploads = []
+        for name in names:
+            slot = self.resident.get(name)
+            if slot is None:
+                slot = self.__free_slot(set(names) | set(pinned))
+                if slot is None:
+                    continue
+                old = self.slots[slot]
+                if old is not None:
+                    del self.resident[old]
+                self.slots[slot] = name
+                self.resident[name] = slot
+                uploads.append((slot, name))
+                self.uploads += 1
+            self.__used[slot] = self.__clock
+            slots[name] = slot
+        return slots, uploads
+
+    def __free_slot(self, keep):
+        candidates = [slot for slot, name in enumerate(self.slots) if name is None or name not in keep]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda slot: (self.slots[slot] is not None, self.__used[slot]))
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+        self.resident = {}
+        self.__used = [0] * len(self.slots)
+        self.__clock = 0
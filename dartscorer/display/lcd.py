@@ -17,7 +17,9 @@
 # 15: LCD Backlight +5V**
 # 16: LCD Backlight GND
 import RPi.GPIO as GPIO
-import time
+
+from .glyphs import CHAR_GLYPHS, FALLBACKS, GLYPHS, GlyphBank
+from .transport import GpioTransport, LCD_CHR, LCD_CMD
 
 # Define GPIO to LCD mapping
 LCD_RS = 21
@@ -28,25 +30,32 @@ LCD_D6 = 13
 LCD_D7 = 6
 # Define some device constants
 LCD_WIDTH = 16  # Maximum characters per line
-LCD_CHR = True
-LCD_CMD = False
 LCD_LINE_1 = 0x80  # LCD RAM address for the 1st line
 LCD_LINE_2 = 0xC0  # LCD RAM address for the 2nd line
-# Timing constants
-E_PULSE = 0.0005
-E_DELAY = 0.0005
+LCD_CGRAM = 0x40  # Command setting the CGRAM address (slot << 3)
+# Character code of the first CGRAM slot; codes 0-7 and 8-15 show the same glyphs, the upper
+# ones do not collide with the zeroes of an invalidated shadow copy
+GLYPH_CODE = 0x08
 
 
 class LcdDisplay:
-    def __init__(self):
-        GPIO.setwarnings(False)
-        GPIO.setmode(GPIO.BCM)  # Use BCM GPIO numbers
-        GPIO.setup(LCD_E, GPIO.OUT)  # E
-        GPIO.setup(LCD_RS, GPIO.OUT)  # RS
-        GPIO.setup(LCD_D4, GPIO.OUT)  # DB4
-        GPIO.setup(LCD_D5, GPIO.OUT)  # DB5
-        GPIO.setup(LCD_D6, GPIO.OUT)  # DB6
-        GPIO.setup(LCD_D7, GPIO.OUT)  # DB7
+    """ A shadow copy of what both lines show is kept, so that writing a line only sends the
+ characters which differ (each preceded by a cursor move unless it follows the previous one).
+ Bytes go through the transport (see transport.py), a GpioTransport of the pins above by default.
+
+ Characters of glyphs.GLYPH_CHARS are shown as custom glyphs, uploaded into the CGRAM by the
+ glyph bank only when they are not resident yet. Glyphs still shown by the other line are
+ never replaced, what does not fit is shown by its fallback character. """
+
+    def __init__(self, transport=None):
+        self.transport = transport or GpioTransport(GPIO, LCD_RS, LCD_E, (LCD_D4, LCD_D5, LCD_D6, LCD_D7))
+        self.transport.setup()
+        self.shadow = [bytearray(b" " * LCD_WIDTH), bytearray(b" " * LCD_WIDTH)]
+        # DDRAM address the next character goes to, None if not known
+        self.cursor = None
+        self.glyph_bank = GlyphBank()
+        # names of the glyphs each line shows
+        self.__line_glyphs = [(), ()]
         self.lcd_init()
 
     def clear(self):
@@ -55,76 +64,80 @@ class LcdDisplay:
 
     # To be used with resource cleaning.
     def clean_up(self):
-        lcd_byte(0x01, LCD_CMD)
+        self.transport.write(0x01, LCD_CMD)
+        self.invalidate()
         self.clear()
-        GPIO.cleanup()
+        self.transport.cleanup()
+
+    def invalidate(self):
+        """ Forgets the shadow copy, the next writes resend both lines entirely. """
+        self.shadow = [bytearray(LCD_WIDTH), bytearray(LCD_WIDTH)]
+        self.cursor = None
+        self.glyph_bank.clear()
+        self.__line_glyphs = [(), ()]
 
     def lcd_init(self):
         # Initialise display
-        lcd_byte(0x33, LCD_CMD)  # 110011 Initialise
-        lcd_byte(0x32, LCD_CMD)  # 110010 Initialise
-        lcd_byte(0x06, LCD_CMD)  # 000110 Cursor move direction
-        lcd_byte(0x0C, LCD_CMD)  # 001100 Display On,Cursor Off, Blink Off
-        lcd_byte(0x28, LCD_CMD)  # 101000 Data length, number of lines, font size
-        lcd_byte(0x01, LCD_CMD)  # 000001 Clear display
-        time.sleep(E_DELAY)
+        write = self.transport.write
+        init = self.transport.timing.init
+        write(0x33, LCD_CMD, init)  # 110011 Initialise
+        write(0x32, LCD_CMD, init)  # 110010 Initialise
+        write(0x06, LCD_CMD)  # 000110 Cursor move direction
+        write(0x0C, LCD_CMD)  # 001100 Display On,Cursor Off, Blink Off
+        write(0x28, LCD_CMD)  # 101000 Data length, number of lines, font size
+        write(0x01, LCD_CMD)  # 000001 Clear display
+        self.shadow = [bytearray(b" " * LCD_WIDTH), bytearray(b" " * LCD_WIDTH)]
+        self.cursor = LCD_LINE_1
+        # the CGRAM holds garbage after power-up
+        self.glyph_bank.clear()
+        self.__line_glyphs = [(), ()]
 
     def lcd_string(self, message, line):
         message = message.ljust(LCD_WIDTH, " ")
-        lcd_byte(line, LCD_CMD)
+        index = line == LCD_LINE_2
+        shadow = self.shadow[index]
+        codes = self.__encode(message, index)
+        cursor = self.cursor
+        write = self.transport.write
         for i in range(LCD_WIDTH):
-            lcd_byte(ord(message[i]), LCD_CHR)
+            char = codes[i]
+            if shadow[i] == char:
+                continue
+            if cursor != line + i:
+                write(line + i, LCD_CMD)
+            write(char, LCD_CHR)
+            shadow[i] = char
+            cursor = line + i + 1
+        self.cursor = cursor
+
+    def __encode(self, message, index):
+        """ Character codes of the first LCD_WIDTH characters, uploads the glyphs they need. """
+        message = message[:LCD_WIDTH]
+        names = list(dict.fromkeys(CHAR_GLYPHS[char] for char in message if char in CHAR_GLYPHS))
+        if not names and not self.__line_glyphs[index]:
+            return [ord(char) & 0xFF for char in message]
+        slots, uploads = self.glyph_bank.allocate(names, pinned=self.__line_glyphs[not index])
+        for slot, name in uploads:
+            self.transport.write(LCD_CGRAM | slot << 3, LCD_CMD)
+            for row in GLYPHS[name]:
+                self.transport.write(row, LCD_CHR)
+        if uploads:
+            # the address counter points into the CGRAM now
+            self.cursor = None
+        self.__line_glyphs[index] = tuple(slots)
+        codes = []
+        for char in message:
+            name = CHAR_GLYPHS.get(char)
+            if name is None:
+                codes.append(ord(char) & 0xFF)
+            elif name in slots:
+                codes.append(GLYPH_CODE + slots[name])
+            else:
+                codes.append(ord(FALLBACKS[name]))
+        return codes
 
     def first_line(self, message):
         self.lcd_string(message, LCD_LINE_1)
 
     def second_line(self, message):
         self.lcd_string(message, LCD_LINE_2)
-
-
-# And now... a bit of magic!
-def lcd_byte(bits, mode):
-    # Send byte to data pins
-    # bits = data
-    # mode = True  for character
-    #        False for command
-    GPIO.output(LCD_RS, mode)  # RS
-
-    # High bits
-    GPIO.output(LCD_D4, False)
-    GPIO.output(LCD_D5, False)
-    GPIO.output(LCD_D6, False)
-    GPIO.output(LCD_D7, False)
-    if bits & 0x10 == 0x10:
-        GPIO.output(LCD_D4, True)
-    if bits & 0x20 == 0x20:
-        GPIO.output(LCD_D5, True)
-    if bits & 0x40 == 0x40:
-        GPIO.output(LCD_D6, True)
-    if bits & 0x80 == 0x80:
-        GPIO.output(LCD_D7, True)
-
-    lcd_toggle_enable()
-    # Low bits
-    GPIO.output(LCD_D4, False)
-    GPIO.output(LCD_D5, False)
-    GPIO.output(LCD_D6, False)
-    GPIO.output(LCD_D7, False)
-    if bits & 0x01 == 0x01:
-        GPIO.output(LCD_D4, True)
-    if bits & 0x02 == 0x02:
-        GPIO.output(LCD_D5, True)
-    if bits & 0x04 == 0x04:
-        GPIO.output(LCD_D6, True)
-    if bits & 0x08 == 0x08:
-        GPIO.output(LCD_D7, True)
-
-    lcd_toggle_enable()
-
-
-def lcd_toggle_enable():
-    time.sleep(E_DELAY)
-    GPIO.output(LCD_E, True)
-    time.sleep(E_PULSE)
-    GPIO.output(LCD_E, False)
-    time.sleep(E_DELAY)
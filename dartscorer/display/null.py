@@ -0,0 +1,27 @@
+class NullDisplayController:
+    """ DisplayController replacement which discards everything. Used whenever the game
+ logic runs headless (benchmarks, replays, simulations)."""
+
+    def begin_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def segment_set_text(self, text):
+        pass
+
+    def lcd_set_first_line(self, text, duration=-1.0):
+        pass
+
+    def lcd_set_second_line(self, text, duration=-1.0):
+        pass
+
+    def warning(self, text):
+        pass
+
+    def show_stats(self, first_line, second_line):
+        pass
+
+    def clean_up(self):
+        pass
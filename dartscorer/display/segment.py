@@ -1,19 +1,110 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+"""Chain of MAX7219 8-digit seven-segment modules. The text is spread over all the modules
+left to right; the leftmost module is the last one in the chain, so its bytes are shifted
+out first. Characters are turned into segments by a table built once and whole frames (the
+eight digit rows of the chain) are cached by text, so showing a text is a dictionary lookup
+and a single call of the bus."""
+import os
 
-from luma.led_matrix.device import max7219 as max7219_backend
-from luma.core.interface.serial import spi, noop
-from luma.core.virtual import sevensegment
+# Number of modules in the chain, chains of other lengths are set by DARTSCORER_SEGMENT_MODULES
+# (or by the segment_modules of DisplayController).
+CASCADED = int(os.environ.get("DARTSCORER_SEGMENT_MODULES", "1"))
+DIGITS_PER_DEVICE = 8
+# Registers
+REG_DIGIT_0 = 0x01
+REG_DECODE_MODE = 0x09
+REG_INTENSITY = 0x0A
+REG_SCAN_LIMIT = 0x0B
+REG_SHUTDOWN = 0x0C
+REG_DISPLAY_TEST = 0x0F
+
+# Segments in the no-decode mode: DP A B C D E F G from the most significant bit.
+_SEGMENTS = {
+    "0": 0x7E, "1": 0x30, "2": 0x6D, "3": 0x79, "4": 0x33, "5": 0x5B, "6": 0x5F, "7": 0x70, "8": 0x7F, "9": 0x7B,
+    "A": 0x77, "b": 0x1F, "C": 0x4E, "c": 0x0D, "d": 0x3D, "E": 0x4F, "F": 0x47, "G": 0x5E, "H": 0x37, "h": 0x17,
+    "I": 0x06, "J": 0x3C, "L": 0x0E, "n": 0x15, "o": 0x1D, "P": 0x67, "q": 0x73, "r": 0x05, "S": 0x5B, "t": 0x0F,
+    "U": 0x3E, "u": 0x1C, "y": 0x3B, "-": 0x01, "_": 0x08, "=": 0x09, " ": 0x00,
+}
+DECIMAL_POINT = 0x80
+# Segments of every character (Latin-1), letters without a glyph of their case use the other case.
+GLYPHS = bytes(_SEGMENTS.get(chr(code), _SEGMENTS.get(chr(code).swapcase(), 0)) for code in range(256))
+MAX_CACHED_FRAMES = 1024
+
+
+def text_to_digits(text, digits):
+    """ Segments of the digits showing the text (left-aligned, cut to fit), a dot is shown as
+ the decimal point of the preceding character. """
+    result = bytearray(digits)
+    position = -1
+    for char in text:
+        if char == "." and position >= 0 and not result[position] & DECIMAL_POINT:
+            result[position] |= DECIMAL_POINT
+            continue
+        position += 1
+        if position == digits:
+            break
+        code = ord(char)
+        result[position] = GLYPHS[code] if code < 256 else 0
+        if char == ".":
+            result[position] = DECIMAL_POINT
+    return bytes(result)
+
+
+class SpidevBus:
+    """ SPI through spidev, every row is a transfer of its own (the MAX7219 latches the data
+ when the chip select goes up). """
+
+    def __init__(self, port=0, device=0, speed=10000000):
+        import spidev
+        self.spi = spidev.SpiDev()
+        self.spi.open(port, device)
+        self.spi.max_speed_hz = speed
+
+    def write_rows(self, rows):
+        writebytes = self.spi.writebytes2
+        for row in rows:
+            writebytes(row)
+
+    def close(self):
+        self.spi.close()
 
 
 class MAX7219:
-    def __init__(self):
-        serial = spi(port=0, device=0, gpio=noop())
-        self.device = max7219_backend(serial, cascaded=1)
-        self.seg = sevensegment(self.device)
+    def __init__(self, cascaded=CASCADED, bus=None, intensity=0x07):
+        self.cascaded = cascaded
+        self.digits = cascaded * DIGITS_PER_DEVICE
+        self.bus = bus or SpidevBus()
+        # register of the digit row and position of its digit in the text, for every module
+        self.__layout = [[(REG_DIGIT_0 + row, device * DIGITS_PER_DEVICE + DIGITS_PER_DEVICE - 1 - row)
+                          for device in range(cascaded)] for row in range(DIGITS_PER_DEVICE)]
+        self.__frames = {}
+        self.__shown = None
+        self.__registers([(REG_SCAN_LIMIT, DIGITS_PER_DEVICE - 1), (REG_DECODE_MODE, 0),
+                          (REG_DISPLAY_TEST, 0), (REG_INTENSITY, intensity), (REG_SHUTDOWN, 1)])
+        self.show_message("")
+
+    def __registers(self, settings):
+        """ Sets the registers of all the modules. """
+        self.bus.write_rows([bytes((register, value) * self.cascaded) for register, value in settings])
+
+    def frame(self, text):
+        """ The rows sent to show the text (cached). """
+        rows = self.__frames.get(text)
+        if rows is None:
+            digits = text_to_digits(text, self.digits)
+            rows = tuple(bytes(byte for register, position in layout for byte in (register, digits[position]))
+                         for layout in self.__layout)
+            if len(self.__frames) >= MAX_CACHED_FRAMES:
+                self.__frames.clear()
+            self.__frames[text] = rows
+        return rows
 
     def show_message(self, text):
-        self.seg.text = text
+        rows = self.frame(text)
+        if rows is not self.__shown:
+            self.bus.write_rows(rows)
+            self.__shown = rows
 
     def clean_up(self):
-        self.device.contrast(0x7F)
+        self.__registers([(REG_INTENSITY, 0x07)])
@@ -2,7 +2,7 @@
  the only input device will be the numerical keyboard)."""
 from sys import stderr as serr
 from select import select
-from enum import Enum
+from enum import Enum, IntEnum
 from evdev import InputDevice, ecodes
 from evdev.events import KeyEvent
 
@@ -11,8 +11,9 @@ NUM_KEY_PATH = "/dev/input/by-id/usb-SIGMACHIP_USB_Keyboard-event-kbd"
 KEY_DOWN = KeyEvent.key_down
 
 
-class Action(Enum):
-    """ Enum representing abstract actions from the game logic point of view."""
+class Action(IntEnum):
+    """ Enum representing abstract actions from the game logic point of view.\
+ The values are small consecutive integers so that they can index dispatch tables."""
 
     def __iter__(self):
         for attr in dir(Action):
@@ -25,6 +26,7 @@ class Action(Enum):
     CLEAR = 4
     RESTART = 5
     UNDO = 6
+    REDO = 7
 
 
 CODE_TO_NUMBER_DICT = {
@@ -34,11 +36,11 @@ CODE_TO_NUMBER_DICT = {
     ecodes.KEY_KP9: 9, ecodes.KEY_SPACE: 20, ecodes.KEY_KPDOT: 25
 }
 
-# KEY_NUMLOCK
 CODE_TO_ACTION_DICT = {
     ecodes.KEY_KPENTER: Action.CONFIRM, ecodes.KEY_KPPLUS: Action.TRIPLE,
     ecodes.KEY_KPMINUS: Action.DOUBLE, ecodes.KEY_BACKSPACE: Action.CLEAR,
-    ecodes.KEY_KPASTERISK: Action.RESTART, ecodes.KEY_KPSLASH: Action.UNDO
+    ecodes.KEY_KPASTERISK: Action.RESTART, ecodes.KEY_KPSLASH: Action.UNDO,
+    ecodes.KEY_NUMLOCK: Action.REDO
 }
 
 
@@ -63,6 +65,7 @@ class Event:
     """ Basic struct containing EventType and the value itself.\
  For EventType.NUMBER events, the value represents the raw numeric value (i.e. throw value)\
  and the EventType.ACTION events contain an instance of the Action enum."""
+    __slots__ = ("e_type", "value")
 
     def __init__(self, e_type, value):
         self.e_type = e_type
@@ -0,0 +1,121 @@
+"""Geometry of a standard (BDO/WDF) dartboard. Coordinates are in millimetres with the origin
+in the centre of the bull, x grows to the right and y grows upwards (the 20 is at the top).
+
+Throws are identified by codes: 0 is a miss and code c > 0 is LEGAL_THROWS[c - 1] (the same
+numbering as accuracy.OUTCOMES uses). coords_to_codes() looks the codes up in a raster which
+is computed once by the exact (trigonometric) classify(), stored in the cache directory and
+memory-mapped from there, so classifying a point costs a few array operations and no trigonometry."""
+import os
+
+import numpy as np
+
+from .common import LEGAL_THROWS, ZERO_THROW, Multiplier, throw_of
+
+# Segments clockwise, starting at the top of the board.
+BOARD_ORDER = (20, 1, 18, 4, 13, 6, 10, 15, 2, 17, 3, 19, 7, 16, 8, 11, 14, 9, 12, 5)
+SEGMENT_ANGLE = 360 / len(BOARD_ORDER)
+
+# Outer radii of the rings.
+DOUBLE_BULL_RADIUS = 6.35
+BULL_RADIUS = 15.9
+TRIPLE_INNER_RADIUS = 99.0
+TRIPLE_OUTER_RADIUS = 107.0
+DOUBLE_INNER_RADIUS = 162.0
+DOUBLE_OUTER_RADIUS = 170.0
+
+THROWS = (ZERO_THROW,) + LEGAL_THROWS
+THROW_CODE = {thrw: code for code, thrw in enumerate(THROWS)}
+CODE_POINTS = np.array([thrw.points for thrw in THROWS], dtype=np.uint8)
+CODE_MULTIPLIER = np.array([thrw.multiplier.value for thrw in THROWS], dtype=np.uint8)
+_CODE_THROWS = np.array(THROWS, dtype=object)
+# [multiplier][segment] -> code
+_SEGMENT_CODES = np.array([[0] * len(BOARD_ORDER)] + [
+    [THROW_CODE[throw_of(points, mult)] for points in BOARD_ORDER] for mult in Multiplier], dtype=np.intp)
+_BULL_CODE = THROW_CODE[throw_of(25, Multiplier.SINGLE)]
+_DOUBLE_BULL_CODE = THROW_CODE[throw_of(25, Multiplier.DOUBLE)]
+
+# The raster covers a square slightly larger than the board, cells along its border are misses.
+RESOLUTION = 0.1  # mm per cell
+EXTENT = DOUBLE_OUTER_RADIUS + 2.0
+RASTER_SIZE = int(round(2 * EXTENT / RESOLUTION))
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dartscorer")
+CACHE_VERSION = 1
+
+
+def classify(xs, ys):
+    """ Exact classification of points, returns an array of codes. """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    radius = np.hypot(xs, ys)
+    # clockwise angle from the top, shifted by half a segment so that the 20 starts at 0
+    angle = (np.degrees(np.arctan2(xs, ys)) + SEGMENT_ANGLE / 2) % 360
+    segment = (angle // SEGMENT_ANGLE).astype(np.intp) % len(BOARD_ORDER)
+    codes = np.select([radius < DOUBLE_BULL_RADIUS, radius < BULL_RADIUS, radius < TRIPLE_INNER_RADIUS,
+                      radius < TRIPLE_OUTER_RADIUS, radius < DOUBLE_INNER_RADIUS, radius < DOUBLE_OUTER_RADIUS],
+                     [_DOUBLE_BULL_CODE, _BULL_CODE, _SEGMENT_CODES[Multiplier.SINGLE][segment],
+                      _SEGMENT_CODES[Multiplier.TRIPLE][segment], _SEGMENT_CODES[Multiplier.SINGLE][segment],
+                      _SEGMENT_CODES[Multiplier.DOUBLE][segment]], 0)
+    return codes.astype(np.uint8)
+
+
+def coords_to_throw(x, y):
+    """ Returns the Throw hit at a single point. """
+    return THROWS[int(classify(x, y))]
+
+
+def build_raster():
+    """ Classifies the centres of all cells of the raster (row by row to keep memory low). """
+    raster = np.empty((RASTER_SIZE, RASTER_SIZE), dtype=np.uint8)
+    centres = (np.arange(RASTER_SIZE) + 0.5) * RESOLUTION - EXTENT
+    rows = 256
+    for start in range(0, RASTER_SIZE, rows):
+        ys = centres[start:start + rows, None]
+        raster[start:start + rows] = classify(np.broadcast_to(centres, (len(ys), RASTER_SIZE)), ys)
+    return raster
+
+
+def raster_path(cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, "board-raster-v{}-{}.npy".format(CACHE_VERSION, RASTER_SIZE))
+
+
+def load_raster(cache_dir=CACHE_DIR):
+    """ Returns the raster memory-mapped from the cache directory, it is built first if needed. """
+    path = raster_path(cache_dir)
+    try:
+        raster = np.load(path, mmap_mode="r")
+        if raster.shape == (RASTER_SIZE, RASTER_SIZE) and raster.dtype == np.uint8:
+            return raster
+    except (OSError, ValueError):
+        pass  # not cached yet (or the file is damaged)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as tmp_file:
+        np.save(tmp_file, build_raster())
+    os.replace(tmp_path, path)
+    return np.load(path, mmap_mode="r")
+
+
+_raster = None
+
+
+def _default_raster():
+    global _raster
+    if _raster is None:
+        _raster = load_raster()
+    return _raster
+
+
+def coords_to_codes(xs, ys, raster=None):
+    """ Vectorised raster lookup, returns an array of codes shaped as xs and ys. Points are
+ classified by the cell they fall into, i.e. up to RESOLUTION / 2 off the wires. """
+    if raster is None:
+        raster = _default_raster()
+    scale = 1 / RESOLUTION
+    cols = np.clip((np.asarray(xs, dtype=np.float64) + EXTENT) * scale, 0, RASTER_SIZE - 1).astype(np.intp)
+    rows = np.clip((np.asarray(ys, dtype=np.float64) + EXTENT) * scale, 0, RASTER_SIZE - 1).astype(np.intp)
+    return raster.reshape(-1)[rows * RASTER_SIZE + cols]
+
+
+def coords_to_throws(xs, ys, raster=None):
+    """ Same as coords_to_codes() but returns an object array of (interned) Throw instances. """
+    return _CODE_THROWS[coords_to_codes(xs, ys, raster)]
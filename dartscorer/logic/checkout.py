@@ -0,0 +1,70 @@
+"""Precomputed checkout routes for X01. The game is won by reaching exactly zero with any
+throw (see game_x01.Confirm), so every score up to 180 can be finished with at most three darts.
+
+Routes are stored in a flat byte array: for every number of darts left (1-3) and every
+remaining score there are three slots holding indices into LEGAL_THROWS shifted by one,
+0 marks an unused slot. Looking a route up is therefore a constant-time operation."""
+from array import array
+
+from .common import LEGAL_THROWS, Multiplier
+
+MAX_DARTS = 3
+MAX_CHECKOUT = 180
+
+
+def _difficulty(throw):
+    """ Rough measure of how hard the bed is to hit, used to choose between routes
+ which need the same number of darts. """
+    if throw.points == 25:
+        return 2 if throw.multiplier == Multiplier.SINGLE else 4
+    return {Multiplier.SINGLE: 0, Multiplier.DOUBLE: 3, Multiplier.TRIPLE: 3}[throw.multiplier]
+
+
+def _slot(darts, remaining):
+    return ((darts - 1) * (MAX_CHECKOUT + 1) + remaining) * MAX_DARTS
+
+
+def build_checkout_table():
+    """ Computes the best route for every remaining score and number of darts left.
+ Routes with fewer darts win, then the ones with easier beds, then the ones which score
+ more with the first dart. """
+    table = array("B", bytes(_slot(MAX_DARTS + 1, 0)))
+    # best[s] is the key of the best route finishing s with the darts considered so far
+    best = [None] * (MAX_CHECKOUT + 1)
+    routes = [()] * (MAX_CHECKOUT + 1)
+    for darts in range(1, MAX_DARTS + 1):
+        next_best, next_routes = list(best), list(routes)
+        for remaining in range(1, MAX_CHECKOUT + 1):
+            for i, throw in enumerate(LEGAL_THROWS):
+                rest = remaining - throw.total
+                if rest < 0 or (rest > 0 and best[rest] is None):
+                    continue
+                rest_darts, rest_difficulty = best[rest][:2] if rest > 0 else (0, 0)
+                key = (rest_darts + 1, rest_difficulty + _difficulty(throw), -throw.total)
+                if next_best[remaining] is None or key < next_best[remaining]:
+                    next_best[remaining] = key
+                    next_routes[remaining] = (i + 1,) + (routes[rest] if rest > 0 else ())
+        best, routes = next_best, next_routes
+        for remaining in range(1, MAX_CHECKOUT + 1):
+            route = routes[remaining]
+            table[_slot(darts, remaining):_slot(darts, remaining) + len(route)] = array("B", route)
+    return table
+
+
+CHECKOUT_TABLE = build_checkout_table()
+
+
+def checkout(remaining, darts_left, table=CHECKOUT_TABLE):
+    """ Returns a tuple of throws which finish the remaining score with at most darts_left darts,
+ None if there is no such route. """
+    if remaining < 1 or remaining > MAX_CHECKOUT or darts_left < 1:
+        return None
+    slot = _slot(min(darts_left, MAX_DARTS), remaining)
+    first, second, third = table[slot], table[slot + 1], table[slot + 2]
+    if not first:
+        return None
+    if not second:
+        return LEGAL_THROWS[first - 1],
+    if not third:
+        return LEGAL_THROWS[first - 1], LEGAL_THROWS[second - 1]
+    return LEGAL_THROWS[first - 1], LEGAL_THROWS[second - 1], LEGAL_THROWS[third - 1]
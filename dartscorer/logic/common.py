@@ -1,9 +1,11 @@
-from functools import reduce
+from collections import namedtuple
+import time
 from enum import IntEnum, Enum, unique
 from abc import ABCMeta, abstractmethod
 
 from ..input import input_controller
 from ..input.input_controller import Action
+from .history import History, Step
 
 MULTIPLIER_TO_STR = {1: " ", 2: "D", 3: "T"}
 
@@ -12,7 +14,8 @@ class GameVisitor:
     """ Class representing abstract actions from the game logic point of view."""
 
     """ Each extending class defines a behaviour for the given action. Most of 
-the actions will be very similar (or even the same)."""
+the actions will be very similar (or even the same). Visitors are stateless, a single
+instance of each is shared by all games."""
 
     @abstractmethod
     def visit(self, _game):
@@ -21,21 +24,21 @@ the actions will be very similar (or even the same)."""
 
 class Double(GameVisitor):
     def visit(self, game):
-        game.round.set_current_throw(Throw(game.round.current_throw().points, Multiplier.DOUBLE))
+        game.round.set_current_throw(throw_of(game.round.current_throw().points, Multiplier.DOUBLE))
 
 
 class Triple(GameVisitor):
     def visit(self, game):
         points_nominal = game.round.current_throw().points
         if points_nominal == 25:
-            game.output_ctrl.warning("25T not valid!")
+            game.warn("25T not valid!")
         else:
-            game.round.set_current_throw(Throw(points_nominal, Multiplier.TRIPLE))
+            game.round.set_current_throw(throw_of(points_nominal, Multiplier.TRIPLE))
 
 
 class Clear(GameVisitor):
     def visit(self, game):
-        game.round.set_current_throw(zero_throw())
+        game.round.set_current_throw(ZERO_THROW)
 
 
 class Restart(GameVisitor):
@@ -44,22 +47,57 @@ class Restart(GameVisitor):
 
 
 class Undo(GameVisitor):
+    """ Takes the last confirmed throw back, even if it was thrown in an earlier round
+ (see Game.history), so that it can be keyed in again. """
+
+    def visit(self, game):
+        if game.history.undo(game):
+            game.round.set_current_throw(ZERO_THROW)
+            game.throw_undone()
+        else:
+            game.warn("Nothing to undo!")
+
+
+class Redo(GameVisitor):
     def visit(self, game):
-        game.round.hop_to_next_position()  # 3 is congruent to -1 (mod 4)
-        game.round.hop_to_next_position()
-        game.round.hop_to_next_position()
-        game.round.set_current_throw(zero_throw())
+        if game.history.redo(game):
+            game.throw_redone()
+        else:
+            game.warn("Nothing to redo!")
 
 
-# KEY_NUMLOCK
+class UndoableConfirm(GameVisitor):
+    """ Wraps the Confirm visitor of a game and records every confirmed throw into the history. """
+
+    def __init__(self, confirm):
+        self.confirm = confirm
+
+    def visit(self, game):
+        player = game.current_player
+        game_round = game.round
+        # recorded first, so that listeners called by the visitor find the throw in the history
+        game.history.record(Step(player, game.player_row(player), game_round.throws(),
+                                 game_round.current_position_int(), time.time()))
+        self.confirm.visit(game)
+
 
 ACTION_TO_VISITOR_DICT = {
-    Action.TRIPLE: Triple,
-    Action.DOUBLE: Double, Action.CLEAR: Clear,
-    Action.RESTART: Restart, Action.UNDO: Undo
+    Action.TRIPLE: Triple(),
+    Action.DOUBLE: Double(), Action.CLEAR: Clear(),
+    Action.RESTART: Restart(), Action.UNDO: Undo(), Action.REDO: Redo()
 }
 
 
+def build_action_table(confirm_visitor):
+    """ Returns a tuple indexed by Action holding the visitor handling each action.
+ Action.CONFIRM is handled by confirm_visitor, the rest is shared by all games."""
+    table = [None] * (max(Action) + 1)
+    for action, visitor in ACTION_TO_VISITOR_DICT.items():
+        table[action] = visitor
+    table[Action.CONFIRM] = UndoableConfirm(confirm_visitor) if confirm_visitor else None
+    return tuple(table)
+
+
 class Multiplier(IntEnum):
     SINGLE = 1
     DOUBLE = 2
@@ -70,17 +108,72 @@ class Multiplier(IntEnum):
 
 
 class Throw:
+    """ Immutable pair of the nominal value and the multiplier. Throws are interned,
+ use throw_of() instead of creating new instances on the hot path."""
+    __slots__ = ("points", "multiplier", "total")
+
     def __init__(self, points, multiplier):
         isinstance(multiplier, Multiplier)
         self.points = points
         self.multiplier = multiplier
+        self.total = points * multiplier.value
 
     def total_points(self):
-        return self.points * self.multiplier.value
+        return self.total
+
+    def __eq__(self, other):
+        return isinstance(other, Throw) and self.points == other.points and self.multiplier == other.multiplier
+
+    def __hash__(self):
+        return hash((self.points, self.multiplier))
+
+
+# Nominal values which can be present in a round: 0 stands for a miss (or for the nominal value
+# which hasn't been entered yet), 1-9 are also intermediate values of a two-digit input.
+NOMINAL_POINTS = tuple(range(0, 21)) + (25,)
+
+
+def _is_legal(points, multiplier):
+    return points in NOMINAL_POINTS and not (points == 25 and multiplier == Multiplier.TRIPLE)
+
+
+# Flyweight table indexed by [multiplier][points], None marks combinations which cannot be thrown.
+_THROW_TABLE = (None,) + tuple(
+    tuple(Throw(points, mult) if _is_legal(points, mult) else None for points in range(0, 26))
+    for mult in Multiplier)
+
+# All 62 scoring throws (20 segments times 3 multipliers plus single and double bull).
+LEGAL_THROWS = tuple(thrw for row in _THROW_TABLE[1:] for thrw in row if thrw is not None and thrw.points > 0)
+
+ZERO_THROW = _THROW_TABLE[Multiplier.SINGLE][0]
+
+
+def throw_of(points, multiplier):
+    """ Returns the interned Throw instance for the given nominal value and multiplier. """
+    thrw = _THROW_TABLE[multiplier][points]
+    if thrw is None:
+        raise ValueError("{}{} is not a valid throw.".format(points, MULTIPLIER_TO_STR[multiplier]))
+    return thrw
 
 
 def zero_throw():
-    return Throw(0, Multiplier.SINGLE)
+    return ZERO_THROW
+
+
+def throw_to_events(throw):
+    """ Returns the sequence of events a player would key in to enter and confirm the given throw. """
+    events = []
+    if throw.points >= 10:
+        events.append(input_controller.Event(input_controller.EventType.NUMBER, throw.points // 10))
+        events.append(input_controller.Event(input_controller.EventType.NUMBER, throw.points % 10))
+    elif throw.points > 0:
+        events.append(input_controller.Event(input_controller.EventType.NUMBER, throw.points))
+    if throw.multiplier == Multiplier.DOUBLE:
+        events.append(input_controller.Event(input_controller.EventType.ACTION, Action.DOUBLE))
+    elif throw.multiplier == Multiplier.TRIPLE:
+        events.append(input_controller.Event(input_controller.EventType.ACTION, Action.TRIPLE))
+    events.append(input_controller.Event(input_controller.EventType.ACTION, Action.CONFIRM))
+    return events
 
 
 @unique
@@ -93,37 +186,34 @@ class Position(IntEnum):
     # https://docs.python.org/3/reference/datamodel.html#special-method-names
     # += operator
     def __add__(self, other):
-        other = other % 4
-        return self.__from_int((other + self.value) % 4)
-
-    def __from_int(self, i):
-        if i == 0:
-            return Position.FIRST
-        elif i == 1:
-            return Position.SECOND
-        elif i == 2:
-            return Position.THIRD
-        elif i == 3:
-            return Position.OVER
-        raise ValueError("The integer passed must be in {0,1,2}.")
+        return _POSITIONS[(self.value + other) % 4]
 
     def to_int(self):
         return self.value
 
 
+_POSITIONS = tuple(Position)
+
+
 class GameRound:
+    """ Three throws of a single player. The current position is kept as a plain integer
+ (see Position for its meaning) so that moving within the round allocates nothing."""
+    __slots__ = ("__throws", "__current_position")
+
     def __init__(self):
-        self.__throws = [zero_throw()] * 3
-        self.__current_position = Position.FIRST
+        self.__throws = [ZERO_THROW] * 3
+        self.__current_position = Position.FIRST.value
 
     def clear(self):
-        self.__init__()
+        throws = self.__throws
+        throws[0] = throws[1] = throws[2] = ZERO_THROW
+        self.__current_position = Position.FIRST.value
 
     def current_throw(self):
         return self.__throws[self.__current_position]
 
     def current_position_int(self):
-        return self.__current_position.value
+        return self.__current_position
 
     def is_first_throw(self):
         return self.__current_position == Position.FIRST
@@ -132,14 +222,22 @@ class GameRound:
         return self.__current_position == Position.OVER
 
     def hop_to_next_position(self):
-        self.__current_position += 1
+        self.__current_position = (self.__current_position + 1) & 3
 
     def set_current_position(self, pos):
-        self.__current_position = pos
+        self.__current_position = int(pos)
 
     def set_current_throw(self, throw):
         self.__throws[self.__current_position] = throw
 
+    def throws(self):
+        return tuple(self.__throws)
+
+    def restore(self, throws, position):
+        """ Sets the round back to the given throws() and current position. """
+        self.__throws[:] = throws
+        self.__current_position = int(position)
+
     def to_string(self):
         result = ""
         for throw in self.__throws:
@@ -148,8 +246,62 @@ class GameRound:
 
     def points(self):
         """ Returns number of points which were scored for the given game round and were confirmed by the player. """
-        return reduce(lambda acc, next_: acc + next_.total_points(), self.__throws[:self.__current_position.to_int()],
-                      0)
+        throws = self.__throws
+        total = 0
+        i = 0
+        while i < self.__current_position:
+            total += throws[i].total
+            i += 1
+        return total
+
+
+class RenderIntent(Enum):
+    """ Kinds of requests the game logic makes to output devices besides refresh().
+ Intents are passed around as (RenderIntent, payload) pairs."""
+    WARNING = 1
+    STATS = 2
+
+
+NO_INTENTS = ()
+
+# Immutable snapshot of a game. The format of players depends on the game,
+# throws and position describe the current GameRound.
+GameState = namedtuple("GameState", ["players", "current_player", "throws", "position", "over"])
+
+
+def seat_names(num_players):
+    """ Names standing in for players whose names are not known, by their seats ("player 1", ...). """
+    return ["player {}".format(player + 1) for player in range(num_players)]
+
+
+class GameListener:
+    """ Base class of objects which want to be notified about the progress of a game
+ (see Game.add_listener). Listeners are called synchronously from the game logic, so they
+ must return quickly and hand any heavy work over to a different thread or process."""
+
+    def round_finished(self, game):
+        """ Called after the round of a player has been closed and the next player is on turn. """
+        pass
+
+    def throw_confirmed(self, game):
+        """ Called after a throw has been confirmed and counted (and the round possibly closed). """
+        pass
+
+    def throw_undone(self, game):
+        """ Called after the last confirmed throw has been taken back (see Game.history). """
+        pass
+
+    def throw_redone(self, game):
+        """ Called after an undone throw has been confirmed again, game.history.last() is the throw. """
+        pass
+
+    def event_applied(self, game, event):
+        """ Called by Game.loop() after an event read from the input controller has been applied. """
+        pass
+
+    def game_closed(self, game):
+        """ Called when the game is left (see Game.__exit__), whether it is over or not. """
+        pass
 
 
 class GameType(Enum):
@@ -159,6 +311,14 @@ class GameType(Enum):
 
 
 class Game(metaclass=ABCMeta):
+    # Built once for every subclass (see __init_subclass__), never modified afterwards.
+    action_table = build_action_table(None)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        confirm = cls.confirm_action()
+        cls.action_table = build_action_table(confirm() if confirm else None)
+
     def __init__(self, num_players, input_ctrl, output_ctrl):
         self.round = GameRound()
         self.output_ctrl = output_ctrl
@@ -166,15 +326,21 @@ class Game(metaclass=ABCMeta):
         self.num_players = num_players
         self.current_player = 0
         self.force_quit = False
+        # set by restore(), the history then only covers the leg since then
+        self.resumed = False
         self.config = self.default_config()
-        self.action_to_visitor_dict = ACTION_TO_VISITOR_DICT
-        self.action_to_visitor_dict[Action.CONFIRM] = self.confirm_action()
+        self.render_intents = []
+        self.listeners = []
+        self.history = History()
 
     def __enter__(self):
         return self
 
     def __exit__(self, _type, _value, _tb):
-        self.output_ctrl.clean_up()
+        for listener in self.listeners:
+            listener.game_closed(self)
+        if self.output_ctrl:
+            self.output_ctrl.clean_up()
 
     @abstractmethod
     def refresh(self):
@@ -187,8 +353,9 @@ new information is displayed to the output devices (usually a set of displays)."
         """:return: True if the game is over, False otherwise."""
         pass
 
+    @classmethod
     @abstractmethod
-    def confirm_action(self):
+    def confirm_action(cls):
         """ The action Action.CONFIRM is usually the one which differs the most among games.
 Each is game is required to implement handler to this action as no abstract implementation
 would make no sense here.
@@ -202,10 +369,136 @@ would make no sense here.
         """
         pass
 
+    @abstractmethod
+    def players_state(self):
+        """
+        :return: immutable (hashable) representation of the score of all players
+        """
+        pass
+
+    @abstractmethod
+    def player_row(self, player):
+        """
+        :return: immutable representation of the score of a single player
+        """
+        pass
+
+    @abstractmethod
+    def restore_player_row(self, player, row):
+        """ Sets the score of a single player back to the given player_row(). """
+        pass
+
+    @abstractmethod
+    def restore_players(self, players):
+        """ Sets the score of all players back to the given players_state(). """
+        pass
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def round_finished(self):
+        """ Each game calls this at the end of its next_round(). """
+        for listener in self.listeners:
+            listener.round_finished(self)
+
+    def throw_confirmed(self):
+        """ Each game calls this at the end of its Confirm visitor. """
+        for listener in self.listeners:
+            listener.throw_confirmed(self)
+
+    def throw_undone(self):
+        for listener in self.listeners:
+            listener.throw_undone(self)
+
+    def throw_redone(self):
+        for listener in self.listeners:
+            listener.throw_redone(self)
+
+    def state(self):
+        return GameState(self.players_state(), self.current_player, self.round.throws(),
+                         self.round.current_position_int(), self.over())
+
+    def restore(self, state):
+        """ Puts the game back into the given GameState (see state()). The history is lost. """
+        self.history.clear()
+        self.resumed = True
+        self.force_quit = False
+        self.restore_players(state.players)
+        self.current_player = state.current_player
+        self.round.restore(state.throws, state.position)
+        if state.over and not self.over():
+            self.force_quit = True
+
+    def redraw(self):
+        """ refresh() as a single frame of the output devices. """
+        if not self.output_ctrl:
+            self.refresh()
+            return
+        self.output_ctrl.begin_frame()
+        try:
+            self.refresh()
+        finally:
+            self.output_ctrl.end_frame()
+
+    def warn(self, text):
+        """ Asks output devices to show a warning. Nothing is displayed until render() is called."""
+        self.render_intents.append((RenderIntent.WARNING, text))
+
+    def show_stats(self, lines):
+        """ Asks output devices to show statistics (a pair of LCD lines) between rounds. """
+        self.render_intents.append((RenderIntent.STATS, lines))
+
+    def take_render_intents(self):
+        """ Returns render intents collected since the last call and forgets them. """
+        if not self.render_intents:
+            return NO_INTENTS
+        intents = self.render_intents
+        self.render_intents = []
+        return intents
+
+    def step(self, event):
+        """ Applies a single event to the game without touching any device.
+:return: render intents the event produced"""
+        if event.e_type is input_controller.EventType.NUMBER:
+            self.digit_submitted(event.value)
+        else:
+            self.action_table[event.value].visit(self)
+        return self.take_render_intents()
+
+    def apply(self, events):
+        """ Applies events until they are exhausted or the game is over. Events which
+come after the end of the game are not consumed.
+:return: pair of the resulting GameState and a list of render intents"""
+        intents = []
+        if self.over():
+            return self.state(), intents
+        digit_submitted = self.digit_submitted
+        action_table = self.action_table
+        for event in events:
+            is_action = event.e_type is not input_controller.EventType.NUMBER
+            if is_action:
+                action_table[event.value].visit(self)
+            else:
+                digit_submitted(event.value)
+            if self.render_intents:
+                intents += self.take_render_intents()
+            # Only actions can end the game.
+            if is_action and self.over():
+                break
+        return self.state(), intents
+
+    def render(self, intents):
+        """ Passes render intents returned by step() or apply() to output devices. """
+        for intent, payload in intents:
+            if intent is RenderIntent.WARNING:
+                self.output_ctrl.warning(payload)
+            elif intent is RenderIntent.STATS:
+                self.output_ctrl.show_stats(*payload)
+
     def action_submitted(self, action):
         """ This method takes an action as its input and modifies internal state of the
 game object according to the game rules and the action itself."""
-        self.action_to_visitor_dict[action]().visit(self)
+        self.action_table[action].visit(self)
 
     def digit_submitted(self, digit):
         """ This method takes a digit as its input and modifies internal state of the
@@ -215,17 +508,17 @@ game object according to the game rules and the digit itself."""
         points_nominal = throw.points
         multiplier = throw.multiplier
         if points_nominal == 0:
-            self.round.set_current_throw(Throw(digit, multiplier))
+            self.round.set_current_throw(throw_of(digit, multiplier))
         elif points_nominal == 1:
-            self.round.set_current_throw(Throw(10 + digit, multiplier))
+            self.round.set_current_throw(throw_of(10 + digit, multiplier))
         elif points_nominal == 2:
             points_cand = 20 + digit
             if digit == 0 or (digit == 5 and multiplier != Multiplier.TRIPLE):
-                self.round.set_current_throw(Throw(points_cand, multiplier))
+                self.round.set_current_throw(throw_of(points_cand, multiplier))
             else:
-                self.output_ctrl.warning(str(points_cand) + multiplier.to_string() + " not valid!")
+                self.warn(str(points_cand) + multiplier.to_string() + " not valid!")
         else:
-            self.output_ctrl.warning("hit <-")
+            self.warn("hit <-")
 
     def loop(self):
         """ Runs a game loop until the game is over. First, output devices
@@ -233,11 +526,10 @@ are refreshed with new game data and then the game waits for new events.
 Game ends whether the self.over() returns True or there are no more other
 events. """
         while not self.over():
-            self.refresh()
+            self.redraw()
             next_event = self.input_ctrl.next_event()
             if not next_event:
                 return
-            if next_event.e_type == input_controller.EventType.NUMBER:
-                self.digit_submitted(next_event.value)
-            elif next_event.e_type == input_controller.EventType.ACTION:
-                self.action_submitted(next_event.value)
+            self.render(self.step(next_event))
+            for listener in self.listeners:
+                listener.event_applied(self, next_event)
@@ -1,20 +1,22 @@
-from .common import Game, GameVisitor
-from functools import reduce
+from array import array
 from collections import OrderedDict
+from collections.abc import Mapping
+
+from .common import Game, GameVisitor
+
+CLOSED = 3
 
 
 class Confirm(GameVisitor):
     def visit(self, game):
         thrw = game.round.current_throw()
-        (pts, mult) = (thrw.points, thrw.multiplier)
-        if pts >= 15:
-            next_score = game.players[game.current_player][pts] + mult
-            if next_score > 3:
-                next_score = 3
-            game.players[game.current_player][pts] = next_score
+        target = TARGET_INDEX[thrw.points]
+        if target >= 0:
+            game.add_marks(target, thrw.multiplier)
         game.round.hop_to_next_position()
         if game.round.is_over():
             game.next_round()
+        game.throw_confirmed()
 
 
 def cricket_score_init():
@@ -26,22 +28,143 @@ def cricket_score_init():
     return OrderedDict(sorted(result.items(), key=lambda t: t[0]))
 
 
+TARGETS = tuple(cricket_score_init().keys())
+NUM_TARGETS = len(TARGETS)
+# Maps the nominal value of a throw to the column of the marks matrix, -1 if it is not a target.
+TARGET_INDEX = tuple(TARGETS.index(points) if points in TARGETS else -1 for points in range(0, 26))
+
+
+class Marks(Mapping):
+    """ Read-only view of the marks of a single player keyed by target, so that a player
+ can still be looked at (and compared) the same way as cricket_score_init(). """
+    __slots__ = ("__matrix", "__offset")
+
+    def __init__(self, matrix, player):
+        self.__matrix = matrix
+        self.__offset = player * NUM_TARGETS
+
+    def __getitem__(self, target):
+        if not 0 <= target < len(TARGET_INDEX) or TARGET_INDEX[target] < 0:
+            raise KeyError(target)
+        return self.__matrix[self.__offset + TARGET_INDEX[target]]
+
+    def __iter__(self):
+        return iter(TARGETS)
+
+    def __len__(self):
+        return NUM_TARGETS
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class Cricket(Game):
-    def __init__(self, num_players, input_ctrl, output_ctrl):
+    """ Marks of all players are kept in a single players x targets int8 matrix (stored row by row).
+ Running counters of closed targets make both scoring and the game over check constant-time.
+ With config["scoring"] set, marks on a target the player has already closed score its value
+ as long as some other player has not closed it, the game is won by closing everything
+ while having at least as many points as anybody else.
+
+ On an LCD with custom glyphs (output_ctrl.lcd_glyphs) the marks of a target take a single
+ cell (output_ctrl.mark_cells[marks] tells what the cell shows), so the current player and the next one are shown at once, a line each."""
+
+    def __init__(self, num_players, input_ctrl, output_ctrl, scoring=False):
         super().__init__(num_players, input_ctrl, output_ctrl)
-        aux = []
-        for i in range(0, num_players):
-            aux.append(cricket_score_init())
-        self.players = aux
+        self.config["scoring"] = scoring
+        self.marks = array("b", bytes(num_players * NUM_TARGETS))
+        self.players = [Marks(self.marks, player) for player in range(num_players)]
+        self.points = [0] * num_players
+        # number of targets closed by each player and number of players who closed each target
+        self.closed_targets = [0] * num_players
+        self.closed_by = [0] * NUM_TARGETS
+        self.max_points = 0
+        self.winner = None
+        self.__rows_to_string = [None] * num_players
+        self.__dense_lines = [None] * num_players
 
     def over(self):
-        return self.force_quit or reduce(lambda so_far, player: so_far or
-                                                                reduce(lambda in_so_far, tup: in_so_far and tup == 3,
-                                                                       player.values(), True), self.players, False)
+        return self.force_quit or self.winner is not None
 
-    def confirm_action(self):
+    @classmethod
+    def confirm_action(cls):
         return Confirm
 
+    def default_config(self):
+        return {"scoring": False}
+
+    def players_state(self):
+        """ Marks of every player (ordered as TARGETS), in scoring games followed by the points. """
+        rows = []
+        for player in range(self.num_players):
+            row = tuple(self.marks[player * NUM_TARGETS:(player + 1) * NUM_TARGETS])
+            if self.config["scoring"]:
+                row += (self.points[player],)
+            rows.append(row)
+        return tuple(rows)
+
+    def player_row(self, player):
+        """ Marks of the player (an array ordered as TARGETS, never modified) and the points. """
+        offset = player * NUM_TARGETS
+        return self.marks[offset:offset + NUM_TARGETS], self.points[player]
+
+    def restore_player_row(self, player, row):
+        marks, points = row
+        offset = player * NUM_TARGETS
+        for target, thrown in enumerate(marks):
+            was_closed = self.marks[offset + target] == CLOSED
+            if was_closed != (thrown == CLOSED):
+                self.closed_by[target] += -1 if was_closed else 1
+        self.marks[offset:offset + NUM_TARGETS] = marks
+        self.closed_targets[player] = marks.count(CLOSED)
+        self.points[player] = points
+        self.max_points = max(self.points)
+        if self.winner == player:
+            self.winner = None
+        if self.closed_targets[player] == NUM_TARGETS and \
+                (not self.config["scoring"] or points == self.max_points):
+            self.winner = player
+        self.__rows_to_string[player] = None
+        self.__dense_lines[player] = None
+
+    def restore_players(self, players):
+        """ The running counters are recomputed from the marks. """
+        scoring = self.config["scoring"]
+        rows = [row[:NUM_TARGETS] for row in players]
+        # the Marks views share the array, it is overwritten in place
+        self.marks[:] = array("b", [thrown for row in rows for thrown in row])
+        self.points = [row[NUM_TARGETS] for row in players] if scoring else [0] * self.num_players
+        self.closed_targets = [row.count(CLOSED) for row in rows]
+        self.closed_by = [column.count(CLOSED) for column in zip(*rows)]
+        self.max_points = max(self.points)
+        self.winner = None
+        for player, closed in enumerate(self.closed_targets):
+            if closed == NUM_TARGETS and (not scoring or self.points[player] == self.max_points):
+                self.winner = player
+                break
+        self.__rows_to_string = [None] * self.num_players
+        self.__dense_lines = [None] * self.num_players
+
+    def add_marks(self, target, count):
+        """ Adds count marks of the target (an index into TARGETS) to the current player. """
+        player = self.current_player
+        cell = player * NUM_TARGETS + target
+        before = self.marks[cell]
+        after = before + count
+        if after >= CLOSED:
+            if before < CLOSED:
+                self.closed_targets[player] += 1
+                self.closed_by[target] += 1
+            if self.config["scoring"] and self.closed_by[target] < self.num_players:
+                self.points[player] += (after - max(before, CLOSED)) * TARGETS[target]
+                self.max_points = max(self.max_points, self.points[player])
+            after = CLOSED
+        self.marks[cell] = after
+        self.__rows_to_string[player] = None
+        self.__dense_lines[player] = None
+        if self.closed_targets[player] == NUM_TARGETS and \
+                (not self.config["scoring"] or self.points[player] == self.max_points):
+            self.winner = player
+
     def restart(self):
         self.force_quit = True
 
@@ -54,15 +177,29 @@ class Cricket(Game):
     def next_round(self):
         self.current_player = (self.current_player + 1) % self.num_players
         self.round.clear()
+        self.round_finished()
 
     def __points_to_string(self):
+        """ The strings are only rebuilt when the marks of the player change. """
+        if self.num_players > 1 and getattr(self.output_ctrl, "lcd_glyphs", False):
+            # the player on turn and the next one, in a fixed order so that a change of turn
+            # only moves the marker
+            shown = sorted((self.current_player, (self.current_player + 1) % self.num_players))
+            return [(">" if player == self.current_player else " ") + self.__dense_line(player)
+                    for player in shown]
+        rows = self.__rows_to_string[self.current_player]
+        if rows is None:
+            rows = self.__row_to_string(self.current_player)
+            self.__rows_to_string[self.current_player] = rows
+        return rows
+
+    def __row_to_string(self, player):
         first = ""
         second = ""
-        curr_player = self.players[self.current_player]
-        for key in curr_player:
+        for target, key in enumerate(TARGETS):
             displ_key = key
-            thrown = curr_player[key]
-            if thrown == 3:
+            thrown = self.marks[player * NUM_TARGETS + target]
+            if thrown == CLOSED:
                 displ_key = ""
                 thrown = ""
             first += "{:2}".format(displ_key)
@@ -75,6 +212,19 @@ class Cricket(Game):
                 second += " "
         return [first, second]
 
+    def __dense_line(self, player):
+        """ Number of the player, a cell of marks per target (ordered as TARGETS) and the points. """
+        line = self.__dense_lines[player]
+        if line is None:
+            offset = player * NUM_TARGETS
+            marks = self.marks[offset:offset + NUM_TARGETS]
+            cells = self.output_ctrl.mark_cells
+            line = "{:<2}".format(player + 1) + "".join(cells[thrown] for thrown in marks)
+            if self.config["scoring"]:
+                line += "{:>6}".format(self.points[player])
+            self.__dense_lines[player] = line
+        return line
+
     def __game_round_to_string(self):
         curr_thrw = self.round.current_throw()
         if curr_thrw.points == 0:
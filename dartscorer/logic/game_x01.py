@@ -1,5 +1,5 @@
-from functools import reduce
-from .common import Game, GameVisitor
+from .checkout import checkout
+from .common import Game, GameVisitor, Position
 
 
 class Confirm(GameVisitor):
@@ -7,25 +7,54 @@ class Confirm(GameVisitor):
         game.round.hop_to_next_position()
         curr_pts = game.players[game.current_player] - game.round.points()
         if curr_pts < 0:
-            game.output_ctrl.warning("Overthrow!")
+            game.warn("Overthrow!")
         if curr_pts <= 0 or game.round.is_over():
             game.next_round()
+        game.throw_confirmed()
 
 
 class GameX01(Game):
 
-    def __init__(self, num_players, input_ctrl, output_ctrl, init_score=501):
+    def __init__(self, num_players, input_ctrl, output_ctrl, init_score=501, start_scores=None):
+        """ start_scores are scores the players start from if they differ (a handicap, see
+ stats.rating.handicap_scores), init_score is still the score of the game kept in config."""
         super().__init__(num_players, input_ctrl, output_ctrl)
-        self.players = [init_score] * num_players
+        self.config["init_score"] = init_score
+        if start_scores is None:
+            self.players = [init_score] * num_players
+        elif len(start_scores) != num_players or min(start_scores) < 1:
+            raise ValueError("A positive start score is required for every player.")
+        else:
+            self.players = list(start_scores)
 
-    def confirm_action(self):
+    @classmethod
+    def confirm_action(cls):
         return Confirm
 
+    def default_config(self):
+        return {"init_score": 501}
+
+    def players_state(self):
+        return tuple(self.players)
+
+    def player_row(self, player):
+        return self.players[player]
+
+    def restore_player_row(self, player, row):
+        self.players[player] = row
+
+    def restore_players(self, players):
+        self.players = list(players)
+
     def over(self):
-        return self.force_quit or reduce(lambda x, y: x or y == 0, self.players, False)
+        return self.force_quit or 0 in self.players
 
     def refresh(self):
-        self.__highlight_current_throw()
+        route = self.__checkout_route()
+        if route:
+            self.output_ctrl.lcd_set_second_line(self.__route_to_string(route))
+        else:
+            self.__highlight_current_throw()
         self.output_ctrl.lcd_set_first_line(self.__game_round_to_string())
         self.output_ctrl.segment_set_text(self.__points_to_string())
 
@@ -40,6 +69,19 @@ class GameX01(Game):
             self.players[self.current_player] = curr_pts
         self.current_player = (self.current_player + 1) % self.num_players
         self.round.clear()
+        self.round_finished()
+
+    def __checkout_route(self):
+        remaining = self.players[self.current_player] - self.round.points()
+        return checkout(remaining, Position.OVER - self.round.current_position_int())
+
+    def __route_to_string(self, route):
+        """ The suggested throws are aligned with the throws of the round on the first line,
+ starting with the current one. """
+        result = " " * 4 * self.round.current_position_int()
+        for throw in route:
+            result += "{:3}".format(throw.points) + throw.multiplier.to_string()
+        return result
 
     def __highlight_current_throw(self):
         no = self.round.current_position_int() * 4
@@ -50,10 +92,15 @@ class GameX01(Game):
     def __points_to_string(self):
         """ Returns a string representation of the score. Since the segment display has got
  limited display capacity, score of only two most recent players (starting with a player
- whose index in the player array is even) is diplayed. """
+ whose index in the player array is even) is diplayed, unless there are enough digits
+ (several modules in a chain) to show everybody. """
         curr_points = str(self.players[self.current_player] - self.round.points())
         if self.num_players == 1:
             return curr_points
+        if self.num_players > 2 and 4 * self.num_players <= getattr(self.output_ctrl, "segment_digits", 8):
+            points = [str(score) for score in self.players]
+            points[self.current_player] = curr_points
+            return "".join("{:4}".format(score) for score in points).rstrip()
         points = ""
         if self.current_player % 2 == 0:
             points += curr_points
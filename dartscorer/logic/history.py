@@ -0,0 +1,89 @@
+"""Undo/redo history of confirmed throws. Every step is a snapshot of the game just before a
+throw was confirmed, stored as the difference to its successor: a throw only ever changes the
+row of the player who threw it (the score in X01, the marks and points in Cricket), the round
+and the player on turn. Creating a step therefore costs the same no matter how many players
+or steps there are, all the other rows are shared with the neighbouring snapshots, and both
+undo and redo are constant-time. The state a step leads to is only captured when the step
+is undone, which keeps recording on the keypress path cheap."""
+from collections import deque
+
+# Number of steps which can be undone, older ones are forgotten.
+HISTORY_LIMIT = 10000
+
+
+class Step:
+    __slots__ = ("player", "row_before", "throws_before", "position_before", "confirmed",
+                 "row_after", "throws_after", "position_after", "player_after")
+
+    def __init__(self, player, row_before, throws_before, position_before, confirmed):
+        self.player = player
+        self.row_before = row_before
+        self.throws_before = throws_before
+        self.position_before = position_before
+        self.confirmed = confirmed  # time.time() of the confirmation
+        self.row_after = None
+        self.throws_after = None
+        self.position_after = None
+        self.player_after = None
+
+
+class History:
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.__done = deque(maxlen=limit)
+        self.__undone = []
+
+    def __len__(self):
+        return len(self.__done)
+
+    def steps(self):
+        """ Steps which can be undone, the oldest one first. """
+        return iter(self.__done)
+
+    def last(self):
+        """ The step which would be undone next, None if there is none. """
+        return self.__done[-1] if self.__done else None
+
+    def can_undo(self):
+        return bool(self.__done)
+
+    def can_redo(self):
+        return bool(self.__undone)
+
+    def record(self, step):
+        """ A new throw makes the undone steps unreachable. """
+        self.__done.append(step)
+        if self.__undone:
+            self.__undone.clear()
+
+    def undo(self, game):
+        """ Puts the game back to the moment just before the last confirmed throw was confirmed.
+:return: False if there is nothing to undo"""
+        if not self.__done:
+            return False
+        step = self.__done.pop()
+        self.__undone.append(step)
+        # the game is in the state the step led to (redo() returns to it)
+        step.row_after = game.player_row(step.player)
+        step.throws_after = game.round.throws()
+        step.position_after = game.round.current_position_int()
+        step.player_after = game.current_player
+        game.restore_player_row(step.player, step.row_before)
+        game.current_player = step.player
+        game.round.restore(step.throws_before, step.position_before)
+        return True
+
+    def redo(self, game):
+        """ Returns to the state the last undo() started from.
+:return: False if there is nothing to redo"""
+        if not self.__undone:
+            return False
+        step = self.__undone.pop()
+        self.__done.append(step)
+        game.restore_player_row(step.player, step.row_after)
+        game.current_player = step.player_after
+        game.round.restore(step.throws_after, step.position_after)
+        return True
+
+    def clear(self):
+        self.__done.clear()
+        self.__undone.clear()
@@ -1,8 +1,36 @@
+import atexit
+import os
+import sqlite3
+from sys import stderr as serr
+
 from ..logic.cricket import Cricket
 from ..display.controller import DisplayController
 from ..logic.common import GameType
 from ..input.input_controller import EventPoller
 from .game_x01 import GameX01
+from ..persistence.journal import JournalError, JournalRecorder, new_journal_path
+from ..persistence.codec import DATA_DIR
+from ..persistence.match_store import MatchRecorder, MatchStore
+from ..persistence.snapshot import SnapshotKeeper, load_snapshot, remove_snapshot
+from ..stats.player_stats import StatsTracker
+try:
+    from ..stats.archive import ArchiveRecorder, ThrowArchive
+    from ..stats.heatmap import HeatmapRecorder, HeatmapStore
+    from ..stats.rating import RatingBook, RatingRecorder
+except ImportError:  # numpy is optional
+    ThrowArchive = None
+    HeatmapStore = None
+    RatingBook = None
+
+# Names of the players who can be picked for a game, one per line.
+ROSTER_PATH = os.path.join(DATA_DIR, "players.txt")
+
+_match_store = None
+_throw_archive = None
+_rating_book = None
+_heatmap_store = None
+# statistics of all finished legs since the program was started, keyed by player name
+session_stats = {}
 
 
 class UserConfig:
@@ -31,13 +59,137 @@ def get_user_config(output_ctrl, input_ctrl):
     return UserConfig(num_players, game_type)
 
 
-def game_factory():
+def offer_resume(output_ctrl, input_ctrl, snapshot):
+    """ Asks whether the game saved in the snapshot should be resumed. """
+    output_ctrl.lcd_set_first_line("resume game? 1/2")
+    output_ctrl.lcd_set_second_line("{} {} players".format(snapshot.game_type.name, snapshot.num_players))
+    return input_ctrl.wait_for_next_number() == 1
+
+
+def load_roster(path=ROSTER_PATH):
+    """ Names listed in the roster file, an empty list if there is none. """
+    try:
+        with open(path) as roster_file:
+            return list(dict.fromkeys(line.strip() for line in roster_file if line.strip()))
+    except OSError:
+        return []
+
+
+def get_player_names(output_ctrl, input_ctrl, num_players, roster):
+    """ Asks for the roster number of every player, the second line lists the numbers with the
+ first letters of the names (as many as fit).
+:return: the names, None if the players are not named"""
+    if len(roster) < num_players:
+        return None
+    output_ctrl.lcd_set_first_line("named players?")
+    output_ctrl.lcd_set_second_line("1 yes / 2 no")
+    if input_ctrl.wait_for_next_number() != 1:
+        return None
+    names = []
+    while len(names) < num_players:
+        output_ctrl.lcd_set_first_line("player {} no.:".format(len(names) + 1))
+        output_ctrl.lcd_set_second_line(" ".join("{}{}".format(i + 1, name[:3]) for i, name in enumerate(roster)))
+        number = input_ctrl.wait_for_next_number()
+        if 1 <= number <= len(roster) and roster[number - 1] not in names:
+            names.append(roster[number - 1])
+        else:
+            output_ctrl.warning("pick another one")
+    output_ctrl.lcd_set_second_line(", ".join(names), 0.50)
+    return names
+
+
+def offer_handicap(output_ctrl, input_ctrl, start_scores):
+    """ Asks whether the game should start from the handicap scores. """
+    output_ctrl.lcd_set_first_line("handicap? 1/2")
+    output_ctrl.lcd_set_second_line(" ".join(str(score) for score in start_scores))
+    return input_ctrl.wait_for_next_number() == 1
+
+
+def match_store():
+    """ The store is opened with the first game and shared by all the following ones. """
+    global _match_store
+    if _match_store is None:
+        _match_store = MatchStore()
+        atexit.register(_match_store.close)
+    return _match_store
+
+
+def throw_archive():
+    global _throw_archive
+    if _throw_archive is None:
+        _throw_archive = ThrowArchive()
+    return _throw_archive
+
+
+def rating_book():
+    global _rating_book
+    if _rating_book is None:
+        _rating_book = RatingBook()
+    return _rating_book
+
+
+def heatmap_store():
+    global _heatmap_store
+    if _heatmap_store is None:
+        _heatmap_store = HeatmapStore()
+        atexit.register(_heatmap_store.close)
+    return _heatmap_store
+
+
+def game_factory(names=None):
+    """ Starts a new (or the resumed) game with all its recorders. Unless names are given, the
+ players are picked from the roster (ROSTER_PATH). names are used only if there is one for
+ every player of the game, otherwise the players are known by their seats, which are not
+ rated. An X01 game of named players can start from handicaps given by their ratings. """
     input_ctrl = EventPoller()
     output_ctrl = DisplayController()
-    user_config = get_user_config(output_ctrl, input_ctrl)
-    if user_config.game == GameType.X01:
-        return GameX01(user_config.num_players, input_ctrl, output_ctrl)
-    elif user_config.game == GameType.Cricket:
-        return Cricket(user_config.num_players, input_ctrl, output_ctrl)
+    snapshot = load_snapshot()
+    if snapshot is not None and offer_resume(output_ctrl, input_ctrl, snapshot):
+        game = snapshot.new_game(input_ctrl, output_ctrl)
+        if names is None:
+            names = get_player_names(output_ctrl, input_ctrl, game.num_players, load_roster())
     else:
-        raise ValueError("Not supported yet.")
+        remove_snapshot()
+        user_config = get_user_config(output_ctrl, input_ctrl)
+        if names is None:
+            names = get_player_names(output_ctrl, input_ctrl, user_config.num_players, load_roster())
+        if user_config.game == GameType.X01:
+            start_scores = None
+            if RatingBook is not None and names is not None and len(names) == user_config.num_players:
+                handicaps = rating_book().handicap_scores(names)
+                if len(set(handicaps)) > 1 and offer_handicap(output_ctrl, input_ctrl, handicaps):
+                    start_scores = handicaps
+            game = GameX01(user_config.num_players, input_ctrl, output_ctrl, start_scores=start_scores)
+        elif user_config.game == GameType.Cricket:
+            game = Cricket(user_config.num_players, input_ctrl, output_ctrl)
+        else:
+            raise ValueError("Not supported yet.")
+    if names is not None and len(names) != game.num_players:
+        print("The names do not match the players, the players are not named.", file=serr)
+        names = None
+    StatsTracker.start(game, names, session=session_stats)
+    try:
+        SnapshotKeeper.start(game)
+    except OSError as ex:
+        print("The game is not going to be resumable: {}".format(ex), file=serr)
+    try:
+        JournalRecorder.start(game, new_journal_path())
+    except (OSError, JournalError) as ex:
+        print("The game is not going to be recorded: {}".format(ex), file=serr)
+    try:
+        MatchRecorder.start(game, match_store(), names)
+    except (OSError, sqlite3.Error) as ex:
+        print("The game is not going to be saved into the match history: {}".format(ex), file=serr)
+    if ThrowArchive is not None:
+        try:
+            ArchiveRecorder.start(game, throw_archive(), names)
+        except (OSError, ValueError) as ex:
+            print("The game is not going to be archived: {}".format(ex), file=serr)
+    if RatingBook is not None and names is not None:
+        RatingRecorder.start(game, rating_book(), names)
+    if HeatmapStore is not None:
+        try:
+            HeatmapRecorder.start(game, heatmap_store(), names)
+        except OSError as ex:
+            print("Hits are not going to be counted: {}".format(ex), file=serr)
+    return game
@@ -0,0 +1,58 @@
+"""Binary encoding of game states shared by the journal and the snapshots.
+
+A GameState is encoded as a fixed header (current player, position, over, the three throws
+of the round, number of players, values per player, 0 meaning a single value) followed by
+the int32 values of all players."""
+from array import array
+import os
+import struct
+
+from ..logic.common import GameState, GameType, LEGAL_THROWS, ZERO_THROW
+from ..logic.cricket import Cricket
+from ..logic.game_x01 import GameX01
+
+DATA_DIR = os.path.join(os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share")), "dartscorer")
+
+GAME_CLASSES = {GameType.X01: GameX01, GameType.Cricket: Cricket}
+GAME_TYPES = {cls: game_type for game_type, cls in GAME_CLASSES.items()}
+# Config of each game in a fixed order, with the type of each value.
+CONFIG_FIELDS = {GameType.X01: (("init_score", int),), GameType.Cricket: (("scoring", bool),)}
+
+_STATE = struct.Struct("<BBB3BBB")
+
+THROWS = (ZERO_THROW,) + LEGAL_THROWS
+THROW_CODE = {thrw: code for code, thrw in enumerate(THROWS)}
+
+
+class CodecError(Exception):
+    pass
+
+
+def encode_state(state):
+    players = state.players
+    width = len(players[0]) if players and isinstance(players[0], tuple) else 0
+    values = array("i", (value for row in players for value in row) if width else players)
+    t0, t1, t2 = state.throws
+    return _STATE.pack(state.current_player, state.position, state.over,
+                       THROW_CODE[t0], THROW_CODE[t1], THROW_CODE[t2], len(players), width) + values.tobytes()
+
+
+def decode_state(payload):
+    try:
+        current_player, position, over, t0, t1, t2, num_players, width = _STATE.unpack_from(payload)
+        values = array("i")
+        values.frombytes(payload[_STATE.size:])
+        throws = (THROWS[t0], THROWS[t1], THROWS[t2])
+    except (struct.error, ValueError, IndexError) as ex:
+        raise CodecError("Damaged game state: {}".format(ex))
+    if len(values) != num_players * max(width, 1):
+        raise CodecError("Damaged game state: {} values of {} players.".format(len(values), num_players))
+    if width:
+        players = tuple(tuple(values[i * width:(i + 1) * width]) for i in range(num_players))
+    else:
+        players = tuple(values)
+    return GameState(players, current_player, throws, position, bool(over))
+
+
+def new_game(game_type, num_players, config, input_ctrl=None, output_ctrl=None):
+    return GAME_CLASSES[game_type](num_players, input_ctrl, output_ctrl, **config)
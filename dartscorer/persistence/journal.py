@@ -0,0 +1,258 @@
+"""Append-only binary journal of a game. The journal of a game is a single file:
+
+    magic, header length (u16), header (JSON: game type, number of players, config)
+    records...
+
+An event takes a single byte: digits are stored as they are, actions as ACTION_TAG | action.
+A checkpoint (CHECKPOINT_TAG, payload length (u16), payload) holds the whole GameState after
+all the events preceding it, so any point of the game is reconstructed by restoring the
+nearest checkpoint and replaying the few events which follow it.
+
+Events are only appended to an in-memory buffer on the keypress path, a background thread
+writes the buffer to the file (see JournalWriter)."""
+from bisect import bisect_left
+import json
+import os
+import struct
+import threading
+import time
+
+from ..input.input_controller import Action, Event, EventType
+from ..logic.common import GameListener, GameType
+from .codec import CodecError, DATA_DIR, GAME_TYPES, decode_state, encode_state, new_game
+
+MAGIC = b"DSJ1"
+ACTION_TAG = 0x80
+CHECKPOINT_TAG = 0xC0
+DEFAULT_CHECKPOINT_INTERVAL = 256
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+JOURNAL_DIR = os.path.join(DATA_DIR, "journal")
+
+_HEADER = struct.Struct("<H")
+_CHECKPOINT = struct.Struct("<BH")
+# Events are decoded into shared (flyweight) instances, which must not be modified.
+_ACTIONS = {action.value: action for action in Action}
+_EVENTS = tuple(Event(EventType.NUMBER, code) if code < ACTION_TAG else
+                Event(EventType.ACTION, _ACTIONS[code - ACTION_TAG]) if code - ACTION_TAG in _ACTIONS
+                else None for code in range(256))
+_UNDO = _EVENTS[ACTION_TAG | Action.UNDO]
+_REDO = _EVENTS[ACTION_TAG | Action.REDO]
+
+
+class JournalError(Exception):
+    pass
+
+
+def encode_event(event):
+    if event.e_type is EventType.NUMBER:
+        return event.value
+    return ACTION_TAG | event.value
+
+
+def encode_header(game):
+    header = json.dumps({"game": GAME_TYPES[type(game)].name, "players": game.num_players,
+                         "config": game.config}).encode()
+    return MAGIC + _HEADER.pack(len(header)) + header
+
+
+def checkpoint_record(game):
+    payload = encode_state(game.state())
+    return _CHECKPOINT.pack(CHECKPOINT_TAG, len(payload)) + payload
+
+
+class JournalWriter:
+    """ Buffered append-only writer. append() only extends an in-memory buffer, the data
+ reach the file when a background thread wakes up (every flush_interval seconds) or when
+ the writer is closed. With fsync, every write is also synced to the storage. """
+
+    def __init__(self, path, flush_interval=DEFAULT_FLUSH_INTERVAL, fsync=False):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.__file = open(path, "ab")
+        self.__buffer = bytearray()
+        self.__lock = threading.Condition()
+        self.__write_lock = threading.Lock()
+        self.__closed = False
+        self.__thread = threading.Thread(target=self.__run, name="journal-writer", daemon=True)
+        self.__thread.start()
+
+    def append(self, data):
+        with self.__lock:
+            if self.__closed:
+                raise JournalError("The journal is closed.")
+            self.__buffer += data
+
+    def append_byte(self, byte):
+        with self.__lock:
+            if self.__closed:
+                raise JournalError("The journal is closed.")
+            self.__buffer.append(byte)
+
+    def flush(self):
+        """ Writes the buffer out (from the calling thread). Appending is not blocked
+ while the data are being written. """
+        with self.__write_lock:
+            with self.__lock:
+                data = self.__buffer
+                self.__buffer = bytearray()
+            if data:
+                self.__file.write(data)
+                self.__file.flush()
+                if self.fsync:
+                    os.fsync(self.__file.fileno())
+
+    def __run(self):
+        while True:
+            with self.__lock:
+                if not self.__closed:
+                    self.__lock.wait(self.flush_interval)
+                closed = self.__closed
+            self.flush()
+            if closed:
+                return
+
+    def close(self):
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            self.__lock.notify()
+        self.__thread.join()
+        self.__file.close()
+
+
+class JournalRecorder(GameListener):
+    """ Records the events Game.loop() consumes into a JournalWriter, every
+ checkpoint_interval events (and at the very beginning) a checkpoint is added. """
+
+    def __init__(self, writer, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL):
+        self.writer = writer
+        self.checkpoint_interval = checkpoint_interval
+        self.__events = 0
+
+    @classmethod
+    def start(cls, game, path, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, **writer_args):
+        """ Creates the journal (the file must not exist yet) and starts recording the game. """
+        if os.path.exists(path):
+            raise JournalError("The journal {} already exists.".format(path))
+        writer = JournalWriter(path, **writer_args)
+        writer.append(encode_header(game) + checkpoint_record(game))
+        recorder = cls(writer, checkpoint_interval)
+        game.add_listener(recorder)
+        return recorder
+
+    def event_applied(self, game, event):
+        self.writer.append_byte(encode_event(event))
+        self.__events += 1
+        if self.__events % self.checkpoint_interval == 0:
+            self.writer.append(checkpoint_record(game))
+
+    def game_closed(self, game):
+        self.writer.append(checkpoint_record(game))
+        self.writer.close()
+
+
+def new_journal_path(journal_dir=JOURNAL_DIR):
+    """ Returns a path of a journal which does not exist yet, named by the current time. """
+    os.makedirs(journal_dir, exist_ok=True)
+    stem = os.path.join(journal_dir, time.strftime("%Y%m%d-%H%M%S"))
+    path = stem + ".dsj"
+    suffix = 1
+    while os.path.exists(path):
+        path = "{}-{}.dsj".format(stem, suffix)
+        suffix += 1
+    return path
+
+
+class Journal:
+    """ Parsed journal. events is the list of all events (shared Event instances) and
+ checkpoints a list of (number of preceding events, GameState) pairs. """
+
+    def __init__(self, game_type, num_players, config, events, checkpoints, history_events=()):
+        self.game_type = game_type
+        self.num_players = num_players
+        self.config = config
+        self.events = events
+        self.checkpoints = checkpoints
+        # positions of undo and redo events
+        self.history_events = history_events
+
+    @classmethod
+    def parse(cls, data):
+        """ A truncated last record (the game was interrupted while it was written) is ignored. """
+        data = bytes(data)
+        if data[:len(MAGIC)] != MAGIC:
+            raise JournalError("Not a journal.")
+        pos = len(MAGIC)
+        (header_len,) = _HEADER.unpack_from(data, pos)
+        pos += _HEADER.size
+        header = json.loads(data[pos:pos + header_len])
+        pos += header_len
+        events = []
+        checkpoints = []
+        history_events = []
+        end = len(data)
+        while pos < end:
+            # runs of events are decoded at once up to the next checkpoint
+            stop = data.find(CHECKPOINT_TAG, pos)
+            if stop < 0:
+                stop = end
+            decoded = list(map(_EVENTS.__getitem__, data[pos:stop]))
+            if None in decoded:
+                raise JournalError("Unknown record at offset {}.".format(pos + decoded.index(None)))
+            if _UNDO in decoded or _REDO in decoded:
+                history_events += [len(events) + i for i, event in enumerate(decoded) if event in (_UNDO, _REDO)]
+            events += decoded
+            pos = stop
+            if pos + _CHECKPOINT.size > end:
+                break
+            _, length = _CHECKPOINT.unpack_from(data, pos)
+            pos += _CHECKPOINT.size
+            if pos + length > end:
+                break
+            try:
+                checkpoints.append((len(events), decode_state(data[pos:pos + length])))
+            except CodecError as ex:
+                raise JournalError(str(ex))
+            pos += length
+        if not checkpoints:
+            raise JournalError("The journal has no checkpoint.")
+        return cls(GameType[header["game"]], header["players"], header["config"], events, checkpoints,
+                   history_events)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as journal_file:
+            return cls.parse(journal_file.read())
+
+    def new_game(self, input_ctrl=None, output_ctrl=None):
+        return new_game(self.game_type, self.num_players, self.config, input_ctrl, output_ctrl)
+
+    def nearest_checkpoint(self, position):
+        """ Returns the last checkpoint taken before position events at most. """
+        low, high = 0, len(self.checkpoints)
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self.checkpoints[middle][0] <= position:
+                low = middle
+            else:
+                high = middle
+        return self.checkpoints[low]
+
+    def replay(self, position=None, game=None):
+        """ Returns a game (a new headless one unless given) in the state after the first
+ position events (all of them by default). """
+        if position is None:
+            position = len(self.events)
+        if game is None:
+            game = self.new_game()
+        start, state = self.nearest_checkpoint(position)
+        # Checkpoints do not hold the undo history, an undo or a redo may need to go back
+        # past the checkpoint, so such games are replayed from the very beginning.
+        first = bisect_left(self.history_events, start)
+        if first < len(self.history_events) and self.history_events[first] < position:
+            start, state = self.checkpoints[0]
+        game.restore(state)
+        game.apply(self.events[start:position])
+        return game
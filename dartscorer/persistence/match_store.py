@@ -0,0 +1,229 @@
+"""SQLite database of finished legs and of all their throws.
+
+Writes are queued and carried out by a single background thread which puts everything that
+has been queued meanwhile into one transaction, so the game loop never waits for the disk.
+The database uses WAL, so queries (from any thread) run alongside the writer. Legs older than
+the retention period are deleted when the store is opened and freed pages are returned to the
+file system, which keeps the database small on an SD card."""
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from sys import stderr as serr
+
+from ..logic.common import GameListener, Multiplier, seat_names, throw_of
+from .codec import DATA_DIR, GAME_TYPES
+
+STORE_PATH = os.path.join(DATA_DIR, "matches.sqlite")
+DEFAULT_RETENTION_DAYS = 365
+# Upper bound of the number of jobs (legs, compactions) put into a single transaction.
+MAX_BATCH = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS legs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    finished REAL NOT NULL,
+    game TEXT NOT NULL,
+    config TEXT NOT NULL,
+    players INTEGER NOT NULL,
+    winner INTEGER
+);
+CREATE INDEX IF NOT EXISTS legs_finished ON legs (finished);
+CREATE TABLE IF NOT EXISTS leg_players (
+    leg_id INTEGER NOT NULL REFERENCES legs (id) ON DELETE CASCADE,
+    player INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (leg_id, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS leg_players_name ON leg_players (name, leg_id);
+CREATE TABLE IF NOT EXISTS throws (
+    leg_id INTEGER NOT NULL REFERENCES legs (id) ON DELETE CASCADE,
+    seq INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    multiplier INTEGER NOT NULL,
+    PRIMARY KEY (leg_id, seq)
+) WITHOUT ROWID;
+"""
+
+
+class Leg:
+    """ A finished leg. throws is a list of (player, round, Throw) in the order of confirmation. """
+
+    def __init__(self, game, config, names, started, finished, winner, throws):
+        self.game = game
+        self.config = config
+        self.names = names
+        self.started = started
+        self.finished = finished
+        self.winner = winner
+        self.throws = throws
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    return connection
+
+
+class MatchStore:
+    def __init__(self, path=STORE_PATH, retention_days=DEFAULT_RETENTION_DAYS):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        # auto_vacuum has to be set before the first table is created
+        setup = _connect(path)
+        setup.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        setup.execute("PRAGMA journal_mode = WAL")
+        setup.executescript(SCHEMA)
+        setup.close()
+        self.__reader = _connect(path)
+        self.__read_lock = threading.Lock()
+        self.__jobs = queue.Queue()
+        self.__thread = threading.Thread(target=self.__run, name="match-store-writer", daemon=True)
+        self.__thread.start()
+        if retention_days is not None:
+            self.compact(retention_days)
+
+    def __run(self):
+        connection = _connect(self.path)
+        while True:
+            jobs = [self.__jobs.get()]
+            while len(jobs) < MAX_BATCH:
+                try:
+                    jobs.append(self.__jobs.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in jobs
+            try:
+                connection.execute("BEGIN")
+                for job in jobs:
+                    if job is not None:
+                        job(connection)
+                connection.execute("COMMIT")
+            except Exception as ex:  # the writer must keep running whatever happens
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                print("Match store: {} jobs lost: {}".format(len(jobs), ex), file=serr)
+            for _ in jobs:
+                self.__jobs.task_done()
+            if stop:
+                connection.close()
+                return
+
+    def save_leg(self, leg):
+        """ Queues the leg, returns immediately. """
+        self.__jobs.put(lambda connection: self._insert_leg(connection, leg))
+
+    @staticmethod
+    def _insert_leg(connection, leg):
+        cursor = connection.execute(
+            "INSERT INTO legs (started, finished, game, config, players, winner) VALUES (?, ?, ?, ?, ?, ?)",
+            (leg.started, leg.finished, leg.game, json.dumps(leg.config), len(leg.names), leg.winner))
+        leg_id = cursor.lastrowid
+        connection.executemany("INSERT INTO leg_players VALUES (?, ?, ?)",
+                               [(leg_id, player, name) for player, name in enumerate(leg.names)])
+        connection.executemany("INSERT INTO throws VALUES (?, ?, ?, ?, ?, ?)",
+                               [(leg_id, seq, player, rnd, thrw.points, thrw.multiplier.value)
+                                for seq, (player, rnd, thrw) in enumerate(leg.throws)])
+
+    def compact(self, retention_days=DEFAULT_RETENTION_DAYS):
+        """ Queues deletion of legs finished more than retention_days ago, the pages they took
+ are given back to the file system. """
+        cutoff = time.time() - retention_days * 86400
+
+        def job(connection):
+            if connection.execute("DELETE FROM legs WHERE finished < ?", (cutoff,)).rowcount:
+                connection.execute("PRAGMA incremental_vacuum").fetchall()
+        self.__jobs.put(job)
+
+    def flush(self):
+        """ Blocks until everything queued so far is written. """
+        self.__jobs.join()
+
+    def close(self):
+        if self.__thread.is_alive():
+            self.__jobs.put(None)
+            self.__thread.join()
+        self.__reader.close()
+
+    def __query(self, sql, parameters=()):
+        with self.__read_lock:
+            return self.__reader.execute(sql, parameters).fetchall()
+
+    def count_legs(self):
+        return self.__query("SELECT COUNT(*) FROM legs")[0][0]
+
+    def legs_between(self, start, end):
+        """ Legs finished within [start, end) (seconds since the epoch) as (id, finished, game, winner). """
+        return self.__query("SELECT id, finished, game, winner FROM legs WHERE finished >= ? AND finished < ? "
+                            "ORDER BY finished", (start, end))
+
+    def player_legs(self, name, limit=100):
+        """ The most recent legs of the player as (id, finished, game, player, won). """
+        return self.__query("SELECT legs.id, legs.finished, legs.game, leg_players.player, "
+                            "legs.winner = leg_players.player FROM leg_players JOIN legs ON legs.id = leg_id "
+                            "WHERE name = ? ORDER BY leg_id DESC LIMIT ?", (name, limit))
+
+    def leg_results(self, since=0.0):
+        """ Players of all legs with a winner finished since the given time, one row per player
+ as (leg id, finished, player, name, won), in the order the legs were finished. """
+        return self.__query("SELECT legs.id, legs.finished, leg_players.player, name, legs.winner = leg_players.player "
+                            "FROM legs JOIN leg_players ON legs.id = leg_id WHERE winner IS NOT NULL "
+                            "AND finished >= ? ORDER BY finished, legs.id", (since,))
+
+    def player_throws(self, name, since=0.0):
+        """ All throws of the player in legs finished since the given time, as Throws. """
+        rows = self.__query("SELECT throws.points, throws.multiplier FROM leg_players "
+                            "JOIN legs ON legs.id = leg_players.leg_id "
+                            "JOIN throws ON throws.leg_id = leg_players.leg_id AND throws.player = leg_players.player "
+                            "WHERE name = ? AND legs.finished >= ? ORDER BY throws.leg_id, throws.seq", (name, since))
+        return [throw_of(points, Multiplier(mult)) for points, mult in rows]
+
+    def leg_throws(self, leg_id):
+        """ Throws of the leg as (player, round, Throw). """
+        return [(player, rnd, throw_of(points, Multiplier(mult))) for player, rnd, points, mult in self.__query(
+            "SELECT player, round, points, multiplier FROM throws WHERE leg_id = ? ORDER BY seq", (leg_id,))]
+
+
+def winner_of(game):
+    """ Index of the player who won the game, None if there is none. """
+    winner = getattr(game, "winner", None)
+    if winner is None and 0 in getattr(game, "players", ()):
+        winner = game.players.index(0)
+    return winner
+
+
+class MatchRecorder(GameListener):
+    """ Saves the game into the store once it is over (games quit with Action.RESTART are not
+ saved). The throws are taken from the undo history of the game, so throws which were taken
+ back are not saved. A resumed game (see Game.restore) is left out, its history lacks the
+ throws made before it was saved, so only a part of the leg could be stored. """
+
+    def __init__(self, store, names=None):
+        self.store = store
+        self.names = names
+        self.started = time.time()
+
+    @classmethod
+    def start(cls, game, store, names=None):
+        recorder = cls(store, names)
+        game.add_listener(recorder)
+        return recorder
+
+    def game_closed(self, game):
+        if not game.over() or game.force_quit or game.resumed:
+            return
+        names = self.names or seat_names(game.num_players)
+        rounds = [-1] * game.num_players
+        throws = []
+        for step in game.history.steps():
+            if step.position_before == 0:
+                rounds[step.player] += 1
+            throws.append((step.player, rounds[step.player], step.throws_before[step.position_before]))
+        self.store.save_leg(Leg(GAME_TYPES[type(game)].name, dict(game.config), names, self.started, time.time(),
+                                winner_of(game), throws))
@@ -0,0 +1,143 @@
+"""Replays a corpus of recorded games (journals, see journal.py) headless and reports their
+final states and everything that does not add up, e.g. to check a change of the rules against
+past matches:
+
+    python3 -m dartscorer.persistence.replay [-j PROCESSES] DIRECTORY
+
+Every game is replayed from its first checkpoint, the state at each further checkpoint is
+compared with the recorded one. The journals are distributed across a process pool in chunks,
+results are written to the standard output (one JSON object per line) as soon as a chunk is
+done, in no particular order. Neither the list of journals nor the results are held in memory
+as a whole."""
+from argparse import ArgumentParser
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import json
+import os
+import sys
+import time
+
+from ..display.null import NullDisplayController
+from ..logic.common import RenderIntent
+from .journal import Journal, JournalError
+
+JOURNAL_SUFFIX = ".dsj"
+DEFAULT_CHUNK_SIZE = 16
+
+
+def find_journals(directory):
+    """ Yields paths of all journals below the directory, in a stable order. """
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(JOURNAL_SUFFIX):
+                yield os.path.join(root, name)
+
+
+def _violations_of(game):
+    """ Scores which cannot be reached under the rules. """
+    violations = []
+    for player, row in enumerate(game.players_state()):
+        values = row if isinstance(row, tuple) else (row,)
+        if any(value < 0 for value in values):
+            violations.append("player {} has a negative score {}".format(player, row))
+    return violations
+
+
+def replay_journal(path):
+    """ Replays a single journal, returns a JSON-serialisable dict describing the result. """
+    result = {"path": path}
+    try:
+        journal = Journal.load(path)
+    except (OSError, JournalError, ValueError) as ex:
+        result["error"] = str(ex)
+        return result
+    game = journal.new_game(output_ctrl=NullDisplayController())
+    result.update(game=journal.game_type.name, players=journal.num_players, config=journal.config,
+                  events=len(journal.events))
+    violations = []
+    warnings = 0
+    start, state = journal.checkpoints[0]
+    game.restore(state)
+    diverged = False
+    leftover = 0
+    for position, recorded in journal.checkpoints[1:] + [(len(journal.events), None)]:
+        events = iter(journal.events[start:position])
+        try:
+            replayed, intents = game.apply(events)
+        except Exception as ex:  # a rule change may break anything, the corpus has to go on
+            violations.append("{}: {} after event {}".format(type(ex).__name__, ex, start))
+            break
+        warnings += sum(1 for intent, _ in intents if intent is RenderIntent.WARNING)
+        leftover += sum(1 for _ in events)
+        if recorded is not None and replayed != recorded and not diverged:
+            diverged = True
+            violations.append("state after event {} differs from the recorded one".format(position))
+        start = position
+    if leftover:
+        violations.append("{} events after the end of the game".format(leftover))
+    violations += _violations_of(game)
+    final = game.state()
+    result.update(final=final.players, current_player=final.current_player, over=final.over,
+                  warnings=warnings, violations=violations)
+    return result
+
+
+def _replay_chunk(paths):
+    return [replay_journal(path) for path in paths]
+
+
+def _chunks(paths, chunk_size):
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def replay_all(paths, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """ Yields results of replay_journal() for all paths (an iterable, consumed lazily).
+ At most two chunks per process are in flight at any time. """
+    processes = processes or os.cpu_count()
+    if processes == 1:
+        for chunk in _chunks(paths, chunk_size):
+            yield from _replay_chunk(chunk)
+        return
+    with ProcessPoolExecutor(processes) as pool:
+        pending = set()
+        for chunk in _chunks(paths, chunk_size):
+            if len(pending) >= 2 * processes:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+            pending.add(pool.submit(_replay_chunk, chunk))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+def main(argv=None, out=sys.stdout):
+    parser = ArgumentParser(description="Replays recorded games and reports rule violations.")
+    parser.add_argument("directory", help="directory searched (recursively) for *{} files".format(JOURNAL_SUFFIX))
+    parser.add_argument("-j", "--processes", type=int, default=None, help="number of processes (all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="journals per task")
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    games = events = failed = 0
+    for result in replay_all(find_journals(args.directory), args.processes, args.chunk_size):
+        print(json.dumps(result), file=out)
+        games += 1
+        events += result.get("events", 0)
+        if "error" in result or result["violations"]:
+            failed += 1
+    elapsed = time.perf_counter() - started
+    print("{} games, {} events in {:.2f} s, {} with errors or violations".format(games, events, elapsed, failed),
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""Snapshot of the game in progress, rewritten after every confirmed (or undone, or redone)
+throw so that the game can be resumed after a crash or a power failure. The layout is fixed:
+
+    magic, CRC32 of the rest (u32), game type (u8), number of players (u8),
+    config values (int32 each, see codec.CONFIG_FIELDS), game state (see codec.encode_state)
+
+A snapshot is written to a temporary file which is synced and renamed over the previous one,
+so there is always either the old or the new snapshot on the disk, never a torn one. The game
+thread only encodes the snapshot, a SnapshotWriter thread writes it; snapshots taken while the
+writer is busy replace each other, only the latest one is written."""
+import os
+import struct
+import threading
+import zlib
+from sys import stderr as serr
+
+from ..logic.common import GameListener, GameType
+from .codec import CONFIG_FIELDS, CodecError, DATA_DIR, GAME_TYPES, decode_state, encode_state, new_game
+
+MAGIC = b"DSS1"
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "snapshot.bin")
+
+_PREFIX = struct.Struct("<4sI")
+_HEADER = struct.Struct("<BB")
+_CONFIG_VALUE = struct.Struct("<i")
+
+
+class Snapshot:
+    def __init__(self, game_type, num_players, config, state):
+        self.game_type = game_type
+        self.num_players = num_players
+        self.config = config
+        self.state = state
+
+    @classmethod
+    def of(cls, game):
+        return cls(GAME_TYPES[type(game)], game.num_players, dict(game.config), game.state())
+
+    def encode(self):
+        body = _HEADER.pack(self.game_type.value, self.num_players)
+        for key, _ in CONFIG_FIELDS[self.game_type]:
+            body += _CONFIG_VALUE.pack(int(self.config[key]))
+        body += encode_state(self.state)
+        return _PREFIX.pack(MAGIC, zlib.crc32(body)) + body
+
+    @classmethod
+    def decode(cls, data):
+        if len(data) < _PREFIX.size + _HEADER.size:
+            raise CodecError("The snapshot is too short.")
+        magic, crc = _PREFIX.unpack_from(data)
+        body = data[_PREFIX.size:]
+        if magic != MAGIC or zlib.crc32(body) != crc:
+            raise CodecError("The snapshot is damaged.")
+        type_value, num_players = _HEADER.unpack_from(body)
+        game_type = GameType(type_value)
+        pos = _HEADER.size
+        config = {}
+        for key, value_type in CONFIG_FIELDS[game_type]:
+            (value,) = _CONFIG_VALUE.unpack_from(body, pos)
+            config[key] = value_type(value)
+            pos += _CONFIG_VALUE.size
+        return cls(game_type, num_players, config, decode_state(body[pos:]))
+
+    def new_game(self, input_ctrl=None, output_ctrl=None):
+        """ Returns a game in the state of the snapshot. """
+        game = new_game(self.game_type, self.num_players, self.config, input_ctrl, output_ctrl)
+        game.restore(self.state)
+        return game
+
+
+def write_snapshot(game, path=SNAPSHOT_PATH, fsync=True):
+    _write_file(Snapshot.of(game).encode(), path, fsync)
+
+
+def _write_file(data, path, fsync):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as tmp_file:
+        tmp_file.write(data)
+        if fsync:
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """ Returns the Snapshot stored at path, None if there is none (or it is damaged). """
+    try:
+        with open(path, "rb") as snapshot_file:
+            return Snapshot.decode(snapshot_file.read())
+    except (OSError, CodecError, ValueError, KeyError):
+        return None
+
+
+def remove_snapshot(path=SNAPSHOT_PATH):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class SnapshotWriter:
+    """ Writes (or removes) the snapshot at path in a background thread. Only the latest job is
+ kept, a job queued while another one is waiting replaces it. The thread is started by the
+ first job and stopped by close(). """
+
+    def __init__(self, path=SNAPSHOT_PATH, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self.__condition = threading.Condition()
+        self.__pending = None
+        self.__busy = False
+        self.__stopping = False
+        self.__thread = None
+
+    def write(self, data):
+        """ Queues the encoded snapshot, returns immediately. """
+        self.__submit(lambda: _write_file(data, self.path, self.fsync))
+
+    def remove(self):
+        self.__submit(lambda: remove_snapshot(self.path))
+
+    def __submit(self, job):
+        with self.__condition:
+            self.__pending = job
+            self.__condition.notify_all()
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, name="snapshot-writer", daemon=True)
+            self.__thread.start()
+
+    def __run(self):
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__pending is not None or self.__stopping)
+                job = self.__pending
+                if job is None:
+                    return
+                self.__pending = None
+                self.__busy = True
+            try:
+                job()
+            except OSError as ex:  # the writer must keep running whatever happens
+                print("Snapshot: {}".format(ex), file=serr)
+            with self.__condition:
+                self.__busy = False
+                self.__condition.notify_all()
+
+    def flush(self, timeout=None):
+        """ Blocks until the latest job is done.
+:return: False if it was not done before the timeout"""
+        with self.__condition:
+            return self.__condition.wait_for(lambda: self.__pending is None and not self.__busy, timeout)
+
+    def close(self):
+        """ Finishes the latest job and stops the thread (a later job starts it again). """
+        if self.__thread is None:
+            return
+        with self.__condition:
+            self.__stopping = True
+            self.__condition.notify_all()
+        self.__thread.join()
+        self.__thread = None
+        self.__stopping = False
+
+
+class SnapshotKeeper(GameListener):
+    """ Rewrites the snapshot after every confirmed, undone or redone throw and removes it when
+ the game ends (a game left without being over, e.g. because of an exception, stays resumable). """
+
+    def __init__(self, path=SNAPSHOT_PATH, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self.writer = SnapshotWriter(path, fsync)
+
+    @classmethod
+    def start(cls, game, path=SNAPSHOT_PATH, fsync=True):
+        """ The first snapshot is written right away, so that a failure is raised here. """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        keeper = cls(path, fsync)
+        write_snapshot(game, path, fsync)
+        game.add_listener(keeper)
+        return keeper
+
+    def throw_confirmed(self, game):
+        self.writer.write(Snapshot.of(game).encode())
+
+    def throw_undone(self, game):
+        self.writer.write(Snapshot.of(game).encode())
+
+    def throw_redone(self, game):
+        self.writer.write(Snapshot.of(game).encode())
+
+    def flush(self, timeout=None):
+        return self.writer.flush(timeout)
+
+    def game_closed(self, game):
+        if game.over():
+            self.writer.remove()
+        self.writer.close()
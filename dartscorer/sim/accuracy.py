@@ -0,0 +1,95 @@
+"""Accuracy models used by the simulator. An accuracy model is a matrix of probabilities of
+every throw outcome given the aim point. Both aims and outcomes are indices into OUTCOMES."""
+import numpy as np
+
+from ..logic.board import BOARD_ORDER
+from ..logic.common import LEGAL_THROWS, ZERO_THROW, Multiplier, throw_of
+
+# Index 0 is a miss (and aiming at it means not aiming at the board at all),
+# the remaining ones are the 62 legal throws.
+OUTCOMES = (ZERO_THROW,) + LEGAL_THROWS
+NUM_OUTCOMES = len(OUTCOMES)
+OUTCOME_INDEX = {thrw: i for i, thrw in enumerate(OUTCOMES)}
+
+OUTCOME_POINTS = np.array([thrw.points for thrw in OUTCOMES], dtype=np.int16)
+OUTCOME_MULTIPLIER = np.array([thrw.multiplier.value for thrw in OUTCOMES], dtype=np.int16)
+OUTCOME_TOTAL = OUTCOME_POINTS * OUTCOME_MULTIPLIER
+
+
+def outcome_index(points, multiplier):
+    return OUTCOME_INDEX[throw_of(points, multiplier)]
+
+
+def _neighbours(points):
+    pos = BOARD_ORDER.index(points)
+    return BOARD_ORDER[pos - 1], BOARD_ORDER[(pos + 1) % len(BOARD_ORDER)]
+
+
+class AccuracyModel:
+    """ Wraps a NUM_OUTCOMES x NUM_OUTCOMES matrix, row a holds the distribution of outcomes
+ when aiming at OUTCOMES[a]."""
+
+    def __init__(self, matrix):
+        matrix = np.array(matrix, dtype=np.float64)
+        if matrix.shape != (NUM_OUTCOMES, NUM_OUTCOMES):
+            raise ValueError("The matrix must be of shape {0}x{0}.".format(NUM_OUTCOMES))
+        if (matrix < 0).any() or not np.allclose(matrix.sum(axis=1), 1.0):
+            raise ValueError("Each row of the matrix must be a probability distribution.")
+        self.matrix = matrix
+        cumulative = np.cumsum(matrix, axis=1)
+        cumulative[:, -1] = 1.0
+        # Row a is shifted by a so that the whole table is sorted and a single
+        # searchsorted() call can sample from different rows at once.
+        self.__flat_cumulative = (cumulative + np.arange(NUM_OUTCOMES)[:, None]).ravel()
+
+    @classmethod
+    def from_skill(cls, single=0.85, double=0.35, triple=0.25, bull=0.2, outer_bull=0.45):
+        """ Simple parametric model. Each parameter is the probability of hitting the bed
+ the player aims at, misses land on the same segment or on the neighbouring ones. """
+        matrix = np.zeros((NUM_OUTCOMES, NUM_OUTCOMES))
+        matrix[0, 0] = 1.0
+        singles = [outcome_index(points, Multiplier.SINGLE) for points in BOARD_ORDER]
+        for aim in range(1, NUM_OUTCOMES):
+            thrw = OUTCOMES[aim]
+            row = matrix[aim]
+            if thrw.points == 25:
+                if thrw.multiplier == Multiplier.DOUBLE:
+                    hit, spread = bull, ((outcome_index(25, Multiplier.SINGLE), 0.6),)
+                else:
+                    hit, spread = outer_bull, ((outcome_index(25, Multiplier.DOUBLE), 0.2),)
+                row[aim] += hit
+                for target, share in spread:
+                    row[target] += (1 - hit) * share
+                rest = 1 - sum(share for _, share in spread)
+                row[singles] += (1 - hit) * rest / len(singles)
+                continue
+            left, right = _neighbours(thrw.points)
+            if thrw.multiplier == Multiplier.SINGLE:
+                hit = single
+                spread = ((left, Multiplier.SINGLE, 0.4), (right, Multiplier.SINGLE, 0.4),
+                          (thrw.points, Multiplier.TRIPLE, 0.1), (thrw.points, Multiplier.DOUBLE, 0.1))
+            elif thrw.multiplier == Multiplier.DOUBLE:
+                hit = double
+                spread = ((0, Multiplier.SINGLE, 0.5), (thrw.points, Multiplier.SINGLE, 0.3),
+                          (left, Multiplier.SINGLE, 0.1), (right, Multiplier.SINGLE, 0.1))
+            else:
+                hit = triple
+                spread = ((thrw.points, Multiplier.SINGLE, 0.6),
+                          (left, Multiplier.TRIPLE, 0.1), (right, Multiplier.TRIPLE, 0.1),
+                          (left, Multiplier.SINGLE, 0.1), (right, Multiplier.SINGLE, 0.1))
+            row[aim] += hit
+            for points, mult, share in spread:
+                row[outcome_index(points, mult)] += (1 - hit) * share
+        return cls(matrix)
+
+    @classmethod
+    def perfect(cls):
+        """ Player who always hits what they aim at. """
+        return cls(np.eye(NUM_OUTCOMES))
+
+    def sample(self, aims, rng):
+        """ Draws one outcome for every aim in the given array of aims. """
+        aims = np.asarray(aims, dtype=np.intp)
+        idx = np.searchsorted(self.__flat_cumulative, aims + rng.random(aims.shape), side="right")
+        # Rounding of aims + u can (very rarely) step over the end of the row.
+        return np.minimum(idx - aims * NUM_OUTCOMES, NUM_OUTCOMES - 1)
@@ -0,0 +1,102 @@
+"""Vectorized simulation of Cricket legs. The rules follow cricket.Confirm: every hit of
+a target adds marks (at most three per target) and the leg is over as soon as a player
+closes all targets. In scoring legs marks beyond the third one score the value of the target
+while some other player has not closed it, and closing all targets only wins with at least
+as many points as anybody else; a player who has closed everything keeps aiming at the
+targets the others have left open."""
+import numpy as np
+
+from ..logic.common import Multiplier
+from ..logic.cricket import TARGETS, CLOSED
+from .accuracy import OUTCOMES, OUTCOME_MULTIPLIER, outcome_index
+from .results import DEFAULT_MAX_ROUNDS, empty_results
+
+# Index of the target hit by every outcome, -1 if the outcome is not a target.
+OUTCOME_TARGET = np.array([TARGETS.index(thrw.points) if thrw.points in TARGETS else -1 for thrw in OUTCOMES],
+                          dtype=np.int8)
+
+# Points of a mark of every target.
+TARGET_VALUES = np.array(TARGETS, dtype=np.int32)
+# Targets are closed from the highest one, the bull comes last.
+DEFAULT_AIM_ORDER = (20, 19, 18, 17, 16, 15, 25)
+
+
+def cricket_aims(aim_order=DEFAULT_AIM_ORDER):
+    """ Returns (order, aims) where order lists target indices in the order the player closes them
+ and aims[i] is the outcome index the player aims at while closing TARGETS[order[i]]. """
+    order = np.array([TARGETS.index(points) for points in aim_order], dtype=np.intp)
+    aims = np.array([outcome_index(points, Multiplier.SINGLE if points == 25 else Multiplier.TRIPLE)
+                     for points in aim_order], dtype=np.intp)
+    return order, aims
+
+
+def simulate_cricket(models, num_legs, aim_orders=None, rng=None, max_rounds=DEFAULT_MAX_ROUNDS, trace=False,
+                     start_marks=None, first_player=0, scoring=False, start_points=None):
+    """ Simulates num_legs legs of Cricket at once.
+:param models: AccuracyModel of every player (the number of players is len(models))
+:param aim_orders: order in which every player attempts to close the targets
+:param start_marks: marks of the players (one row of len(TARGETS) marks per player) when the simulation starts
+:param first_player: the player whose round comes first
+:param scoring: whether the leg is played with config["scoring"] of cricket.Cricket
+:param start_points: points of the players when the simulation starts (scoring legs only)
+:return: LegResults, rounds are counted from the start of the simulation"""
+    num_players = len(models)
+    if aim_orders is None:
+        aim_orders = [DEFAULT_AIM_ORDER] * num_players
+    strategies = [cricket_aims(aim_order) for aim_order in aim_orders]
+    rng = rng if rng is not None else np.random.default_rng()
+    results = empty_results(num_legs, max_rounds, trace)
+
+    legs = np.arange(num_legs)
+    marks = np.zeros((num_legs, num_players, len(TARGETS)), dtype=np.int8)
+    if start_marks is not None:
+        marks[:] = start_marks
+    points = np.zeros((num_legs, num_players), dtype=np.int32)
+    if scoring and start_points is not None:
+        points[:] = start_points
+    for round_no in range(max_rounds):
+        if legs.size == 0:
+            break
+        player = (first_player + round_no) % num_players
+        model, (order, aims) = models[player], strategies[player]
+        own = marks[:, player]
+        throwing = np.ones(legs.size, dtype=bool)
+        for dart in range(3):
+            rows = np.flatnonzero(throwing)
+            if rows.size == 0:
+                break
+            own_open = own[rows][:, order] < CLOSED
+            first_open = np.argmax(own_open, axis=1)
+            if scoring:
+                # with everything closed, points are scored on a target somebody else left open
+                others_open = (marks[rows][:, :, order] < CLOSED).any(axis=1)
+                first_open = np.where(own_open.any(axis=1), first_open, np.argmax(others_open, axis=1))
+            outcomes = model.sample(aims[first_open], rng)
+            if trace:
+                results.throws[legs[rows], round_no, dart] = outcomes
+            targets = OUTCOME_TARGET[outcomes]
+            hit = targets >= 0
+            rows, targets = rows[hit], targets[hit]
+            before = own[rows, targets]
+            after = before + OUTCOME_MULTIPLIER[outcomes[hit]]
+            own[rows, targets] = np.minimum(after, CLOSED)
+            if scoring:
+                extra = np.maximum(after - np.maximum(before, CLOSED), 0)
+                open_for_others = (marks[rows, :, targets] == CLOSED).sum(axis=1) < num_players
+                points[rows, player] += extra * TARGET_VALUES[targets] * open_for_others
+            throwing[rows[_won(own[rows], points[rows], player, scoring)]] = False
+
+        won = _won(own, points, player, scoring)
+        results.winners[legs[won]] = player
+        results.rounds[legs[won]] = round_no + 1
+        legs, marks, points = legs[~won], marks[~won], points[~won]
+    results.rounds[legs] = max_rounds
+    return results
+
+
+def _won(own, points, player, scoring):
+    """ Whether the player has won the legs (own are the marks of the player in them). """
+    won = (own == CLOSED).all(axis=1)
+    if scoring:
+        won &= points[:, player] >= points.max(axis=1)
+    return won
@@ -0,0 +1,220 @@
+"""Computer opponent for Cricket. Before every dart the bot runs a time-bounded Monte-Carlo
+tree search over the marks of all players, throws (i.e. samples the outcome of its own accuracy
+model) at the chosen target and keys the outcome in the same way a human player would."""
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from math import log, sqrt
+import random
+import time
+
+from ..logic.common import Multiplier, Position, throw_to_events
+from ..logic.cricket import CLOSED, NUM_TARGETS, TARGETS, TARGET_INDEX, Cricket
+from .accuracy import NUM_OUTCOMES, OUTCOMES, outcome_index
+from .cricket import cricket_aims
+
+DARTS = Position.OVER.value
+# Aims the search chooses from: the trebles of all numbers and both bulls.
+ACTIONS = tuple(outcome_index(points, Multiplier.TRIPLE) for points in TARGETS if points != 25) + \
+          (outcome_index(25, Multiplier.SINGLE), outcome_index(25, Multiplier.DOUBLE))
+EXPLORATION = sqrt(2)
+# A win is worth DISCOUNT ** darts thrown until the end of the game, so that the search
+# prefers quick wins over the slow ones instead of treating all of them the same.
+DISCOUNT = 0.99
+# Rollouts which take longer than that many rounds per player count as a draw.
+MAX_ROLLOUT_ROUNDS = 60
+
+
+class _Sampler:
+    """ Pure Python sampling of outcomes of accuracy models, one per player. """
+
+    def __init__(self, models):
+        self.cumulative = [[list(row) for row in model.matrix.cumsum(axis=1)] for model in models]
+
+    def sample(self, player, aim, rng):
+        return min(bisect_right(self.cumulative[player][aim], rng.random()), NUM_OUTCOMES - 1)
+
+
+class _State:
+    """ Compact copy of the Cricket rules (see Cricket.add_marks) used by the search. """
+    __slots__ = ("marks", "points", "closed_targets", "closed_by", "max_points", "player", "dart",
+                 "winner", "scoring")
+
+    @classmethod
+    def from_game(cls, game):
+        state = cls()
+        state.marks = list(game.marks)
+        state.points = list(game.points)
+        state.closed_targets = list(game.closed_targets)
+        state.closed_by = list(game.closed_by)
+        state.max_points = game.max_points
+        state.player = game.current_player
+        state.dart = game.round.current_position_int()
+        state.winner = game.winner
+        state.scoring = game.config["scoring"]
+        return state
+
+    def copy(self):
+        state = _State()
+        state.marks = self.marks[:]
+        state.points = self.points[:]
+        state.closed_targets = self.closed_targets[:]
+        state.closed_by = self.closed_by[:]
+        state.max_points = self.max_points
+        state.player = self.player
+        state.dart = self.dart
+        state.winner = self.winner
+        state.scoring = self.scoring
+        return state
+
+    def throw(self, outcome):
+        thrw = OUTCOMES[outcome]
+        target = TARGET_INDEX[thrw.points]
+        player = self.player
+        if target >= 0:
+            cell = player * NUM_TARGETS + target
+            before = self.marks[cell]
+            after = before + thrw.multiplier
+            if after >= CLOSED:
+                if before < CLOSED:
+                    self.closed_targets[player] += 1
+                    self.closed_by[target] += 1
+                if self.scoring and self.closed_by[target] < len(self.points):
+                    self.points[player] += (after - max(before, CLOSED)) * TARGETS[target]
+                    self.max_points = max(self.max_points, self.points[player])
+                after = CLOSED
+            self.marks[cell] = after
+            if self.closed_targets[player] == NUM_TARGETS and \
+                    (not self.scoring or self.points[player] == self.max_points):
+                self.winner = player
+                return
+        self.dart += 1
+        if self.dart == DARTS:
+            self.dart = 0
+            self.player = (player + 1) % len(self.points)
+
+    def default_aim(self, order, aims):
+        """ Rollout policy: the first target (in the given order) the player has not closed yet. """
+        offset = self.player * NUM_TARGETS
+        for target, aim in zip(order, aims):
+            if self.marks[offset + target] < CLOSED:
+                return aim
+        return aims[0]
+
+
+class _Node:
+    __slots__ = ("player", "visits", "wins", "children")
+
+    def __init__(self, player):
+        self.player = player  # the player who chose the action leading to this node
+        self.visits = 0
+        self.wins = 0.0
+        self.children = None
+
+
+def _search(sampler, root_state, time_budget, seed):
+    """ Open-loop UCT: nodes are sequences of aims, outcomes are sampled anew in every iteration.
+ Returns the number of visits of every action of the root. """
+    rng = random.Random(seed)
+    order, aims = cricket_aims()
+    order, aims = list(order), list(aims)
+    num_players = len(root_state.points)
+    max_darts = MAX_ROLLOUT_ROUNDS * num_players * DARTS
+    root = _Node(None)
+    deadline = time.monotonic() + time_budget
+    while True:
+        state = root_state.copy()
+        node, path = root, [root]
+        # selection and expansion
+        while state.winner is None:
+            if node.children is None:
+                node.children = [None] * len(ACTIONS)
+            unvisited = [i for i, child in enumerate(node.children) if child is None]
+            if unvisited:
+                action = rng.choice(unvisited)
+                node.children[action] = _Node(state.player)
+            else:
+                log_visits = log(node.visits)
+                action = max(range(len(ACTIONS)), key=lambda i: node.children[i].wins / node.children[i].visits +
+                             EXPLORATION * sqrt(log_visits / node.children[i].visits))
+            child = node.children[action]
+            state.throw(sampler.sample(state.player, ACTIONS[action], rng))
+            node = child
+            path.append(node)
+            if node.visits == 0:
+                break
+        # rollout
+        darts = len(path) - 1
+        while state.winner is None and darts < max_darts:
+            state.throw(sampler.sample(state.player, state.default_aim(order, aims), rng))
+            darts += 1
+        reward = DISCOUNT ** darts
+        for node in path:
+            node.visits += 1
+            if state.winner is not None and node.player == state.winner:
+                node.wins += reward
+        if time.monotonic() >= deadline:
+            return [child.visits if child else 0 for child in root.children]
+
+
+class CricketBot:
+    """ Input controller (see EventPoller) playing for some players of a Cricket game and
+ passing the events of the other players through from human_ctrl (which may be None if
+ all players are bots). The bot has to be attached to the game before the game loop starts:
+
+    bot = CricketBot(models, bot_players={1}, human_ctrl=EventPoller())
+    game = Cricket(2, bot, output_ctrl)
+    bot.attach(game)
+
+ models holds an AccuracyModel for every player, it is used both to model the opponents in
+ the search and to throw the darts of the bots. With processes > 1 the search runs in a pool
+ and its results are merged (root parallelisation); time_budget is the hard limit of a search
+ in seconds (plus the overhead of the pool)."""
+
+    def __init__(self, models, bot_players, human_ctrl=None, time_budget=0.5, processes=1, seed=None):
+        self.sampler = _Sampler(models)
+        self.bot_players = set(bot_players)
+        self.human_ctrl = human_ctrl
+        self.time_budget = time_budget
+        self.game = None
+        self.__rng = random.Random(seed)
+        self.__pending = []
+        self.__pool = None
+        if processes > 1:
+            self.__processes = processes
+            self.__pool = ProcessPoolExecutor(processes)
+
+    def attach(self, game):
+        if not isinstance(game, Cricket):
+            raise ValueError("Only Cricket games can be played by the bot.")
+        self.game = game
+
+    def choose_aim(self):
+        """ Returns the index (into OUTCOMES) of the aim of the current player. """
+        state = _State.from_game(self.game)
+        if self.__pool is None:
+            visits = _search(self.sampler, state, self.time_budget, self.__rng.random())
+        else:
+            seeds = [self.__rng.random() for _ in range(self.__processes)]
+            # the sampler goes with every search (pool initializers need Python 3.7)
+            visits = [sum(counts) for counts in zip(*self.__pool.map(
+                _search, repeat(self.sampler, self.__processes), repeat(state, self.__processes),
+                repeat(self.time_budget, self.__processes), seeds))]
+        return ACTIONS[max(range(len(ACTIONS)), key=visits.__getitem__)]
+
+    def throw(self):
+        """ Chooses the aim and returns the Throw which was actually hit. """
+        return OUTCOMES[self.sampler.sample(self.game.current_player, self.choose_aim(), self.__rng)]
+
+    def next_event(self):
+        if self.game.current_player not in self.bot_players:
+            self.__pending.clear()
+            return self.human_ctrl.next_event() if self.human_ctrl else None
+        if not self.__pending:
+            self.__pending = throw_to_events(self.throw())
+            self.__pending.reverse()
+        return self.__pending.pop()
+
+    def close(self):
+        if self.__pool is not None:
+            self.__pool.shutdown()
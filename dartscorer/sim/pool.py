@@ -0,0 +1,26 @@
+"""Sharding of simulations across a process pool."""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import os
+
+import numpy as np
+
+from .results import concatenate
+
+
+def _run_shard(simulate, num_legs, seed, kwargs):
+    return simulate(num_legs=num_legs, rng=np.random.default_rng(seed), **kwargs)
+
+
+def simulate_sharded(simulate, num_legs, processes=None, shards=None, seed=None, **kwargs):
+    """ Splits num_legs into shards, runs simulate (simulate_x01 or simulate_cricket) on each of them
+ in a separate process and joins the results. Every shard gets an independent random stream
+ derived from seed, so the results are reproducible for a given seed and number of shards.
+ The remaining keyword arguments are passed to simulate."""
+    processes = processes or os.cpu_count()
+    shards = shards or processes
+    sizes = [num_legs // shards + (1 if i < num_legs % shards else 0) for i in range(shards)]
+    seeds = np.random.SeedSequence(seed).spawn(shards)
+    with ProcessPoolExecutor(processes) as pool:
+        parts = list(pool.map(_run_shard, repeat(simulate), sizes, seeds, repeat(kwargs)))
+    return concatenate(parts)
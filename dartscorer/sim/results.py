@@ -0,0 +1,26 @@
+from collections import namedtuple
+
+import numpy as np
+
+# winners: index of the winning player of every leg (-1 if the leg was cut off by max_rounds),
+# rounds: number of rounds (of all players together) played in every leg,
+# throws: outcome indices of every dart, shape (legs, max_rounds, 3), -1 where no dart was thrown.
+#         Only recorded when the simulation is run with trace=True, None otherwise.
+LegResults = namedtuple("LegResults", ["winners", "rounds", "throws"])
+
+# Legs which take longer than that are cut off, see LegResults.
+DEFAULT_MAX_ROUNDS = 600
+
+
+def empty_results(num_legs, max_rounds, trace):
+    return LegResults(np.full(num_legs, -1, dtype=np.int8), np.zeros(num_legs, dtype=np.int16),
+                      np.full((num_legs, max_rounds, 3), -1, dtype=np.int8) if trace else None)
+
+
+def concatenate(results):
+    """ Joins results of several batches (all of them simulated with the same max_rounds). """
+    throws = None
+    if results[0].throws is not None:
+        throws = np.concatenate([res.throws for res in results])
+    return LegResults(np.concatenate([res.winners for res in results]),
+                      np.concatenate([res.rounds for res in results]), throws)
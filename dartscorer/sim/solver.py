@@ -0,0 +1,125 @@
+"""Optimal aiming policy for X01 computed by dynamic programming over an accuracy model.
+
+A state is the score at the start of the round, the remaining score and the number of darts
+left in the round. The round start matters because an overthrow returns the player to it
+(see game_x01.Confirm). The policy minimises the expected number of darts needed to finish,
+a round ended by an overthrow counts as three darts.
+
+Round start scores are solved in increasing order. An overthrow (or three missed darts) loops
+back to the round start itself, so the value of each round start is found by Newton's method
+on that fixed point, every iteration is a few matrix products over all remaining scores
+reachable within the round and all aim points at once."""
+import hashlib
+import os
+
+import numpy as np
+
+from ..logic.common import Position
+from .accuracy import OUTCOME_TOTAL, OUTCOMES
+
+DARTS = Position.OVER.value
+MAX_DART = int(OUTCOME_TOTAL.max())
+# The remaining score can drop at most this much below the round start before the last dart.
+MAX_OFFSET = (DARTS - 1) * MAX_DART
+MAX_ITERATIONS = 100
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dartscorer")
+CACHE_VERSION = 1
+
+
+class X01Policy:
+    """ aims[start, start - remaining, darts_left - 1] is the outcome index to aim at,
+ expected_darts[score] is the expected number of darts to finish from the start of a round. """
+
+    def __init__(self, aims, expected_darts):
+        self.aims = aims
+        self.expected_darts = expected_darts
+
+    @property
+    def init_score(self):
+        return len(self.expected_darts) - 1
+
+    def aim(self, round_start, remaining, darts_left):
+        """ Returns the Throw to aim at. """
+        return OUTCOMES[self.aims[round_start, round_start - remaining, darts_left - 1]]
+
+
+def _round_levels(start):
+    """ For every number of darts left, the remaining scores (as offsets from start) the player
+ can have and the scores every outcome leads to from them. """
+    levels = []
+    for darts_left in range(1, DARTS + 1):
+        offsets = np.arange(min((DARTS - darts_left) * MAX_DART, start - 1) + 1)
+        after = (start - offsets)[:, None] - OUTCOME_TOTAL[None, :]
+        bust, finished = after < 0, after == 0
+        levels.append((offsets, bust, finished, np.where(bust, 0, after)))
+    return levels
+
+
+def _solve_round_start(matrix, start, expected, expected_grad):
+    """ Finds the expected darts to finish from the round start score start, expected must
+ already hold the values of all lower scores. expected_grad is the derivative of expected
+ with respect to expected[start] (i.e. 1 at start and 0 elsewhere).
+:return: pair of the expected darts and aims of shape (MAX_OFFSET + 1, DARTS)"""
+    levels = _round_levels(start)
+    aims = np.zeros((MAX_OFFSET + 1, DARTS), dtype=np.int8)
+    value = expected[start - 1] + 1.0
+    for _ in range(MAX_ITERATIONS):
+        expected[start] = value
+        # value of the state the dart leads to (and its derivative) indexed by the remaining score
+        next_cost, next_grad = expected, expected_grad
+        for darts_left, (offsets, bust, finished, after) in enumerate(levels, 1):
+            cost = np.where(finished, 1.0, np.where(bust, darts_left + value, 1.0 + next_cost[after]))
+            grad = np.where(finished, 0.0, np.where(bust, 1.0, next_grad[after]))
+            expected_cost = cost @ matrix.T
+            expected_cost[:, 0] = np.inf  # never throw a dart away on purpose
+            best = np.argmin(expected_cost, axis=1)
+            aims[offsets, darts_left - 1] = best
+            best_cost = expected_cost[offsets, best]
+            best_grad = np.einsum("ij,ij->i", grad, matrix[best])
+            next_cost, next_grad = np.zeros(start + 1), np.zeros(start + 1)
+            next_cost[start - offsets] = best_cost
+            next_grad[start - offsets] = best_grad
+        if best_grad[0] >= 1.0 - 1e-12:
+            raise ValueError("The score {} can never be finished with this accuracy model.".format(start))
+        # Newton's step on value = f(value), f being the expected darts of the round start
+        new_value = value - (best_cost[0] - value) / (best_grad[0] - 1.0)
+        if abs(new_value - value) < 1e-9:
+            break
+        value = new_value
+    return new_value, aims
+
+
+def solve_x01(model, init_score=501):
+    """ Computes the optimal X01Policy for scores up to init_score. """
+    expected = np.zeros(init_score + 1)
+    expected_grad = np.zeros(init_score + 1)
+    aims = np.zeros((init_score + 1, MAX_OFFSET + 1, DARTS), dtype=np.int8)
+    for start in range(1, init_score + 1):
+        expected_grad[start] = 1.0
+        expected[start], aims[start] = _solve_round_start(model.matrix, start, expected, expected_grad)
+        expected_grad[start] = 0.0
+    return X01Policy(aims, expected)
+
+
+def cache_path(model, cache_dir=CACHE_DIR):
+    digest = hashlib.sha1(model.matrix.tobytes()).hexdigest()
+    return os.path.join(cache_dir, "x01-policy-v{}-{}.npz".format(CACHE_VERSION, digest))
+
+
+def load_or_solve_x01(model, init_score=501, cache_dir=CACHE_DIR):
+    """ Returns the policy cached for the model (policies do not depend on init_score, a policy
+ solved up to a higher score is reused) or solves and caches it. """
+    path = cache_path(model, cache_dir)
+    try:
+        with np.load(path) as cached:
+            if len(cached["expected_darts"]) > init_score:
+                return X01Policy(cached["aims"][:init_score + 1], cached["expected_darts"][:init_score + 1])
+    except (OSError, KeyError, ValueError):
+        pass  # not cached yet (or the file is damaged)
+    policy = solve_x01(model, init_score)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as tmp_file:
+        np.savez(tmp_file, aims=policy.aims, expected_darts=policy.expected_darts)
+    os.replace(tmp_path, path)
+    return policy
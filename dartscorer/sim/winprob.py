@@ -0,0 +1,124 @@
+"""Live win probability estimates. After every round the estimator starts Monte Carlo
+rollouts of the rest of the match from the current scores in a process pool, the game
+loop never waits for them. Estimates are memoized by game state."""
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import threading
+import time
+
+import numpy as np
+
+from ..logic.common import GameListener
+from ..logic.cricket import NUM_TARGETS
+from ..logic.game_x01 import GameX01
+from .cricket import simulate_cricket
+from .x01 import simulate_x01
+
+def _rollouts(models, kind, players, current_player, config, time_budget, max_rollouts, batch, seed):
+    """ Simulates the rest of the match until max_rollouts legs are played or time_budget
+ (in seconds) elapses, at least one batch is always played. Returns win counts of all players. """
+    scoring = bool(config.get("scoring"))
+    if not issubclass(kind, GameX01):
+        # rows of scoring games end with the points
+        marks = [row[:NUM_TARGETS] for row in players]
+        points = [row[NUM_TARGETS] for row in players] if scoring else None
+    deadline = time.monotonic() + time_budget
+    rng = np.random.default_rng(seed)
+    wins = np.zeros(len(models), dtype=np.int64)
+    played = 0
+    while played < max_rollouts:
+        if issubclass(kind, GameX01):
+            results = simulate_x01(models, batch, config["init_score"], rng=rng, start_scores=players,
+                                   first_player=current_player)
+        else:
+            results = simulate_cricket(models, batch, rng=rng, start_marks=marks, first_player=current_player,
+                                       scoring=scoring, start_points=points)
+        wins += np.bincount(results.winners[results.winners >= 0], minlength=len(models))
+        played += batch
+        if time.monotonic() >= deadline:
+            break
+    return wins
+
+
+class LruCache:
+    """ Mapping with a limited size, the least recently used entry is evicted first. """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.__data = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        with self.__lock:
+            value = self.__data.get(key)
+            if value is not None:
+                self.__data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.__lock:
+            self.__data[key] = value
+            self.__data.move_to_end(key)
+            if len(self.__data) > self.maxsize:
+                self.__data.popitem(last=False)
+
+    def __len__(self):
+        return len(self.__data)
+
+
+class WinProbabilityEstimator(GameListener):
+    """ Listener estimating the chance of every player to win the match (see Game.add_listener).
+ The callback gets the state key (game class, players_state(), current player) and a tuple
+ of probabilities, one per player. It is called from a background thread unless the estimate
+ is already cached, in which case it is called right away. When an estimate fails, the
+ callback gets None instead of the probabilities and the exception is kept in last_error.
+ Only GameX01 and Cricket are supported, models must hold an AccuracyModel for every player
+ of the game. """
+
+    def __init__(self, models, callback, time_budget=0.25, max_rollouts=20000, batch=2000,
+                 processes=1, cache_size=4096):
+        self.callback = callback
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.batch = batch
+        self.cache = LruCache(cache_size)
+        # the models go with every job (pool initializers need Python 3.7)
+        self.models = models
+        self.__pool = ProcessPoolExecutor(processes)
+        self.__pending = None
+        self.last_error = None
+        self.__seed = np.random.SeedSequence()
+
+    def round_finished(self, game):
+        if game.over():
+            return
+        key = (type(game), game.players_state(), game.current_player)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.callback(key, cached)
+            return
+        # Estimates of the previous rounds are not interesting anymore.
+        if self.__pending is not None:
+            self.__pending.cancel()
+        self.__pending = self.__pool.submit(_rollouts, self.models, type(game), key[1], game.current_player,
+                                            dict(game.config), self.time_budget, self.max_rollouts, self.batch,
+                                            self.__seed.spawn(1)[0])
+        self.__pending.add_done_callback(lambda future: self.__finished(key, future))
+
+    def __finished(self, key, future):
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.last_error = future.exception()
+            self.callback(key, None)
+            return
+        wins = future.result()
+        total = wins.sum()
+        probabilities = tuple(float(w) / total if total else 0.0 for w in wins)
+        self.cache.put(key, probabilities)
+        self.callback(key, probabilities)
+
+    def close(self):
+        if self.__pending is not None:
+            self.__pending.cancel()
+        self.__pool.shutdown(wait=False)
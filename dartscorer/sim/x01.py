@@ -0,0 +1,89 @@
+"""Vectorized simulation of X01 legs. The rules follow game_x01.Confirm: a round ends after
+the third dart, when the score reaches zero (the leg is over) or when it drops below zero
+(overthrow, the score of the round is discarded)."""
+import numpy as np
+
+from ..logic.common import Multiplier
+from .accuracy import OUTCOME_TOTAL, outcome_index
+from .results import DEFAULT_MAX_ROUNDS, empty_results
+
+
+def _one_dart_finish(remaining):
+    for points, mult in ((remaining, Multiplier.SINGLE), (remaining // 2, Multiplier.DOUBLE),
+                         (remaining // 3, Multiplier.TRIPLE)):
+        if mult * points == remaining and (1 <= points <= 20 or points == 25) and \
+                not (points == 25 and mult == Multiplier.TRIPLE):
+            return outcome_index(points, mult)
+    return None
+
+
+def greedy_x01_policy(init_score=501):
+    """ Returns an array of aims (outcome indices) indexed by the remaining score.
+ The player scores with T20 and tries to finish (or to leave a finish) once it is possible. """
+    policy = np.zeros(init_score + 1, dtype=np.int8)
+    t20 = outcome_index(20, Multiplier.TRIPLE)
+    for remaining in range(1, init_score + 1):
+        finish = _one_dart_finish(remaining)
+        if finish is not None:
+            policy[remaining] = finish
+        elif remaining > 60:
+            policy[remaining] = t20
+        elif remaining > 40:
+            policy[remaining] = outcome_index(remaining - 40, Multiplier.SINGLE)  # leave D20
+        else:
+            policy[remaining] = outcome_index(remaining - 20, Multiplier.SINGLE)  # leave 20
+    return policy
+
+
+def _aims(policy, start, remaining, darts_left):
+    if isinstance(policy, np.ndarray):
+        return policy[remaining]
+    return policy.aims[start, start - remaining, darts_left - 1]
+
+
+def simulate_x01(models, num_legs, init_score=501, policies=None, rng=None,
+                 max_rounds=DEFAULT_MAX_ROUNDS, trace=False, start_scores=None, first_player=0):
+    """ Simulates num_legs legs of X01 at once.
+:param models: AccuracyModel of every player (the number of players is len(models))
+:param policies: aim array (see greedy_x01_policy) or solver.X01Policy of every player, greedy by default
+:param start_scores: scores of the players when the simulation starts (init_score for everybody by default)
+:param first_player: the player whose round comes first
+:return: LegResults, rounds are counted from the start of the simulation"""
+    num_players = len(models)
+    if policies is None:
+        policies = [greedy_x01_policy(init_score)] * num_players
+    rng = rng if rng is not None else np.random.default_rng()
+    results = empty_results(num_legs, max_rounds, trace)
+
+    legs = np.arange(num_legs)  # legs which are still being played
+    scores = np.empty((num_legs, num_players), dtype=np.int16)
+    scores[:] = init_score if start_scores is None else start_scores
+    for round_no in range(max_rounds):
+        if legs.size == 0:
+            break
+        player = (first_player + round_no) % num_players
+        model, policy = models[player], policies[player]
+        start = scores[:, player]
+        remaining = start.copy()
+        throwing = np.ones(legs.size, dtype=bool)
+        busted = np.zeros(legs.size, dtype=bool)
+        for dart in range(3):
+            rows = np.flatnonzero(throwing)
+            if rows.size == 0:
+                break
+            outcomes = model.sample(_aims(policy, start[rows], remaining[rows], 3 - dart), rng)
+            if trace:
+                results.throws[legs[rows], round_no, dart] = outcomes
+            after = remaining[rows] - OUTCOME_TOTAL[outcomes]
+            bust = after < 0
+            remaining[rows[~bust]] = after[~bust]
+            busted[rows[bust]] = True
+            throwing[rows[bust | (after == 0)]] = False
+        scores[:, player] = np.where(busted, start, remaining)
+
+        won = scores[:, player] == 0
+        results.winners[legs[won]] = player
+        results.rounds[legs[won]] = round_no + 1
+        legs, scores = legs[~won], scores[~won]
+    results.rounds[legs] = max_rounds
+    return results
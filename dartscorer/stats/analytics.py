@@ -0,0 +1,118 @@
+"""Vectorised statistics over the columns of a ThrowArchive (or any dict of equally long arrays
+with the same names). Nothing here loops over rows, so the functions stay usable on tens of
+millions of throws; results are arrays indexed by player id (NaN where a player has no data)."""
+import numpy as np
+
+from ..logic.board import CODE_MULTIPLIER, CODE_POINTS
+from ..logic.common import GameType, LEGAL_THROWS
+
+NUM_CODES = len(CODE_POINTS)
+# code of a throw looked up by points * 4 + multiplier
+_CODE_OF = np.zeros(26 * 4, dtype=np.uint8)
+_CODE_OF[CODE_POINTS.astype(np.intp) * 4 + CODE_MULTIPLIER] = np.arange(NUM_CODES)
+# scores which can be checked out with a single dart
+_ONE_DART_FINISH = np.zeros(61, dtype=bool)
+_ONE_DART_FINISH[[thrw.total for thrw in LEGAL_THROWS]] = True
+
+
+def totals(columns):
+    return columns["points"].astype(np.int32) * columns["multiplier"]
+
+
+def throw_codes(columns):
+    """ Throw codes (see board.py) of all rows. """
+    return _CODE_OF[columns["points"].astype(np.intp) * 4 + columns["multiplier"]]
+
+
+def round_starts(columns):
+    """ Indices of the first rows of all rounds. """
+    player, leg = columns["player"], columns["leg"]
+    starts = columns["position"] == 0
+    if len(starts):
+        starts[0] = True
+        starts[1:] |= (player[1:] != player[:-1]) | (leg[1:] != leg[:-1])
+    return np.flatnonzero(starts)
+
+
+def scored(columns):
+    """ Points every throw actually scored in X01: an overthrow discards the whole round.
+ Throws of other games score 0. """
+    total = totals(columns)
+    x01 = columns["game"] == GameType.X01.value
+    if not len(total):
+        return total
+    starts = round_starts(columns)
+    overthrow = x01 & (columns["remaining"] - total < 0)
+    round_overthrown = np.maximum.reduceat(overthrow, starts)
+    lengths = np.diff(np.append(starts, len(total)))
+    return np.where(x01 & ~np.repeat(round_overthrown, lengths), total, 0)
+
+
+def _per_player(values, player, weights_mask, num_players):
+    """ Sum of values and count of rows per player, rows outside the mask left out. """
+    player = player[weights_mask]
+    sums = np.bincount(player, weights=values[weights_mask], minlength=num_players)
+    counts = np.bincount(player, minlength=num_players)
+    return sums, counts
+
+
+def _num_players(columns, num_players):
+    if num_players is not None:
+        return num_players
+    return int(columns["player"].max()) + 1 if len(columns["player"]) else 0
+
+
+def _ratio(sums, counts):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+
+def three_dart_average(columns, num_players=None):
+    """ Average X01 points per three darts. """
+    num_players = _num_players(columns, num_players)
+    x01 = columns["game"] == GameType.X01.value
+    sums, counts = _per_player(scored(columns), columns["player"], x01, num_players)
+    return 3 * _ratio(sums, counts)
+
+
+def dart_numbers(columns):
+    """ Number of every throw within the leg of its player, counted from 0. """
+    n = len(columns["player"])
+    order = np.lexsort((columns["player"], columns["leg"]))  # stable, keeps the order of the throws
+    leg, player = columns["leg"][order], columns["player"][order]
+    first = np.ones(n, dtype=bool)
+    first[1:] = (leg[1:] != leg[:-1]) | (player[1:] != player[:-1])
+    index = np.arange(n)
+    numbers = np.empty(n, dtype=np.int64)
+    numbers[order] = index - np.maximum.accumulate(np.where(first, index, 0))
+    return numbers
+
+
+def first_nine_average(columns, num_players=None):
+    """ Three-dart average of the first nine darts of every X01 leg. """
+    num_players = _num_players(columns, num_players)
+    mask = (columns["game"] == GameType.X01.value) & (dart_numbers(columns) < 9)
+    sums, counts = _per_player(scored(columns), columns["player"], mask, num_players)
+    return 3 * _ratio(sums, counts)
+
+
+def checkout_percentage(columns, num_players=None):
+    """ Percentage of darts thrown at a score which can be finished with a single dart that
+ finished the leg. """
+    num_players = _num_players(columns, num_players)
+    remaining = columns["remaining"].astype(np.intp)
+    chance = (columns["game"] == GameType.X01.value) & (remaining >= 0) & (remaining < len(_ONE_DART_FINISH))
+    chance[chance] = _ONE_DART_FINISH[remaining[chance]]
+    hits = (totals(columns) == remaining).astype(np.float64)
+    sums, counts = _per_player(hits, columns["player"], chance, num_players)
+    return 100 * _ratio(sums, counts)
+
+
+def segment_hit_rates(columns, num_players=None):
+    """ Fraction of throws of each player hitting every throw code, as a (players, codes) array. """
+    num_players = _num_players(columns, num_players)
+    hits = np.bincount(columns["player"].astype(np.intp) * NUM_CODES + throw_codes(columns),
+                       minlength=num_players * NUM_CODES).reshape(num_players, NUM_CODES)
+    counts = hits.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, hits / np.maximum(counts, 1), np.nan)
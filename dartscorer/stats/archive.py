@@ -0,0 +1,136 @@
+"""Columnar archive of throws for long-term analysis (see analytics.py). Every column is a raw
+little-endian file of fixed-width values in the archive directory, a row describes a single
+confirmed throw:
+
+    player      uint32   player id (see ThrowArchive.player_id)
+    leg         uint32   leg id
+    time        float64  time of the confirmation (seconds since the epoch)
+    points      uint8    nominal value of the Throw
+    multiplier  uint8    Multiplier of the Throw
+    position    uint8    position of the throw in its GameRound (0-2)
+    game        uint8    GameType
+    remaining   int16    X01: the score the player had just before the throw, -1 otherwise
+
+Rows of a leg are stored in the order the throws were confirmed, so the throws of a round are
+always adjacent. Columns are only ever appended to, the number of valid rows is kept in
+meta.json, which is replaced atomically after the columns are written. Rows written after the
+last update of meta.json (e.g. because of a power failure) are ignored and overwritten later."""
+import json
+import os
+
+import numpy as np
+
+from ..logic.common import GameListener, GameType, seat_names
+from ..persistence.codec import DATA_DIR, GAME_TYPES
+
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+COLUMNS = (("player", np.dtype("<u4")), ("leg", np.dtype("<u4")), ("time", np.dtype("<f8")),
+           ("points", np.dtype("u1")), ("multiplier", np.dtype("u1")), ("position", np.dtype("u1")),
+           ("game", np.dtype("u1")), ("remaining", np.dtype("<i2")))
+COLUMN_TYPES = dict(COLUMNS)
+NO_REMAINING = -1
+
+
+class ThrowArchive:
+    """ The archive expects a single writer. """
+
+    def __init__(self, directory=ARCHIVE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.__meta_path()) as meta_file:
+                meta = json.load(meta_file)
+        except FileNotFoundError:
+            meta = {"rows": 0, "legs": 0, "players": []}
+        self.rows = meta["rows"]
+        self.legs = meta["legs"]
+        self.players = meta["players"]
+        self.__player_ids = {name: player for player, name in enumerate(self.players)}
+
+    def __meta_path(self):
+        return os.path.join(self.directory, "meta.json")
+
+    def __column_path(self, name):
+        return os.path.join(self.directory, name + ".bin")
+
+    def __save_meta(self):
+        tmp_path = self.__meta_path() + ".tmp"
+        with open(tmp_path, "w") as tmp_file:
+            json.dump({"rows": self.rows, "legs": self.legs, "players": self.players}, tmp_file)
+        os.replace(tmp_path, self.__meta_path())
+
+    def player_id(self, name):
+        """ Returns the id of the player of the given name, registering them first if needed. """
+        player = self.__player_ids.get(name)
+        if player is None:
+            player = len(self.players)
+            self.players.append(name)
+            self.__player_ids[name] = player
+        return player
+
+    def append_leg(self, **columns):
+        """ Appends the rows of a new leg given as arrays (or sequences) of all columns but leg,
+ returns the id of the leg. """
+        lengths = {len(values) for values in columns.values()}
+        if set(columns) != set(COLUMN_TYPES) - {"leg"} or len(lengths) != 1:
+            raise ValueError("All columns but leg of the same length are required.")
+        leg = self.legs
+        columns["leg"] = np.full(lengths.pop(), leg)
+        for name, dtype in COLUMNS:
+            with open(self.__column_path(name), "r+b" if os.path.exists(self.__column_path(name)) else "wb") as column:
+                column.seek(self.rows * dtype.itemsize)
+                column.write(np.asarray(columns[name], dtype=dtype).tobytes())
+                column.truncate()
+        self.rows += len(columns["leg"])
+        self.legs += 1
+        self.__save_meta()
+        return leg
+
+    def columns(self):
+        """ Returns a dict of read-only arrays memory-mapped from the column files. """
+        result = {}
+        for name, dtype in COLUMNS:
+            if self.rows:
+                result[name] = np.memmap(self.__column_path(name), dtype=dtype, mode="r", shape=(self.rows,))
+            else:
+                result[name] = np.empty(0, dtype=dtype)
+        return result
+
+
+class ArchiveRecorder(GameListener):
+    """ Appends every finished leg to the archive when the game is closed, the throws are
+ taken from the undo history of the game (like MatchRecorder does, resumed games are left
+ out for the same reason). """
+
+    def __init__(self, archive, names=None):
+        self.archive = archive
+        self.names = names
+
+    @classmethod
+    def start(cls, game, archive, names=None):
+        recorder = cls(archive, names)
+        game.add_listener(recorder)
+        return recorder
+
+    def game_closed(self, game):
+        if not game.over() or game.force_quit or game.resumed:
+            return
+        names = self.names or seat_names(game.num_players)
+        ids = [self.archive.player_id(name) for name in names]
+        game_type = GAME_TYPES[type(game)]
+        x01 = game_type == GameType.X01
+        steps = list(game.history.steps())
+        remaining = []
+        for step in steps:
+            if x01:
+                remaining.append(step.row_before - sum(thrw.total for thrw in step.throws_before[:step.position_before]))
+            else:
+                remaining.append(NO_REMAINING)
+        throws = [step.throws_before[step.position_before] for step in steps]
+        self.archive.append_leg(player=[ids[step.player] for step in steps],
+                                time=[step.confirmed for step in steps],
+                                points=[thrw.points for thrw in throws],
+                                multiplier=[thrw.multiplier.value for thrw in throws],
+                                position=[step.position_before for step in steps],
+                                game=[game_type.value] * len(steps),
+                                remaining=remaining)
@@ -0,0 +1,145 @@
+"""Per-player counts of hits of every segment and multiplier, kept in memory-mapped .npy files
+(one per player, see HeatmapStore) so that recording a throw is an in-place increment and
+nothing is ever serialised. A heatmap is a SEGMENTS x 3 (single, double, triple) array, row 0
+counts misses in its first column."""
+import json
+import os
+from collections import deque
+
+import numpy as np
+
+from ..logic.common import GameListener, Multiplier, seat_names, throw_of
+from ..logic.history import HISTORY_LIMIT
+from ..persistence.codec import DATA_DIR
+
+HEATMAP_DIR = os.path.join(DATA_DIR, "heatmaps")
+SEGMENTS = tuple(range(0, 21)) + (25,)
+# row of the heatmap by the nominal value of a throw
+SEGMENT_INDEX = tuple(SEGMENTS.index(points) if points in SEGMENTS else -1 for points in range(26))
+SHAPE = (len(SEGMENTS), len(Multiplier))
+DTYPE = np.uint32
+
+
+class HeatmapStore:
+    """ players.json lists the names of the players, the heatmap of the i-th one is i.npy. """
+
+    def __init__(self, directory=HEATMAP_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.__players_path()) as players_file:
+                self.players = json.load(players_file)
+        except FileNotFoundError:
+            self.players = []
+        self.__ids = {name: player for player, name in enumerate(self.players)}
+        self.__heatmaps = {}
+
+    def __players_path(self):
+        return os.path.join(self.directory, "players.json")
+
+    def __heatmap_path(self, player):
+        return os.path.join(self.directory, "{}.npy".format(player))
+
+    def heatmap(self, name):
+        """ The (writable, memory-mapped) heatmap of the player, created if needed. """
+        heatmap = self.__heatmaps.get(name)
+        if heatmap is not None:
+            return heatmap
+        player = self.__ids.get(name)
+        if player is None:
+            player = len(self.players)
+            np.lib.format.open_memmap(self.__heatmap_path(player), mode="w+", dtype=DTYPE, shape=SHAPE).flush()
+            self.players.append(name)
+            self.__ids[name] = player
+            tmp_path = self.__players_path() + ".tmp"
+            with open(tmp_path, "w") as tmp_file:
+                json.dump(self.players, tmp_file)
+            os.replace(tmp_path, self.__players_path())
+        heatmap = np.load(self.__heatmap_path(player), mmap_mode="r+")
+        self.__heatmaps[name] = heatmap
+        return heatmap
+
+    def __view(self, name):
+        """ Read-only heatmap of a known player, not kept open unless it is written to. """
+        heatmap = self.__heatmaps.get(name)
+        if heatmap is None:
+            heatmap = np.load(self.__heatmap_path(self.__ids[name]), mmap_mode="r")
+        return heatmap
+
+    def record(self, name, thrw, count=1):
+        """ Adds count hits of the Throw. """
+        self.heatmap(name)[SEGMENT_INDEX[thrw.points], thrw.multiplier - 1] += count
+
+    def discount(self, name, thrw):
+        """ Takes a hit of the Throw back. """
+        self.heatmap(name)[SEGMENT_INDEX[thrw.points], thrw.multiplier - 1] -= 1
+
+    def flush(self):
+        for heatmap in self.__heatmaps.values():
+            heatmap.flush()
+
+    def close(self):
+        self.flush()
+        self.__heatmaps.clear()
+
+    def merged(self, names=None):
+        """ Sum of the heatmaps of the players (all of them by default). """
+        names = self.players if names is None else names
+        total = np.zeros(SHAPE, dtype=np.uint64)
+        for name in names:
+            if name in self.__ids:
+                total += self.__view(name)
+        return total
+
+    def darts(self, name):
+        return int(self.__view(name).sum()) if name in self.__ids else 0
+
+    def hit_rate(self, name, points, multiplier):
+        """ Fraction of the darts of the player which hit the given segment and multiplier. """
+        darts = self.darts(name)
+        return int(self.__view(name)[SEGMENT_INDEX[points], multiplier - 1]) / darts if darts else 0.0
+
+    def treble_20_rate(self, name):
+        return self.hit_rate(name, 20, Multiplier.TRIPLE)
+
+    def favourite_double(self, name):
+        """ The double the player has hit the most often (a Throw), None if none so far. """
+        if name not in self.__ids:
+            return None
+        doubles = self.__view(name)[1:, Multiplier.DOUBLE - 1]
+        best = int(np.argmax(doubles))
+        return throw_of(SEGMENTS[best + 1], Multiplier.DOUBLE) if doubles[best] else None
+
+
+class HeatmapRecorder(GameListener):
+    """ Counts every confirmed throw (and discounts it again when it is taken back). """
+
+    def __init__(self, store, names):
+        self.store = store
+        self.names = names
+        self.__recorded = deque(maxlen=HISTORY_LIMIT)
+
+    @classmethod
+    def start(cls, game, store, names=None):
+        names = names or seat_names(game.num_players)
+        recorder = cls(store, names)
+        game.add_listener(recorder)
+        return recorder
+
+    def throw_confirmed(self, game):
+        step = game.history.last()
+        name = self.names[step.player]
+        thrw = step.throws_before[step.position_before]
+        self.store.record(name, thrw)
+        self.__recorded.append((name, thrw))
+
+    def throw_redone(self, game):
+        self.throw_confirmed(game)
+
+    def throw_undone(self, game):
+        if self.__recorded:
+            name, thrw = self.__recorded.pop()
+            self.store.discount(name, thrw)
+
+    def game_closed(self, game):
+        self.store.flush()
@@ -0,0 +1,176 @@
+"""Live statistics of players kept up to date throw by throw. Every PlayerStats is a handful of
+running sums (and a maximum), so updating it is constant-time and statistics of several legs,
+sessions or league nights are combined by merge() no matter how many throws they cover."""
+from collections import deque
+from operator import attrgetter
+
+from ..logic.common import GameListener, LEGAL_THROWS, seat_names
+from ..logic.cricket import Cricket, TARGET_INDEX
+from ..logic.game_x01 import GameX01
+from ..logic.history import HISTORY_LIMIT
+
+# Scores which can be checked out with a single dart, a dart thrown at one is a checkout attempt.
+ONE_DART_FINISHES = frozenset(thrw.total for thrw in LEGAL_THROWS)
+LCD_WIDTH = 16
+
+
+class PlayerStats:
+    """ darts, points, rounds and the round counts are X01 only, marks and cricket_rounds are Cricket only. """
+    __slots__ = ("darts", "points", "rounds", "highest_round", "tons", "ton_forties", "one_eighties",
+                 "checkout_attempts", "checkout_hits", "marks", "cricket_rounds")
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.pop(name, 0))
+        if values:
+            raise TypeError("Unknown statistics: {}".format(", ".join(values)))
+
+    def values(self):
+        """ All the counters as a tuple ordered as __slots__. """
+        return _values(self)
+
+    @classmethod
+    def of_values(cls, values):
+        stats = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, values):
+            setattr(stats, name, value)
+        return stats
+
+    def copy(self):
+        return self.of_values(_values(self))
+
+    def merge(self, other):
+        """ Adds the other statistics to these ones, returns self. """
+        for name in self.__slots__:
+            if name == "highest_round":
+                self.highest_round = max(self.highest_round, other.highest_round)
+            else:
+                setattr(self, name, getattr(self, name) + getattr(other, name))
+        return self
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def __eq__(self, other):
+        return isinstance(other, PlayerStats) and _values(self) == _values(other)
+
+    def __repr__(self):
+        return "PlayerStats({})".format(", ".join("{}={}".format(*item) for item in self.to_dict().items()))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**values)
+
+    def three_dart_average(self):
+        return 3 * self.points / self.darts if self.darts else 0.0
+
+    def checkout_percentage(self):
+        return 100 * self.checkout_hits / self.checkout_attempts if self.checkout_attempts else 0.0
+
+    def marks_per_round(self):
+        return self.marks / self.cricket_rounds if self.cricket_rounds else 0.0
+
+    def count_round(self, score):
+        """ Counts a finished X01 round which scored the given points. """
+        self.rounds += 1
+        self.points += score
+        self.highest_round = max(self.highest_round, score)
+        if score == 180:
+            self.one_eighties += 1
+        elif score >= 140:
+            self.ton_forties += 1
+        elif score >= 100:
+            self.tons += 1
+
+    def x01_lines(self, player):
+        """ A pair of LCD lines, e.g. "P1 60.0 hi100" (three-dart average, highest round) and
+ "1/0/0 co1/3" (rounds of 100+, 140+ and 180, checkout hits and attempts). """
+        return ("P{} {:.1f} hi{}".format(player + 1, self.three_dart_average(), self.highest_round)[:LCD_WIDTH],
+                "{}/{}/{} co{}/{}".format(self.tons, self.ton_forties, self.one_eighties, self.checkout_hits,
+                                         self.checkout_attempts)[:LCD_WIDTH])
+
+    def cricket_lines(self, player):
+        return ("P{} mpr {:.2f}".format(player + 1, self.marks_per_round())[:LCD_WIDTH],
+                "marks {} r{}".format(self.marks, self.cricket_rounds)[:LCD_WIDTH])
+
+
+_values = attrgetter(*PlayerStats.__slots__)
+
+
+def merge_all(stats):
+    """ Merges an iterable of dicts mapping names to PlayerStats into a single such dict. """
+    result = {}
+    for named in stats:
+        for name, player_stats in named.items():
+            if name in result:
+                result[name].merge(player_stats)
+            else:
+                result[name] = player_stats.copy()
+    return result
+
+
+class StatsTracker(GameListener):
+    """ Updates statistics of the leg after every confirmed throw and shows the statistics of
+ the player whose round has just finished. Throws which are taken back are subtracted again
+ (the statistics before every throw are kept for as long as the throw can be undone). Once a
+ finished leg is closed, its statistics are merged into session (a dict keyed by name). """
+
+    def __init__(self, num_players, names=None, session=None, show=True):
+        self.names = names or seat_names(num_players)
+        self.leg = [PlayerStats() for _ in range(num_players)]
+        self.session = session
+        self.show = show
+        self.__before = deque(maxlen=HISTORY_LIMIT)
+
+    @classmethod
+    def start(cls, game, names=None, session=None, show=True):
+        tracker = cls(game.num_players, names, session, show)
+        game.add_listener(tracker)
+        return tracker
+
+    def throw_confirmed(self, game):
+        step = game.history.last()
+        player = step.player
+        stats = self.leg[player]
+        self.__before.append((player, _values(stats)))
+        thrw = step.throws_before[step.position_before]
+        round_over = game.round.current_position_int() == 0 or game.over()
+        if isinstance(game, GameX01):
+            stats.darts += 1
+            remaining = step.row_before - sum(thrown.total for thrown in step.throws_before[:step.position_before])
+            if remaining in ONE_DART_FINISHES:
+                stats.checkout_attempts += 1
+                if thrw.total == remaining:
+                    stats.checkout_hits += 1
+            if round_over:
+                # the score only changes at the end of a round, an overthrow leaves it as it was
+                stats.count_round(step.row_before - game.player_row(player))
+                if self.show:
+                    game.show_stats(stats.x01_lines(player))
+        elif isinstance(game, Cricket):
+            if TARGET_INDEX[thrw.points] >= 0:
+                stats.marks += thrw.multiplier
+            if round_over:
+                stats.cricket_rounds += 1
+                if self.show:
+                    game.show_stats(stats.cricket_lines(player))
+
+    def throw_undone(self, game):
+        if self.__before:
+            player, values = self.__before.pop()
+            self.leg[player] = PlayerStats.of_values(values)
+
+    def throw_redone(self, game):
+        self.throw_confirmed(game)
+
+    def game_closed(self, game):
+        if self.session is None or not game.over() or game.force_quit:
+            return
+        for name, stats in zip(self.names, self.leg):
+            if name in self.session:
+                self.session[name].merge(stats)
+            else:
+                self.session[name] = stats.copy()
@@ -0,0 +1,227 @@
+"""Glicko ratings of players computed from finished legs. A leg counts as a won game of its
+winner against each of the other players. Ratings are updated in rating periods (days): all
+games of a period are rated against the ratings the players had when the period began, and
+the rating deviation of a player grows with every period they do not play. This makes the
+whole history computable by batch_ratings() with one set of array operations per period. The
+incremental RatingBook.rate_leg() gives the same ratings: the book keeps the rating and RD every
+player had when the current period began together with the sums of the period's games, so a
+leg only adds its games to the sums and the rating is worked out from the start of the period.
+
+Ratings feed handicaps: handicap_scores() turns them into start scores of GameX01."""
+import json
+import math
+import os
+import time
+from sys import stderr as serr
+
+import numpy as np
+
+from ..logic.common import GameListener
+from ..persistence.codec import DATA_DIR
+from ..persistence.match_store import winner_of
+
+RATINGS_PATH = os.path.join(DATA_DIR, "ratings.json")
+PERIOD = 86400.0
+INITIAL_RATING = 1500.0
+INITIAL_RD = 350.0
+MIN_RD = 30.0
+# Growth of the rating deviation per period without a game, a player's RD returns from 50 to
+# INITIAL_RD after about two years off.
+RD_GROWTH = 13.0
+_Q = math.log(10) / 400
+# X01 points taken off the start score of a player per rating point behind the best player.
+HANDICAP_PER_POINT = 0.25
+MAX_HANDICAP = 250
+
+
+def period_of(finished):
+    return int(finished // PERIOD)
+
+
+def _grown_rd(rd, last, period):
+    """ RD at the start of the period of a player who played last in the period last. """
+    return np.minimum(np.sqrt(rd ** 2 + RD_GROWTH ** 2 * (period - last)), INITIAL_RD)
+
+
+def _game_sums(rating, rd, players, opponents, scores, size):
+    """ Sums of the games of every player (the terms of 1/d^2 and of the rating change),
+ ratings and RDs are the ones of the start of the period. """
+    g = 1 / np.sqrt(1 + 3 * (_Q * rd[opponents]) ** 2 / math.pi ** 2)
+    expected = 1 / (1 + 10 ** (-g * (rating[players] - rating[opponents]) / 400))
+    return (np.bincount(players, g ** 2 * expected * (1 - expected), size),
+            np.bincount(players, g * (scores - expected), size))
+
+
+def _rated(rating, rd, variance_sum, delta_sum):
+    """ Rating and RD at the end of a period which started with rating and rd. """
+    precision = 1 / rd ** 2 + _Q ** 2 * variance_sum
+    return rating + _Q / precision * delta_sum, np.maximum(np.sqrt(1 / precision), MIN_RD)
+
+
+def _rate_period(rating, rd, last, period, players, opponents, scores):
+    """ Rates the games of a single period in place. Every game is given twice, once from the
+ point of view of each side: players, opponents and scores (1 won, 0 lost) are equally long
+ arrays of indices into rating, rd and last (the period each player played last in). """
+    involved = np.unique(players)
+    rd[involved] = _grown_rd(rd[involved], last[involved], period)
+    last[involved] = period
+    variance_sum, delta_sum = _game_sums(rating, rd, players, opponents, scores, len(rating))
+    rating[involved], rd[involved] = _rated(rating[involved], rd[involved], variance_sum[involved],
+                                            delta_sum[involved])
+
+
+def batch_ratings(periods, winners, losers, num_players):
+    """ Ratings of all players after the given games (equally long arrays, one game per index:
+ the period it was played in, the ids of its winner and loser, sorted by period).
+:return: arrays rating, rd and the last period each player played in (-1 if never)"""
+    periods = np.asarray(periods, dtype=np.int64)
+    winners = np.asarray(winners, dtype=np.intp)
+    losers = np.asarray(losers, dtype=np.intp)
+    rating = np.full(num_players, INITIAL_RATING)
+    rd = np.full(num_players, INITIAL_RD)
+    last = np.full(num_players, -1, dtype=np.int64)
+    if not len(periods):
+        return rating, rd, last
+    played = np.zeros(num_players, dtype=bool)
+    bounds = np.flatnonzero(np.diff(periods)) + 1
+    for start, end in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(periods)]))):
+        won, lost = winners[start:end], losers[start:end]
+        fresh = np.concatenate((won, lost))
+        fresh = fresh[~played[fresh]]
+        # a player who has never played starts with INITIAL_RD whenever that is
+        last[fresh] = periods[start]
+        played[fresh] = True
+        count = end - start
+        scores = np.zeros(2 * count)
+        scores[:count] = 1
+        _rate_period(rating, rd, last, periods[start], np.concatenate((won, lost)), np.concatenate((lost, won)),
+                     scores)
+    last[~played] = -1
+    return rating, rd, last
+
+
+def leg_games(rows):
+    """ Turns rows of MatchStore.leg_results() into games: returns the names of all players and
+ arrays periods, winners and losers (indices into the names) ordered by period. """
+    if not rows:
+        return [], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    leg_ids, finished, _, row_names, won = zip(*rows)
+    names = list(dict.fromkeys(row_names))
+    ids = {name: index for index, name in enumerate(names)}
+    leg_ids = np.array(leg_ids)
+    player_ids = np.array([ids[name] for name in row_names], dtype=np.intp)
+    won = np.array(won, dtype=bool)
+    # rows of a leg are adjacent, the winner of every leg is looked up by the leg's first row
+    first = np.ones(len(leg_ids), dtype=bool)
+    first[1:] = leg_ids[1:] != leg_ids[:-1]
+    leg_index = np.cumsum(first) - 1
+    winner_of_leg = np.full(leg_index[-1] + 1, -1, dtype=np.intp)
+    winner_of_leg[leg_index[won]] = player_ids[won]
+    winners = winner_of_leg[leg_index[~won]]
+    keep = winners >= 0
+    periods = (np.array(finished)[~won] // PERIOD).astype(np.int64)
+    return names, periods[keep], winners[keep], player_ids[~won][keep]
+
+
+class RatingBook:
+    """ Ratings of players by name, kept as a JSON file of lists [rating, rd, last period, rating
+ and rd at the start of the last period, the sums of the games of the last period]. """
+
+    def __init__(self, path=RATINGS_PATH):
+        self.path = path
+        try:
+            with open(path) as ratings_file:
+                self.players = json.load(ratings_file)
+        except (FileNotFoundError, ValueError):
+            self.players = {}
+
+    def rating(self, name):
+        return self.players.get(name, [INITIAL_RATING, INITIAL_RD, -1])[0]
+
+    def rd(self, name):
+        return self.players.get(name, [INITIAL_RATING, INITIAL_RD, -1])[1]
+
+    def rate_leg(self, names, winner, finished):
+        """ Updates the ratings of the players of a single leg won by names[winner]. """
+        if winner is None or len(names) < 2:
+            return
+        period = period_of(finished)
+        rows = np.array([self.__period_row(name, period) for name in names])
+        others = np.array([player for player in range(len(names)) if player != winner], dtype=np.intp)
+        won = np.full(len(others), winner, dtype=np.intp)
+        scores = np.concatenate((np.ones(len(others)), np.zeros(len(others))))
+        variance_sum, delta_sum = _game_sums(rows[:, 3], rows[:, 4], np.concatenate((won, others)),
+                                             np.concatenate((others, won)), scores, len(names))
+        rows[:, 5] += variance_sum
+        rows[:, 6] += delta_sum
+        rows[:, 0], rows[:, 1] = _rated(rows[:, 3], rows[:, 4], rows[:, 5], rows[:, 6])
+        for player, name in enumerate(names):
+            row = [float(value) for value in rows[player]]
+            row[2] = period
+            self.players[name] = row
+
+    def __period_row(self, name, period):
+        """ The row of the player with the start of the period, the sums are empty if the player
+ has not played in it yet. """
+        row = self.players.get(name)
+        if row is None:
+            return [INITIAL_RATING, INITIAL_RD, period, INITIAL_RATING, INITIAL_RD, 0.0, 0.0]
+        if len(row) == 7 and row[2] == period:
+            return row
+        rating, rd, last = row[:3]
+        rd = float(_grown_rd(rd, last, period))
+        return [rating, rd, period, rating, rd, 0.0, 0.0]
+
+    def recompute(self, store):
+        """ Throws the ratings away and computes them from all legs in the MatchStore. """
+        names, periods, winners, losers = leg_games(store.leg_results())
+        rating, rd, last = batch_ratings(periods, winners, losers, len(names))
+        # the sums of the last periods are not known, legs still to come in them start afresh
+        self.players = {name: [float(rating[i]), float(rd[i]), int(last[i])] for i, name in enumerate(names)}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as tmp_file:
+            json.dump(self.players, tmp_file)
+        os.replace(tmp_path, self.path)
+
+    def handicap_scores(self, names, init_score=501):
+        return handicap_scores([self.rating(name) for name in names], init_score)
+
+
+def handicap_scores(ratings, init_score=501):
+    """ Start scores of GameX01 players with the given ratings: the best rated player starts from
+ init_score, the others have less to score. """
+    best = max(ratings)
+    return [init_score - min(MAX_HANDICAP, init_score - 1, int(round((best - rating) * HANDICAP_PER_POINT)))
+            for rating in ratings]
+
+
+class RatingRecorder(GameListener):
+    """ Rates every finished leg when the game is closed. Ratings belong to players, so the names
+ of the players are required (seats, see common.seat_names, would be rated as if they were
+ the same people in every game). """
+
+    def __init__(self, book, names):
+        if not names:
+            raise ValueError("Only named players can be rated.")
+        self.book = book
+        self.names = names
+
+    @classmethod
+    def start(cls, game, book, names):
+        if len(names) != game.num_players:
+            raise ValueError("Every player of the game has to be named.")
+        recorder = cls(book, names)
+        game.add_listener(recorder)
+        return recorder
+
+    def game_closed(self, game):
+        if not game.over() or game.force_quit:
+            return
+        self.book.rate_leg(self.names, winner_of(game), time.time())
+        try:
+            self.book.save()
+        except OSError as ex:
+            print("The ratings could not be saved: {}".format(ex), file=serr)
@@ -362,6 +362,75 @@ class Test501GameLogic(unittest.TestCase):
         game.loop()
         self.assertEqual(game._GameX01__points_to_string(), "81  " + "101")
 
+    def test_checkout_suggestion(self):
+        evs = [
+                  Event(EventType.NUMBER, 2),
+                  Event(EventType.NUMBER, 0),
+                  Event(EventType.ACTION, Action.TRIPLE),
+                  Event(EventType.ACTION, Action.CONFIRM)
+              ] * 6
+        evs += [
+            Event(EventType.NUMBER, 2),
+            Event(EventType.NUMBER, 0),
+            Event(EventType.ACTION, Action.TRIPLE),
+            Event(EventType.ACTION, Action.CONFIRM)
+        ]
+        game = GameX01(1, TestingPoller(evs), RENDERER)
+        game.loop()
+        # 501 - 7 * 60 = 81 with two darts left
+        self.assertEqual(RENDERER.lcd_second_line, "     20T  7T")
+        game.round.hop_to_next_position()
+        self.assertEqual(game._GameX01__checkout_route(), None)
+
+    def test_no_checkout_suggestion_out_of_range(self):
+        evs = [
+            Event(EventType.NUMBER, 2),
+            Event(EventType.ACTION, Action.CONFIRM)
+        ]
+        game = GameX01(1, TestingPoller(evs), RENDERER)
+        game.loop()
+        self.assertEqual(RENDERER.lcd_second_line, "    ####    ")
+
+    def test_apply_headless(self):
+        evs = [
+                  Event(EventType.NUMBER, 2),
+                  Event(EventType.NUMBER, 0),
+                  Event(EventType.ACTION, Action.TRIPLE),
+                  Event(EventType.ACTION, Action.CONFIRM)
+              ] * 3
+        game = GameX01(2, None, None)
+        state, intents = game.apply(evs)
+        self.assertEqual(state.players, (321, 501))
+        self.assertEqual(state.current_player, 1)
+        self.assertEqual(state.position, 0)
+        self.assertFalse(state.over)
+        self.assertEqual(intents, [])
+
+    def test_apply_render_intents(self):
+        evs = [
+            Event(EventType.NUMBER, 2),
+            Event(EventType.NUMBER, 5),
+            Event(EventType.ACTION, Action.TRIPLE),
+            Event(EventType.NUMBER, 1)
+        ]
+        game = GameX01(1, None, None)
+        _, intents = game.apply(evs)
+        self.assertEqual(intents, [(common.RenderIntent.WARNING, "25T not valid!"),
+                                   (common.RenderIntent.WARNING, "hit <-")])
+
+    def test_apply_stops_when_over(self):
+        evs = [
+            Event(EventType.NUMBER, 2),
+            Event(EventType.NUMBER, 0),
+            Event(EventType.ACTION, Action.CONFIRM)
+        ]
+        remaining = iter(evs * 2)
+        game = GameX01(1, None, None, init_score=20)
+        state, _ = game.apply(remaining)
+        self.assertTrue(state.over)
+        self.assertEqual(state.players, (0,))
+        self.assertEqual(len(list(remaining)), 3)
+
 
 class TestPosition(unittest.TestCase):
     def test_add(self):
@@ -369,6 +438,37 @@ class TestPosition(unittest.TestCase):
         second += 1
         self.assertEqual(common.Position.SECOND, second)
 
+    def test_add_wraps_around(self):
+        self.assertEqual(common.Position.OVER, common.Position.FIRST + 3)
+        self.assertEqual(common.Position.FIRST, common.Position.OVER + 1)
+
+
+class TestThrow(unittest.TestCase):
+    def test_legal_throws(self):
+        self.assertEqual(len(common.LEGAL_THROWS), 62)
+        self.assertEqual(len(set(common.LEGAL_THROWS)), 62)
+
+    def test_throws_are_interned(self):
+        self.assertIs(common.throw_of(20, common.Multiplier.TRIPLE), common.throw_of(20, common.Multiplier.TRIPLE))
+        self.assertIs(common.zero_throw(), common.ZERO_THROW)
+        self.assertEqual(common.throw_of(25, common.Multiplier.DOUBLE).total_points(), 50)
+
+    def test_triple_bull_not_valid(self):
+        with self.assertRaises(ValueError):
+            common.throw_of(25, common.Multiplier.TRIPLE)
+
+    def test_round_points(self):
+        game_round = common.GameRound()
+        game_round.set_current_throw(common.throw_of(20, common.Multiplier.TRIPLE))
+        self.assertEqual(game_round.points(), 0)
+        game_round.hop_to_next_position()
+        game_round.set_current_throw(common.throw_of(19, common.Multiplier.DOUBLE))
+        game_round.hop_to_next_position()
+        self.assertEqual(game_round.points(), 98)
+        game_round.clear()
+        self.assertEqual(game_round.points(), 0)
+        self.assertTrue(game_round.is_first_throw())
+
 
 if __name__ == "__main__":
     unittest.main()
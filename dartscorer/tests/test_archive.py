@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier, ZERO_THROW
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.snapshot import Snapshot
+
+if np is not None:
+    from dartscorer.logic.board import THROW_CODE
+    from dartscorer.stats import analytics
+    from dartscorer.stats.archive import ArchiveRecorder, ThrowArchive
+
+T20 = throw_of(20, Multiplier.TRIPLE)
+S20 = throw_of(20, Multiplier.SINGLE)
+S19 = throw_of(19, Multiplier.SINGLE)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.directory = tmp_dir.name
+        self.archive = ThrowArchive(self.directory)
+
+    def play(self, game, events, names=None):
+        with game:
+            ArchiveRecorder.start(game, self.archive, names)
+            game.apply(events)
+
+    def test_x01_leg(self):
+        undo = [Event(EventType.NUMBER, 1), Event(EventType.ACTION, Action.CONFIRM), Event(EventType.ACTION, Action.UNDO)]
+        self.play(GameX01(2, None, NullDisplayController(), init_score=120),
+                  undo + throw_to_events(S20) * 3 + throw_to_events(S19) * 3 + throw_to_events(T20), ["Ann", "Bob"])
+        columns = ThrowArchive(self.directory).columns()
+        self.assertEqual(columns["player"].tolist(), [0, 0, 0, 1, 1, 1, 0])
+        self.assertEqual(columns["position"].tolist(), [0, 1, 2, 0, 1, 2, 0])
+        self.assertEqual(columns["remaining"].tolist(), [120, 100, 80, 120, 101, 82, 60])
+        self.assertEqual(columns["multiplier"][-1], 3)
+        self.assertTrue((np.diff(columns["time"]) >= 0).all())
+        np.testing.assert_allclose(analytics.three_dart_average(columns), [90, 57])
+        np.testing.assert_allclose(analytics.first_nine_average(columns), [90, 57])
+        np.testing.assert_equal(analytics.checkout_percentage(columns), [100, np.nan])
+        rates = analytics.segment_hit_rates(columns)
+        self.assertEqual(rates.shape, (2, 63))
+        self.assertAlmostEqual(rates[0, THROW_CODE[S20]], 0.75)
+        self.assertAlmostEqual(rates[1, THROW_CODE[S19]], 1.0)
+
+    def test_resumed_not_archived(self):
+        game = GameX01(1, None, NullDisplayController(), init_score=80)
+        game.apply(throw_to_events(S20))
+        resumed = Snapshot.decode(Snapshot.of(game).encode()).new_game(None, NullDisplayController())
+        self.play(resumed, throw_to_events(T20))
+        self.assertTrue(resumed.over())
+        self.assertEqual(len(self.archive.columns()["player"]), 0)
+
+    def test_overthrow(self):
+        self.play(GameX01(1, None, NullDisplayController(), init_score=50),
+                  throw_to_events(T20) + throw_to_events(throw_of(25, Multiplier.DOUBLE)))
+        columns = self.archive.columns()
+        self.assertEqual(analytics.scored(columns).tolist(), [0, 50])
+        np.testing.assert_allclose(analytics.three_dart_average(columns), [75])
+        np.testing.assert_allclose(analytics.checkout_percentage(columns), [50])
+
+    def test_legs_and_players(self):
+        events = []
+        for points in (20, 19, 18, 17, 16, 15):
+            events += throw_to_events(throw_of(points, Multiplier.TRIPLE))
+        events += throw_to_events(ZERO_THROW) + throw_to_events(throw_of(25, Multiplier.DOUBLE)) * 2
+        self.play(Cricket(1, None, NullDisplayController()), events, ["Bob"])
+        self.play(GameX01(1, None, NullDisplayController(), init_score=60), throw_to_events(T20), ["Ann"])
+        self.play(GameX01(1, None, NullDisplayController()), throw_to_events(T20))  # not finished
+        archive = ThrowArchive(self.directory)
+        self.assertEqual((archive.rows, archive.legs, archive.players), (10, 2, ["Bob", "Ann"]))
+        columns = archive.columns()
+        self.assertEqual(columns["leg"].tolist(), [0] * 9 + [1])
+        self.assertTrue((columns["remaining"][:9] == -1).all())
+        self.assertEqual(analytics.dart_numbers(columns).tolist(), list(range(9)) + [0])
+        np.testing.assert_equal(analytics.three_dart_average(columns), [np.nan, 180])
+
+    def test_dart_numbers_interleaved(self):
+        columns = {"leg": np.array([0, 0, 1, 0, 1, 1]), "player": np.array([0, 1, 0, 0, 0, 1])}
+        self.assertEqual(analytics.dart_numbers(columns).tolist(), [0, 0, 0, 1, 1, 0])
+
+    def test_unsaved_rows_ignored(self):
+        self.archive.append_leg(player=[0, 0], time=[1.0, 2.0], points=[20, 19], multiplier=[1, 1],
+                                position=[0, 1], game=[1, 1], remaining=[501, 481])
+        with open(os.path.join(self.directory, "points.bin"), "ab") as column:
+            column.write(b"\x05" * 10)  # e.g. a write interrupted before meta.json was replaced
+        archive = ThrowArchive(self.directory)
+        self.assertEqual(archive.columns()["points"].tolist(), [20, 19])
+        archive.append_leg(player=[1], time=[3.0], points=[5], multiplier=[2], position=[0], game=[1], remaining=[10])
+        columns = ThrowArchive(self.directory).columns()
+        self.assertEqual((columns["points"].tolist(), columns["leg"].tolist()), ([20, 19, 5], [0, 0, 1]))
+        with self.assertRaises(ValueError):
+            archive.append_leg(player=[0], time=[1.0])
+
+    def test_empty(self):
+        columns = self.archive.columns()
+        self.assertEqual(len(analytics.three_dart_average(columns)), 0)
+        self.assertEqual(analytics.segment_hit_rates(columns).shape, (0, 63))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from dartscorer.logic.common import Multiplier, throw_of, ZERO_THROW
+
+if np is not None:
+    from dartscorer.logic import board
+    from dartscorer.logic.board import coords_to_throw, coords_to_throws, coords_to_codes, classify, load_raster
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBoard(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.TemporaryDirectory()
+        cls.raster = load_raster(cls.cache_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.raster
+        cls.cache_dir.cleanup()
+
+    def test_exact(self):
+        self.assertIs(coords_to_throw(0, 0), throw_of(25, Multiplier.DOUBLE))
+        self.assertIs(coords_to_throw(10, 0), throw_of(25, Multiplier.SINGLE))
+        self.assertIs(coords_to_throw(0, 103), throw_of(20, Multiplier.TRIPLE))
+        self.assertIs(coords_to_throw(0, -166), throw_of(3, Multiplier.DOUBLE))
+        self.assertIs(coords_to_throw(50, 0), throw_of(6, Multiplier.SINGLE))
+        self.assertIs(coords_to_throw(-130, 0), throw_of(11, Multiplier.SINGLE))
+        self.assertIs(coords_to_throw(0, 171), ZERO_THROW)
+
+    def test_segments(self):
+        for segment, points in enumerate(board.BOARD_ORDER):
+            angle = np.radians(segment * board.SEGMENT_ANGLE)
+            self.assertIs(coords_to_throw(80 * np.sin(angle), 80 * np.cos(angle)), throw_of(points, Multiplier.SINGLE))
+
+    def test_raster_is_memory_mapped(self):
+        self.assertIsInstance(self.raster, np.memmap)
+        self.assertTrue(os.path.exists(board.raster_path(self.cache_dir.name)))
+        self.assertIsInstance(load_raster(self.cache_dir.name), np.memmap)
+
+    def test_raster_matches_exact(self):
+        rng = np.random.default_rng(1)
+        xs = rng.uniform(-200, 200, 100000)
+        ys = rng.uniform(-200, 200, 100000)
+        codes = coords_to_codes(xs, ys, self.raster)
+        self.assertEqual(codes.shape, xs.shape)
+        # only points close to the wires may differ
+        self.assertLess(np.mean(codes != classify(xs, ys)), 0.005)
+
+    def test_throws(self):
+        throws = coords_to_throws(np.array([0.0, 0.0, 500.0]), np.array([0.0, 103.0, 0.0]), self.raster)
+        self.assertEqual(list(throws), [throw_of(25, Multiplier.DOUBLE), throw_of(20, Multiplier.TRIPLE), ZERO_THROW])
+        self.assertIs(throws[1], throw_of(20, Multiplier.TRIPLE))
+
+
+if __name__ == '__main__':
+    unittest.main()
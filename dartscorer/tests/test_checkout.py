@@ -0,0 +1,47 @@
+import unittest
+from itertools import product
+
+from dartscorer.logic.checkout import checkout, MAX_CHECKOUT, MAX_DARTS, _difficulty
+from dartscorer.logic.common import LEGAL_THROWS, Multiplier
+
+
+def brute_force():
+    """ Maps (darts, score) to (number of darts, difficulty) of the best route. """
+    best = {}
+    for darts in range(1, MAX_DARTS + 1):
+        for route in product(LEGAL_THROWS, repeat=darts):
+            score = sum(throw.total for throw in route)
+            key = (darts, sum(_difficulty(throw) for throw in route))
+            for allowed in range(darts, MAX_DARTS + 1):
+                if (allowed, score) not in best or key < best[(allowed, score)]:
+                    best[(allowed, score)] = key
+    return best
+
+
+class TestCheckout(unittest.TestCase):
+    def test_against_brute_force(self):
+        best = brute_force()
+        for darts in range(1, MAX_DARTS + 1):
+            for score in range(1, MAX_CHECKOUT + 1):
+                route = checkout(score, darts)
+                if (darts, score) not in best:
+                    self.assertIsNone(route, (darts, score))
+                    continue
+                self.assertEqual(sum(throw.total for throw in route), score)
+                self.assertEqual((len(route), sum(_difficulty(throw) for throw in route)), best[(darts, score)])
+
+    def test_out_of_range(self):
+        self.assertIsNone(checkout(0, 3))
+        self.assertIsNone(checkout(181, 3))
+        self.assertIsNone(checkout(179, 3))
+        self.assertIsNone(checkout(40, 0))
+
+    def test_known_routes(self):
+        self.assertEqual([(t.points, t.multiplier) for t in checkout(170, 3)],
+                         [(20, Multiplier.TRIPLE), (20, Multiplier.TRIPLE), (25, Multiplier.DOUBLE)])
+        self.assertEqual([(t.points, t.multiplier) for t in checkout(40, 3)], [(20, Multiplier.DOUBLE)])
+        self.assertEqual([(t.points, t.multiplier) for t in checkout(7, 1)], [(7, Multiplier.SINGLE)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,8 @@ except from printing out the current state of its virtual 'displays' to a file."
         self.lcd_second_line = ""
         self.segment_text = ""
         self.output_file = out_file
+        self.in_frame = False
+        self.printed = None
 
     def clear(self):
         self.lcd_first_line = ""
@@ -22,20 +24,37 @@ except from printing out the current state of its virtual 'displays' to a file."
     def warning(self, text):
         print("Warn: {}".format(text), file=self.output_file)
 
+    def show_stats(self, first_line, second_line):
+        print("Stats: {} / {}".format(first_line, second_line), file=self.output_file)
+
     def clean_up(self):
         print("Cleaning up.", file=self.output_file)
 
+    def begin_frame(self):
+        self.in_frame = True
+
+    def end_frame(self):
+        self.in_frame = False
+        self.__print_frame()
+
     def segment_set_text(self, text):
         self.segment_text = text
-        print(self.__decorated_to_string(), file=self.output_file)
+        self.__print_frame()
 
     def lcd_set_first_line(self, text, _duration=None):
         self.lcd_first_line = text
-        print(self.__decorated_to_string(), file=self.output_file)
+        self.__print_frame()
 
     def lcd_set_second_line(self, text, _duration=None):
         self.lcd_second_line = text
-        print(self.__decorated_to_string(), file=self.output_file)
+        self.__print_frame()
+
+    def __print_frame(self):
+        """ Like DisplayController, a frame is only printed once it is complete and if it differs. """
+        frame = self.__decorated_to_string()
+        if not self.in_frame and frame != self.printed:
+            self.printed = frame
+            print(frame, file=self.output_file)
 
     def to_string(self):
         if not self.lcd_first_line or not self.lcd_second_line or not self.segment_text:
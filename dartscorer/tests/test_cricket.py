@@ -3,6 +3,7 @@ import unittest
 from dartscorer.tests.test_common import *
 from dartscorer.input.input_controller import Event, EventType, Action
 from dartscorer.logic.cricket import Cricket, cricket_score_init
+from dartscorer.logic.game_x01 import GameX01
 
 
 class TestCricket(unittest.TestCase):
@@ -227,3 +228,103 @@ class TestCricket(unittest.TestCase):
         game.loop()
         self.assertEqual("1516   1819 2025", RENDERER.lcd_first_line)
         self.assertEqual(" 0 0    0 0  0 0", RENDERER.lcd_second_line)
+
+    def test_confirm_not_shared_with_other_games(self):
+        evs = [
+            Event(EventType.NUMBER, 1),
+            Event(EventType.NUMBER, 7),
+            Event(EventType.ACTION, Action.CONFIRM)
+        ]
+        game = Cricket(1, TestingPoller(evs), RENDERER)
+        x01 = GameX01(1, TestingPoller(evs), RENDERER)
+        self.assertIsNot(game.action_table, x01.action_table)
+        game.loop()
+        x01.loop()
+        expected = cricket_score_init()
+        expected[17] = 1
+        self.assertEqual(game.players[0], expected)
+        self.assertEqual(x01.players[0], 501)
+
+    def test_scoring(self):
+        evs = [
+            Event(EventType.NUMBER, 2),
+            Event(EventType.NUMBER, 0),
+            Event(EventType.ACTION, Action.TRIPLE),
+            Event(EventType.ACTION, Action.CONFIRM),
+            Event(EventType.NUMBER, 2),
+            Event(EventType.NUMBER, 0),
+            Event(EventType.ACTION, Action.DOUBLE),
+            Event(EventType.ACTION, Action.CONFIRM)
+        ]
+        game = Cricket(2, TestingPoller(evs), RENDERER, scoring=True)
+        game.loop()
+        self.assertEqual(game.points, [40, 0])
+        self.assertEqual(game.players[0][20], 3)
+        self.assertEqual(game.players_state()[0], (0, 0, 0, 0, 0, 3, 0, 40))
+
+    def test_no_points_on_target_closed_by_everybody(self):
+        evs = [
+                  Event(EventType.NUMBER, 1),
+                  Event(EventType.NUMBER, 5),
+                  Event(EventType.ACTION, Action.TRIPLE),
+                  Event(EventType.ACTION, Action.CONFIRM)
+              ] * 3 * 2
+        game = Cricket(2, TestingPoller(evs), RENDERER, scoring=True)
+        game.loop()
+        # both players close 15 with their first dart, the second one scores nothing
+        self.assertEqual(game.points, [90, 0])
+
+    def test_scoring_winner_needs_points(self):
+        game = Cricket(2, None, None, scoring=True)
+        game.current_player = 1
+        game.add_marks(0, 3)
+        game.add_marks(0, 3)
+        game.current_player = 0
+        for target in range(len(game.closed_by)):
+            game.add_marks(target, 3)
+        self.assertFalse(game.over())
+        game.add_marks(6, 2)
+        self.assertTrue(game.over())
+        self.assertEqual(game.winner, 0)
+
+    def test_many_players_over(self):
+        evs = []
+        for points in range(5, 10):
+            evs += [
+                Event(EventType.NUMBER, 1),
+                Event(EventType.NUMBER, points),
+                Event(EventType.ACTION, Action.TRIPLE),
+                Event(EventType.ACTION, Action.CONFIRM)
+            ] * 3 * 9
+        game = Cricket(9, TestingPoller(evs), RENDERER)
+        game.loop()
+        self.assertFalse(game.over())
+        self.assertEqual(game.closed_targets, [5] * 9)
+        self.assertEqual(game.closed_by, [9] * 5 + [0, 0])
+
+    def test_glyph_display(self):
+        evs = [
+            Event(EventType.NUMBER, 2),
+            Event(EventType.NUMBER, 0),
+            Event(EventType.ACTION, Action.TRIPLE),
+            Event(EventType.ACTION, Action.CONFIRM),
+            Event(EventType.NUMBER, 2),
+            Event(EventType.NUMBER, 0),
+            Event(EventType.ACTION, Action.CONFIRM),
+            Event(EventType.NUMBER, 1),
+            Event(EventType.NUMBER, 5),
+            Event(EventType.ACTION, Action.DOUBLE),
+            Event(EventType.ACTION, Action.CONFIRM),
+            Event(EventType.NUMBER, 1),
+            Event(EventType.NUMBER, 9),
+            Event(EventType.ACTION, Action.CONFIRM)
+        ]
+        renderer = TestingDisplayController(RENDERER.output_file)
+        renderer.lcd_glyphs = True
+        renderer.mark_cells = " /XO"
+        game = Cricket(2, TestingPoller(evs), renderer, scoring=True)
+        game.loop()
+        # the second player is on turn
+        self.assertEqual(" 1 X    O     20", renderer.lcd_first_line)
+        self.assertEqual(">2     /       0", renderer.lcd_second_line)
+        self.assertEqual(len(renderer.lcd_first_line), 16)
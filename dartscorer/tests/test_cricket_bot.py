@@ -0,0 +1,92 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import Multiplier
+from dartscorer.logic.cricket import Cricket, CLOSED, NUM_TARGETS, TARGETS
+from dartscorer.logic.game_x01 import GameX01
+
+if np is not None:
+    from dartscorer.sim.accuracy import AccuracyModel, OUTCOMES, outcome_index
+    from dartscorer.sim.cricket_bot import ACTIONS, CricketBot
+
+
+class ScriptedInput:
+    def __init__(self, events):
+        self.events = list(reversed(events))
+
+    def next_event(self):
+        return self.events.pop() if self.events else None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestCricketBot(unittest.TestCase):
+    def test_aims_at_the_only_open_target(self):
+        game = Cricket(2, None, None)
+        bot = CricketBot([AccuracyModel.from_skill()] * 2, {0}, time_budget=0.05, seed=1)
+        bot.attach(game)
+        for target in range(NUM_TARGETS):
+            if TARGETS[target] != 25:
+                game.add_marks(target, CLOSED)
+        self.assertEqual(OUTCOMES[bot.choose_aim()].points, 25)
+
+    def test_finishes_with_perfect_aim(self):
+        game = Cricket(2, None, None)
+        bot = CricketBot([AccuracyModel.perfect()] * 2, {0}, time_budget=0.05, seed=1)
+        bot.attach(game)
+        for target in range(NUM_TARGETS):
+            if TARGETS[target] != 20:
+                game.add_marks(target, CLOSED)
+        self.assertEqual(bot.choose_aim(), outcome_index(20, Multiplier.TRIPLE))
+
+    def test_bot_against_bot(self):
+        models = [AccuracyModel.from_skill()] * 2
+        bot = CricketBot(models, {0, 1}, time_budget=0.005, seed=7)
+        game = Cricket(2, bot, None, scoring=True)
+        game.refresh = lambda: None
+        bot.attach(game)
+        game.loop()
+        self.assertIsNotNone(game.winner)
+
+    def test_passes_human_events_through(self):
+        miss = [Event(EventType.ACTION, Action.CONFIRM)] * 3
+        bot = CricketBot([AccuracyModel.perfect()] * 2, {1}, human_ctrl=ScriptedInput(miss), time_budget=0.01)
+        game = Cricket(2, bot, None)
+        bot.attach(game)
+        for _ in range(3):
+            game.step(bot.next_event())
+        self.assertEqual(game.current_player, 1)
+        # the bot plays its own round, with perfect aim it never misses the targets
+        while game.current_player == 1:
+            game.step(bot.next_event())
+        self.assertGreaterEqual(sum(game.players[1].values()), 3)
+        self.assertEqual(sum(game.players[0].values()), 0)
+        # the human has no more events
+        self.assertIsNone(bot.next_event())
+
+    def test_search_in_pool(self):
+        game = Cricket(2, None, None)
+        bot = CricketBot([AccuracyModel.from_skill()] * 2, {0}, time_budget=0.05, processes=2, seed=1)
+        try:
+            bot.attach(game)
+            self.assertIn(bot.choose_aim(), ACTIONS)
+        finally:
+            bot.close()
+
+    def test_rejects_other_games(self):
+        bot = CricketBot([AccuracyModel.perfect()], {0})
+        with self.assertRaises(ValueError):
+            bot.attach(GameX01(1, None, None))
+        # a scoring option does not make a game Cricket
+        game = GameX01(1, None, None)
+        game.config["scoring"] = True
+        with self.assertRaises(ValueError):
+            bot.attach(game)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import time
+import unittest
+from unittest import mock
+
+from dartscorer.display.controller import DisplayController
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.game_x01 import GameX01
+
+
+class FakeLcd:
+    def __init__(self, delay=0.0):
+        self.lines = ["", ""]
+        self.writes = []
+        self.delay = delay
+        self.cleaned = False
+
+    def first_line(self, text):
+        self.write(0, text)
+
+    def second_line(self, text):
+        self.write(1, text)
+
+    def write(self, line, text):
+        time.sleep(self.delay)
+        self.lines[line] = text
+        self.writes.append((line, text))
+
+    def clean_up(self):
+        self.cleaned = True
+
+
+class FakeSegment:
+    def __init__(self):
+        self.text = None
+        self.cleaned = False
+
+    def show_message(self, text):
+        self.text = text
+
+    def clean_up(self):
+        self.cleaned = True
+
+
+class TestDisplayController(unittest.TestCase):
+    def setUp(self):
+        self.lcd = FakeLcd()
+        self.segment = FakeSegment()
+        self.ctrl = DisplayController(self.segment, self.lcd)
+        self.addCleanup(self.ctrl.clean_up)
+
+    def test_writes(self):
+        self.ctrl.lcd_set_first_line("501")
+        self.ctrl.lcd_set_second_line("T20")
+        self.ctrl.segment_set_text("501 501")
+        self.assertTrue(self.ctrl.flush(1))
+        self.assertEqual((self.lcd.lines, self.segment.text), (["501", "T20"], "501 501"))
+
+    def test_warning_does_not_block(self):
+        self.ctrl.lcd_set_second_line("T20")
+        start = time.monotonic()
+        self.ctrl.warning("Overthrow!")
+        self.ctrl.lcd_set_second_line("S5")  # keys pressed while the warning is shown
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.ctrl.flush(1)
+        self.assertEqual(self.lcd.lines[1], "Overthrow!")
+        time.sleep(0.9)
+        self.ctrl.flush(1)
+        # the line set meanwhile comes back, not an empty one
+        self.assertEqual(self.lcd.lines[1], "S5")
+
+    def test_newer_message_wins(self):
+        self.ctrl.lcd_set_second_line("first", 0.1)
+        self.ctrl.lcd_set_second_line("second", 0.4)
+        time.sleep(0.25)
+        self.ctrl.flush(1)
+        self.assertEqual(self.lcd.lines[1], "second")
+        time.sleep(0.3)
+        self.ctrl.flush(1)
+        self.assertEqual(self.lcd.lines[1], "")
+
+    def test_stats(self):
+        self.ctrl.lcd_set_first_line("501")
+        self.ctrl.show_stats("P1 60.0 hi100", "1/0/0 co0/0")
+        self.ctrl.flush(1)
+        self.assertEqual(self.lcd.lines, ["P1 60.0 hi100", "1/0/0 co0/0"])
+
+    def test_coalescing(self):
+        slow = FakeLcd(delay=0.05)
+        ctrl = DisplayController(FakeSegment(), slow)
+        for i in range(20):
+            ctrl.lcd_set_first_line(str(i))
+        ctrl.flush(2)
+        ctrl.clean_up()
+        self.assertEqual(slow.lines[0], "19")
+        self.assertLess(len(slow.writes), 5)
+        self.assertTrue(slow.cleaned)
+
+    def test_clean_up(self):
+        self.ctrl.clean_up()
+        self.assertTrue(self.lcd.cleaned and self.segment.cleaned)
+        self.assertTrue(self.ctrl.flush(0))
+
+    def test_segment_modules(self):
+        # the SPI bus of the default seven-segment display is not there off the Raspberry Pi
+        with mock.patch("dartscorer.display.segment.SpidevBus"):
+            ctrl = DisplayController(lcd_d=FakeLcd(), segment_modules=2)
+        self.addCleanup(ctrl.clean_up)
+        self.assertEqual((ctrl.segment_d.cascaded, ctrl.segment_digits), (2, 16))
+
+
+class TestFrames(unittest.TestCase):
+    def make(self, max_fps=None, delay=0.0):
+        self.lcd = FakeLcd(delay)
+        ctrl = DisplayController(FakeSegment(), self.lcd, max_fps)
+        self.addCleanup(ctrl.clean_up)
+        return ctrl
+
+    def test_game_frames(self):
+        ctrl = self.make()
+        game = GameX01(2, None, ctrl)
+        events = throw_to_events(throw_of(20, Multiplier.TRIPLE))
+        for event in events:
+            game.redraw()
+            game.step(event)
+            ctrl.flush(1)
+        game.redraw()
+        ctrl.flush(1)
+        self.assertEqual(ctrl.frame().first_line, game.round.to_string())
+        # the first frame and one for every keypress
+        self.assertEqual(ctrl.frames_pushed, 1 + len(events))
+        pushed = ctrl.frames_pushed
+        game.redraw()
+        game.redraw()
+        ctrl.flush(1)
+        self.assertEqual((ctrl.frames_pushed, ctrl.frames_suppressed), (pushed, 2))
+
+    def test_frame_is_atomic(self):
+        ctrl = self.make()
+        ctrl.begin_frame()
+        ctrl.lcd_set_first_line("a")
+        time.sleep(0.05)
+        self.assertEqual(self.lcd.writes, [])
+        ctrl.lcd_set_second_line("b")
+        ctrl.end_frame()
+        ctrl.flush(1)
+        self.assertEqual(sorted(self.lcd.writes), [(0, "a"), (1, "b")])
+        self.assertEqual(ctrl.frames_pushed, 1)
+
+    def test_identical_writes_skipped(self):
+        ctrl = self.make()
+        ctrl.lcd_set_first_line("a")
+        ctrl.flush(1)
+        ctrl.lcd_set_first_line("a")
+        ctrl.segment_set_text("")
+        ctrl.flush(1)
+        self.assertEqual((ctrl.frames_pushed, ctrl.frames_suppressed), (1, 2))
+
+    def test_max_fps(self):
+        ctrl = self.make(max_fps=10)
+        start = time.monotonic()
+        for i in range(30):
+            ctrl.lcd_set_first_line(str(i))
+            time.sleep(0.01)
+        ctrl.flush(1)
+        elapsed = time.monotonic() - start
+        self.assertEqual(self.lcd.lines[0], "29")
+        self.assertLessEqual(ctrl.frames_pushed, elapsed * 10 + 2)
+        self.assertEqual(ctrl.frames_pushed + ctrl.frames_coalesced, 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
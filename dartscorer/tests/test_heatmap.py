@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier, ZERO_THROW
+from dartscorer.logic.game_x01 import GameX01
+
+if np is not None:
+    from dartscorer.stats.heatmap import HeatmapRecorder, HeatmapStore, SEGMENT_INDEX
+
+T20 = throw_of(20, Multiplier.TRIPLE)
+D16 = throw_of(16, Multiplier.DOUBLE)
+D25 = throw_of(25, Multiplier.DOUBLE)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestHeatmap(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.directory = tmp_dir.name
+        self.store = HeatmapStore(self.directory)
+
+    def test_recorder(self):
+        game = GameX01(2, None, NullDisplayController(), init_score=1000)
+        undo = Event(EventType.ACTION, Action.UNDO)
+        with game:
+            HeatmapRecorder.start(game, self.store, ["Ann", "Bob"])
+            game.apply(throw_to_events(T20) * 2 + throw_to_events(ZERO_THROW) + throw_to_events(D16) * 3 +
+                       throw_to_events(D25) + [undo, undo, Event(EventType.ACTION, Action.REDO)])
+        store = HeatmapStore(self.directory)
+        self.assertEqual(store.players, ["Ann", "Bob"])
+        self.assertEqual((store.darts("Ann"), store.darts("Bob")), (3, 3))
+        self.assertAlmostEqual(store.treble_20_rate("Ann"), 2 / 3)
+        self.assertEqual(int(store.heatmap("Ann")[0, 0]), 1)
+        self.assertIs(store.favourite_double("Bob"), D16)
+        self.assertIsNone(store.favourite_double("Ann"))
+        self.assertIsNone(store.favourite_double("Cid"))
+        self.assertEqual(store.hit_rate("Cid", 20, Multiplier.TRIPLE), 0.0)
+
+    def test_merged(self):
+        self.store.record("Ann", D25, 3)
+        self.store.record("Bob", D25)
+        self.store.record("Bob", T20)
+        self.store.flush()
+        total = self.store.merged()
+        self.assertEqual(int(total[SEGMENT_INDEX[25], 1]), 4)
+        self.assertEqual(int(total.sum()), 5)
+        self.assertEqual(int(self.store.merged(["Bob", "Cid"]).sum()), 2)
+        self.assertIs(self.store.favourite_double("Ann"), D25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier, ZERO_THROW, RenderIntent
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.logic.history import History
+
+UNDO = Event(EventType.ACTION, Action.UNDO)
+REDO = Event(EventType.ACTION, Action.REDO)
+
+
+def throws(points, multiplier, count=1):
+    return throw_to_events(throw_of(points, multiplier)) * count
+
+
+class TestHistory(unittest.TestCase):
+    def test_undo_across_rounds(self):
+        game = GameX01(2, None, NullDisplayController())
+        game.apply(throws(20, Multiplier.TRIPLE, 3))
+        self.assertEqual((game.players, game.current_player), ([321, 501], 1))
+        game.step(UNDO)
+        self.assertEqual((game.players, game.current_player), ([501, 501], 0))
+        self.assertEqual(game.round.current_position_int(), 2)
+        self.assertEqual(game.round.throws(), (throw_of(20, Multiplier.TRIPLE),) * 2 + (ZERO_THROW,))
+        game.apply(throws(19, Multiplier.TRIPLE))
+        self.assertEqual((game.players, game.current_player), ([324, 501], 1))
+
+    def test_redo(self):
+        game = GameX01(2, None, NullDisplayController())
+        game.apply(throws(20, Multiplier.TRIPLE, 4))
+        state = game.state()
+        game.apply([UNDO] * 4)
+        self.assertEqual(game.state().players, (501, 501))
+        game.apply([REDO] * 4)
+        self.assertEqual(game.state(), state)
+        # a new throw forgets whatever was undone
+        game.apply([UNDO] + throws(1, Multiplier.SINGLE))
+        self.assertEqual(game.step(REDO), [(RenderIntent.WARNING, "Nothing to redo!")])
+
+    def test_nothing_to_undo(self):
+        game = GameX01(1, None, NullDisplayController())
+        game.step(Event(EventType.NUMBER, 5))
+        self.assertEqual(game.step(UNDO), [(RenderIntent.WARNING, "Nothing to undo!")])
+        self.assertEqual(game.round.current_throw(), throw_of(5, Multiplier.SINGLE))
+
+    def test_cricket(self):
+        game = Cricket(3, None, NullDisplayController(), scoring=True)
+        events = []
+        for points in (20, 19, 18, 17, 16, 15):
+            events += throws(points, Multiplier.TRIPLE, 2) + throws(25, Multiplier.SINGLE)
+        states = []
+        for event in events:
+            if event.value is Action.CONFIRM:
+                states.append((game.players_state(), game.current_player))
+            game.step(event)
+        final = game.state()
+        for players, current_player in reversed(states):
+            game.step(UNDO)
+            self.assertEqual((game.players_state(), game.current_player), (players, current_player))
+        self.assertEqual((game.closed_targets, game.closed_by, game.max_points), ([0] * 3, [0] * 7, 0))
+        game.apply([REDO] * len(states))
+        self.assertEqual(game.state(), final)
+        self.assertEqual(game.closed_by, [1, 1, 1, 1, 1, 1, 0])
+
+    def test_undo_in_long_match(self):
+        game = GameX01(2, None, NullDisplayController(), init_score=100000)
+        game.apply(throws(20, Multiplier.SINGLE, 3000))
+        game.apply([UNDO] * 1000)
+        self.assertEqual(game.players, [100000 - 60 * 333] * 2)
+        self.assertEqual(game.round.current_position_int(), 2)
+        self.assertEqual(len(game.history), 2000)
+
+    def test_bounded(self):
+        history = History(limit=3)
+        game = GameX01(1, None, NullDisplayController())
+        game.history = history
+        game.apply(throws(1, Multiplier.SINGLE, 6))
+        self.assertEqual(len(history), 3)
+        game.apply([UNDO] * 5)
+        self.assertEqual((game.players, game.round.current_position_int()), ([498], 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
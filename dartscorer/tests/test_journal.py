@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import GameListener, throw_of, throw_to_events, Multiplier, ZERO_THROW
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.journal import Journal, JournalError, JournalRecorder, new_journal_path
+from dartscorer.tests.test_common import TestingPoller
+
+
+def x01_events():
+    t20 = throw_to_events(throw_of(20, Multiplier.TRIPLE))
+    weak_round = throw_to_events(throw_of(1, Multiplier.SINGLE)) * 2 + throw_to_events(ZERO_THROW)
+    events = []
+    for _ in range(2):
+        events += [Event(EventType.NUMBER, 5), Event(EventType.ACTION, Action.CLEAR)] + t20 * 3 + weak_round
+    events += t20 + throw_to_events(throw_of(17, Multiplier.DOUBLE)) + [Event(EventType.ACTION, Action.UNDO)]
+    events += t20 + throw_to_events(throw_of(7, Multiplier.TRIPLE))
+    return events
+
+
+def cricket_events():
+    events = []
+    for points in (20, 19, 18, 17, 16, 15):
+        events += throw_to_events(throw_of(points, Multiplier.TRIPLE)) * 2 + throw_to_events(ZERO_THROW)
+        events += throw_to_events(throw_of(points, Multiplier.DOUBLE)) * 3
+    return events + throw_to_events(throw_of(25, Multiplier.DOUBLE)) * 2
+
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def record(self, game, events, checkpoint_interval=4):
+        """ Plays the game through Game.loop() and returns the states after every event. """
+        path = new_journal_path(self.tmp_dir.name)
+        game.input_ctrl = TestingPoller(events)
+        states = [game.state()]
+
+        class StateCollector(GameListener):
+            def event_applied(self, game, _event):
+                states.append(game.state())
+
+        with game:
+            JournalRecorder.start(game, path, checkpoint_interval, flush_interval=0.01)
+            game.add_listener(StateCollector())
+            game.loop()
+        return Journal.load(path), states
+
+    def check_replay(self, journal, states):
+        self.assertEqual(len(journal.events), len(states) - 1)
+        for position, state in enumerate(states):
+            self.assertEqual(journal.replay(position).state(), state)
+
+    def test_x01(self):
+        game = GameX01(2, None, NullDisplayController(), init_score=501)
+        journal, states = self.record(game, x01_events())
+        self.assertEqual(journal.config, {"init_score": 501})
+        self.assertTrue(states[-1].over)
+        self.assertGreater(len(journal.checkpoints), 2)
+        self.check_replay(journal, states)
+
+    def test_cricket(self):
+        game = Cricket(2, None, NullDisplayController(), scoring=True)
+        journal, states = self.record(game, cricket_events(), checkpoint_interval=7)
+        self.assertEqual(journal.new_game().config, {"scoring": True})
+        self.assertEqual(journal.replay().winner, 0)
+        self.check_replay(journal, states)
+
+    def test_undo_before_checkpoint(self):
+        game = GameX01(2, None, NullDisplayController())
+        undo = [Event(EventType.ACTION, Action.UNDO)] * 5
+        redo = [Event(EventType.ACTION, Action.REDO)] * 2
+        journal, states = self.record(game, x01_events()[:30] + undo + redo + x01_events()[:10],
+                                      checkpoint_interval=8)
+        self.assertEqual(len(journal.history_events), 7)
+        self.check_replay(journal, states)
+
+    def test_restart(self):
+        game = GameX01(1, None, NullDisplayController())
+        journal, states = self.record(game, throw_to_events(throw_of(20, Multiplier.SINGLE)) +
+                                      [Event(EventType.ACTION, Action.RESTART)])
+        self.assertTrue(journal.replay().over())
+        self.check_replay(journal, states)
+
+    def test_truncated(self):
+        game = Cricket(3, None, NullDisplayController())
+        journal, states = self.record(game, cricket_events()[:40], checkpoint_interval=10)
+        path = os.listdir(self.tmp_dir.name)[0]
+        with open(os.path.join(self.tmp_dir.name, path), "rb") as journal_file:
+            data = journal_file.read()
+        # the game was cut off while writing the final checkpoint
+        truncated = Journal.parse(data[:-3])
+        self.assertEqual(len(truncated.events), 40)
+        self.assertEqual(truncated.replay().state(), states[-1])
+        with self.assertRaises(JournalError):
+            Journal.parse(b"not a journal")
+
+    def test_existing_journal(self):
+        path = new_journal_path(self.tmp_dir.name)
+        open(path, "wb").close()
+        self.assertNotEqual(new_journal_path(self.tmp_dir.name), path)
+        with self.assertRaises(JournalError):
+            JournalRecorder.start(GameX01(1, None, None), path)
+
+
+if __name__ == '__main__':
+    unittest.main()
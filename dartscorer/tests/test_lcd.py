@@ -0,0 +1,166 @@
+import unittest
+
+from dartscorer.display import fake_gpio
+from dartscorer.display.glyphs import GLYPH_CHARS, GLYPHS, MARK_CELLS, GlyphBank, progress_bar, with_fallbacks
+
+fake_gpio.install()
+from dartscorer.display import lcd  # noqa: E402 (needs the fake RPi.GPIO)
+from dartscorer.display.transport import (GpioTransport, LegacyTransport, DATASHEET_TIMING,  # noqa: E402
+                                          NIBBLE_LEVELS, calibrate)
+
+PINS = (lcd.LCD_RS, lcd.LCD_E, (lcd.LCD_D4, lcd.LCD_D5, lcd.LCD_D6, lcd.LCD_D7))
+
+
+class TestLcd(unittest.TestCase):
+    def setUp(self):
+        fake_gpio.reset()
+        self.controller = fake_gpio.watch(*PINS)
+        self.display = lcd.LcdDisplay()
+        self.controller.bytes = 0
+
+    def lines(self):
+        return self.controller.line(0), self.controller.line(1)
+
+    def test_only_changes_sent(self):
+        # the cursor is at the start after the initialisation, it is only moved past the space
+        self.display.first_line("501 501")
+        self.assertEqual(self.controller.bytes, 3 + 1 + 3)
+        self.display.first_line("501 441")
+        # a cursor move and two characters ("44")
+        self.assertEqual(self.controller.bytes, 7 + 3)
+        self.display.first_line("501 441")
+        self.assertEqual(self.controller.bytes, 10)
+        self.display.second_line("T20")
+        self.display.first_line("1")
+        self.assertEqual(self.lines(), ("1".ljust(16), "T20".ljust(16)))
+
+    def test_same_as_full_rewrite(self):
+        frames = [("20 19 18", "3  1  2"), ("20 19", "3  1  2  1"), ("", "Overthrow!"), ("x" * 20, "end")]
+        for first, second in frames:
+            self.display.first_line(first)
+            self.display.second_line(second)
+            self.assertEqual(self.lines(), (first.ljust(16)[:16], second.ljust(16)[:16]))
+
+    def test_invalidate(self):
+        self.display.first_line("abc")
+        sent = self.controller.bytes
+        self.display.invalidate()
+        self.display.first_line("abc")
+        self.assertEqual(self.controller.bytes - sent, 1 + 16)
+        self.display.clean_up()
+        self.assertEqual(self.lines(), (" " * 16, " " * 16))
+
+
+class TestTransport(unittest.TestCase):
+    def play(self, transport_class):
+        fake_gpio.reset()
+        controller = fake_gpio.watch(*PINS)
+        controller.record = True
+        display = lcd.LcdDisplay(transport_class(fake_gpio, *PINS))
+        calls = fake_gpio.output_calls
+        display.first_line("20 19 18 17")
+        display.second_line("Overthrow!")
+        display.first_line("T20 hit")
+        display.clean_up()
+        return controller.received, fake_gpio.output_calls - calls
+
+    def test_same_as_legacy(self):
+        fast, fast_calls = self.play(GpioTransport)
+        legacy, legacy_calls = self.play(LegacyTransport)
+        self.assertEqual(fast, legacy)
+        self.assertIn((True, ord("O")), fast)
+        self.assertLess(fast_calls * 2, legacy_calls)
+
+    def test_tables(self):
+        self.assertEqual(NIBBLE_LEVELS[0b1010], (0, 1, 0, 1))
+        self.assertEqual(len(NIBBLE_LEVELS), 16)
+
+    def test_calibration(self):
+        fake_gpio.reset()
+        transport = GpioTransport(fake_gpio, *PINS)
+        transport.setup()
+        self.assertLessEqual(transport.timing.pulse, DATASHEET_TIMING.pulse)
+        self.assertEqual(transport.timing.execute, DATASHEET_TIMING.execute)
+        self.assertGreater(calibrate(fake_gpio, lcd.LCD_RS, samples=10), 0)
+        self.assertEqual(fake_gpio.levels[lcd.LCD_RS], 0)
+
+
+class TestGlyphs(unittest.TestCase):
+    def setUp(self):
+        fake_gpio.reset()
+        self.controller = fake_gpio.watch(*PINS)
+        self.display = lcd.LcdDisplay()
+        self.controller.bytes = 0
+
+    def test_bank(self):
+        bank = GlyphBank(slots=2)
+        self.assertEqual(bank.allocate(["mark1", "mark2"]), ({"mark1": 0, "mark2": 1}, [(0, "mark1"), (1, "mark2")]))
+        self.assertEqual(bank.allocate(["mark2"]), ({"mark2": 1}, []))
+        # mark1 was used the longest time ago
+        self.assertEqual(bank.allocate(["closed"]), ({"closed": 0}, [(0, "closed")]))
+        # nothing can be replaced
+        self.assertEqual(bank.allocate(["bar1"], pinned=["closed", "mark2"]), ({}, []))
+        self.assertEqual(bank.uploads, 3)
+
+    def test_bank_cleared(self):
+        bank = GlyphBank(slots=2)
+        bank.allocate(["mark1", "mark2"])
+        bank.allocate(["mark1"])
+        bank.clear()
+        # the slots are filled in order again, the use before clear() does not count
+        self.assertEqual(bank.allocate(["closed"]), ({"closed": 0}, [(0, "closed")]))
+        self.assertEqual(bank.resident, {"closed": 0})
+
+    def test_uploaded_once(self):
+        marks = "1 " + "".join(MARK_CELLS[marks] for marks in (0, 1, 2, 3, 3, 1, 0))
+        self.display.first_line(marks)
+        cells = self.controller.cells(0)
+        self.assertEqual(cells[:3], ["1", " ", " "])
+        self.assertEqual(cells[3:6], [GLYPHS["mark1"], GLYPHS["mark2"], GLYPHS["closed"]])
+        # three glyphs of eight rows, each preceded by an address, then "1" and the five marks
+        # both preceded by a cursor move
+        self.assertEqual(self.controller.bytes, 3 * 9 + 2 + 1 + 5)
+        sent = self.controller.bytes
+        self.display.second_line("2 " + MARK_CELLS[3] * 7)
+        # the glyph is resident, only "2" and the marks are sent (each after a cursor move)
+        self.assertEqual(self.controller.bytes - sent, 2 + 1 + 7)
+        self.assertEqual(self.display.glyph_bank.uploads, 3)
+        self.assertEqual(self.controller.cells(1)[2:9], [GLYPHS["closed"]] * 7)
+
+    def test_visible_glyphs_kept(self):
+        bars = "".join(GLYPH_CHARS["bar{}".format(width)] for width in range(1, 6))
+        self.display.first_line(bars)
+        self.display.second_line(MARK_CELLS[1] + MARK_CELLS[2] + MARK_CELLS[3] + "ab")
+        self.assertEqual(self.controller.cells(0)[:5], [GLYPHS["bar{}".format(width)] for width in range(1, 6)])
+        # the bank is full, the bars are still shown
+        self.display.second_line(MARK_CELLS[1] + GLYPH_CHARS["bar1"] + progress_bar(0.5, 2))
+        self.assertEqual(self.controller.cells(0)[:5], [GLYPHS["bar{}".format(width)] for width in range(1, 6)])
+        self.display.first_line("")
+        self.display.second_line(bars + MARK_CELLS[1] + MARK_CELLS[2] + MARK_CELLS[3] + "x")
+        self.assertEqual(self.controller.cells(1)[5:9], [GLYPHS["mark1"], GLYPHS["mark2"], GLYPHS["closed"], "x"])
+
+    def test_fallback(self):
+        self.display.glyph_bank = GlyphBank(slots=4)
+        line = "".join(GLYPH_CHARS.values())
+        self.display.first_line(GLYPH_CHARS["bar5"])
+        self.display.second_line(line)
+        # bar5 stays on the first line, only three of the others have room
+        self.assertEqual(self.controller.cells(1)[:4], [GLYPHS["mark1"], GLYPHS["mark2"], GLYPHS["closed"], "|"])
+        self.assertEqual(self.controller.cells(1)[7], GLYPHS["bar5"])
+        self.assertEqual(with_fallbacks(line), "/XO||||#")
+
+    def test_invalidate_reuploads(self):
+        self.display.first_line(MARK_CELLS[3])
+        self.display.invalidate()
+        self.display.first_line(MARK_CELLS[3])
+        self.assertEqual(self.display.glyph_bank.uploads, 2)
+        self.assertEqual(self.controller.cells(0)[0], GLYPHS["closed"])
+
+    def test_progress_bar(self):
+        self.assertEqual(progress_bar(0.5, 2), GLYPH_CHARS["bar5"] + " ")
+        self.assertEqual(progress_bar(0.3, 2), GLYPH_CHARS["bar3"] + " ")
+        self.assertEqual(progress_bar(2, 1), GLYPH_CHARS["bar5"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+import unittest
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier, ZERO_THROW
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.match_store import Leg, MatchRecorder, MatchStore
+from dartscorer.persistence.snapshot import Snapshot
+
+T20 = throw_of(20, Multiplier.TRIPLE)
+
+
+class TestMatchStore(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "matches.sqlite")
+        self.store = MatchStore(self.path)
+        self.addCleanup(self.store.close)
+
+    def play(self, game, events, names=None):
+        with game:
+            MatchRecorder.start(game, self.store, names)
+            game.apply(events)
+        self.store.flush()
+
+    def test_x01_leg(self):
+        game = GameX01(2, None, NullDisplayController(), init_score=120)
+        undo = [Event(EventType.NUMBER, 1), Event(EventType.ACTION, Action.CONFIRM), Event(EventType.ACTION, Action.UNDO)]
+        self.play(game, undo + throw_to_events(throw_of(20, Multiplier.SINGLE)) * 3 +
+                  throw_to_events(throw_of(19, Multiplier.SINGLE)) * 3 + throw_to_events(T20), ["Ann", "Bob"])
+        self.assertEqual(self.store.count_legs(), 1)
+        (leg_id, _, game_name, winner), = self.store.legs_between(0, time.time() + 1)
+        self.assertEqual((game_name, winner), ("X01", 0))
+        throws = self.store.leg_throws(leg_id)
+        self.assertEqual(len(throws), 7)
+        self.assertEqual(throws[3], (1, 0, throw_of(19, Multiplier.SINGLE)))
+        self.assertEqual(throws[-1], (0, 1, T20))
+        self.assertEqual(self.store.player_throws("Ann"), [throw_of(20, Multiplier.SINGLE)] * 3 + [T20])
+        self.assertEqual([tuple(row[2:]) for row in self.store.player_legs("Bob")], [("X01", 1, 0)])
+
+    def test_cricket_leg(self):
+        game = Cricket(1, None, NullDisplayController())
+        events = []
+        for points in (20, 19, 18, 17, 16, 15):
+            events += throw_to_events(throw_of(points, Multiplier.TRIPLE))
+        events += throw_to_events(ZERO_THROW) + throw_to_events(throw_of(25, Multiplier.DOUBLE)) * 2
+        self.play(game, events)
+        self.assertEqual(self.store.player_legs("player 1")[0][2:], ("Cricket", 0, 1))
+        self.assertEqual(len(self.store.player_throws("player 1")), 9)
+
+    def test_unfinished_not_saved(self):
+        self.play(GameX01(1, None, NullDisplayController()), throw_to_events(T20))
+        self.play(GameX01(1, None, NullDisplayController()), [Event(EventType.ACTION, Action.RESTART)])
+        self.assertEqual(self.store.count_legs(), 0)
+
+    def test_resumed_not_saved(self):
+        game = GameX01(1, None, NullDisplayController(), init_score=80)
+        game.apply(throw_to_events(throw_of(20, Multiplier.SINGLE)))
+        resumed = Snapshot.decode(Snapshot.of(game).encode()).new_game(None, NullDisplayController())
+        self.assertTrue(resumed.resumed)
+        # the leg is finished, but the first throw is not in the history
+        self.play(resumed, throw_to_events(T20))
+        self.assertTrue(resumed.over())
+        self.assertEqual(self.store.count_legs(), 0)
+        self.assertFalse(game.resumed)
+
+    def test_retention(self):
+        now = time.time()
+        for days in (1, 10, 100, 1000):
+            self.store.save_leg(Leg("X01", {"init_score": 501}, ["Ann"], now - days * 86400, now - days * 86400, 0,
+                                    [(0, 0, T20)] * 9))
+        self.store.flush()
+        self.assertEqual(len(self.store.player_throws("Ann")), 36)
+        self.assertEqual(len(self.store.player_throws("Ann", since=now - 50 * 86400)), 18)
+        self.store.compact(retention_days=50)
+        self.store.flush()
+        self.assertEqual(self.store.count_legs(), 2)
+        self.assertEqual(len(self.store.player_throws("Ann")), 18)
+        self.store.close()
+        # legs over the default retention are deleted when the store is opened again
+        self.store = MatchStore(self.path, retention_days=5)
+        self.store.flush()
+        self.assertEqual(self.store.count_legs(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
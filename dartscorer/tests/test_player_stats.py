@@ -0,0 +1,83 @@
+import unittest
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import RenderIntent, throw_of, throw_to_events, Multiplier, ZERO_THROW
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.stats.player_stats import PlayerStats, StatsTracker, merge_all
+
+T20 = throw_of(20, Multiplier.TRIPLE)
+S20 = throw_of(20, Multiplier.SINGLE)
+UNDO = Event(EventType.ACTION, Action.UNDO)
+REDO = Event(EventType.ACTION, Action.REDO)
+
+
+def stats_intents(intents):
+    return [payload for intent, payload in intents if intent is RenderIntent.STATS]
+
+
+class TestPlayerStats(unittest.TestCase):
+    def test_x01(self):
+        game = GameX01(2, None, NullDisplayController(), init_score=301)
+        session = {}
+        miss = throw_to_events(ZERO_THROW) * 3
+        with game:
+            tracker = StatsTracker.start(game, ["Ann", "Bob"], session)
+            _, intents = game.apply(throw_to_events(T20) * 3 + miss + throw_to_events(T20) * 2 + throw_to_events(S20))
+            self.assertEqual(stats_intents(intents), [("P1 180.0 hi180", "0/0/1 co0/0"),
+                                                      ("P2 0.0 hi0", "0/0/0 co0/0"),
+                                                      ("P1 90.0 hi180", "0/0/1 co0/1")])
+            ann = tracker.leg[0]
+            self.assertEqual((ann.darts, ann.points, ann.rounds, ann.highest_round), (6, 180, 2, 180))
+            game.apply(miss + throw_to_events(T20) + throw_to_events(throw_of(1, Multiplier.SINGLE)) +
+                       throw_to_events(T20))
+            self.assertTrue(game.over())
+        ann = session["Ann"]
+        self.assertEqual((ann.darts, ann.points, ann.rounds, ann.highest_round), (9, 301, 3, 180))
+        self.assertEqual((ann.one_eighties, ann.ton_forties, ann.tons), (1, 0, 1))
+        self.assertEqual((ann.checkout_attempts, ann.checkout_hits), (2, 1))
+        self.assertEqual((session["Bob"].darts, session["Bob"].rounds), (6, 2))
+
+    def test_undo_redo(self):
+        game = GameX01(1, None, NullDisplayController())
+        tracker = StatsTracker.start(game)
+        game.apply(throw_to_events(T20) * 3)
+        after = tracker.leg[0].copy()
+        game.apply([UNDO, UNDO])
+        self.assertEqual(tracker.leg[0].to_dict(), dict(PlayerStats().to_dict(), darts=1))
+        game.apply([REDO, REDO])
+        self.assertEqual(tracker.leg[0], after)
+        game.apply([UNDO] + throw_to_events(S20))
+        self.assertEqual((tracker.leg[0].points, tracker.leg[0].highest_round, tracker.leg[0].one_eighties),
+                         (140, 140, 0))
+
+    def test_cricket(self):
+        game = Cricket(1, None, NullDisplayController())
+        tracker = StatsTracker.start(game, show=False)
+        _, intents = game.apply(throw_to_events(T20) + throw_to_events(throw_of(25, Multiplier.DOUBLE)) +
+                                throw_to_events(throw_of(3, Multiplier.TRIPLE)) + throw_to_events(ZERO_THROW))
+        self.assertEqual(stats_intents(intents), [])
+        stats = tracker.leg[0]
+        self.assertEqual((stats.marks, stats.cricket_rounds, stats.darts), (5, 1, 0))
+        self.assertAlmostEqual(stats.marks_per_round(), 5)
+        self.assertEqual(stats.cricket_lines(0), ("P1 mpr 5.00", "marks 5 r1"))
+
+    def test_merge(self):
+        first = PlayerStats(darts=3, points=100, rounds=1, highest_round=100, tons=1)
+        second = PlayerStats(darts=6, points=80, rounds=2, highest_round=60, marks=4, cricket_rounds=2)
+        total = first + second
+        self.assertEqual((total.darts, total.points, total.highest_round, total.tons), (9, 180, 100, 1))
+        self.assertAlmostEqual(total.three_dart_average(), 60)
+        self.assertEqual(first.darts, 3)
+        self.assertEqual(PlayerStats.from_dict(total.to_dict()), total)
+        merged = merge_all([{"Ann": first}, {"Ann": second, "Bob": second}])
+        self.assertEqual(merged["Ann"], total)
+        self.assertEqual(merged["Bob"], second)
+        self.assertIsNot(merged["Bob"], second)
+        with self.assertRaises(TypeError):
+            PlayerStats(average=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.match_store import Leg, MatchStore
+
+if np is not None:
+    from dartscorer.stats import rating
+    from dartscorer.stats.rating import RatingBook, RatingRecorder, batch_ratings, handicap_scores, leg_games
+
+DAY = 86400.0
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestRating(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.directory = tmp_dir.name
+
+    def test_single_game(self):
+        # two new players (1500, RD 350), worked out by hand from Glickman's formulas
+        r, rd, last = batch_ratings([0], [0], [1], 3)
+        self.assertAlmostEqual(r[0], 1662.2, places=1)
+        self.assertAlmostEqual(r[0] - 1500, 1500 - r[1])
+        self.assertAlmostEqual(rd[0], 290.2, places=1)
+        self.assertEqual(list(last), [0, 0, -1])
+        self.assertEqual((r[2], rd[2]), (1500, 350))
+
+    def test_incremental_matches_batch(self):
+        rng = np.random.default_rng(3)
+        book = RatingBook(os.path.join(self.directory, "ratings.json"))
+        names = ["p{}".format(i) for i in range(5)]
+        periods, winners, losers = [], [], []
+        # a league night is several legs in one period
+        for day in range(0, 200, 2):
+            for leg in range(int(rng.integers(1, 5))):
+                seats = rng.choice(5, size=3, replace=False)
+                winner = int(rng.integers(3))
+                book.rate_leg([names[seat] for seat in seats], winner, day * DAY + 100 + leg)
+                for seat in range(3):
+                    if seat != winner:
+                        periods.append(day)
+                        winners.append(seats[winner])
+                        losers.append(seats[seat])
+        r, rd, _ = batch_ratings(periods, winners, losers, 5)
+        for i, name in enumerate(names):
+            self.assertAlmostEqual(book.rating(name), r[i])
+            self.assertAlmostEqual(book.rd(name), rd[i])
+        book.save()
+        self.assertEqual(RatingBook(book.path).players, book.players)
+
+    def test_same_day_legs(self):
+        book = RatingBook(os.path.join(self.directory, "ratings.json"))
+        book.rate_leg(["Ann", "Bob"], 0, DAY + 100)
+        book.rate_leg(["Ann", "Bob"], 0, DAY + 200)
+        r, rd, _ = batch_ratings([1, 1], [0, 0], [1, 1], 2)
+        self.assertAlmostEqual(book.rating("Ann"), r[0])
+        self.assertAlmostEqual(book.rd("Ann"), rd[0])
+        self.assertAlmostEqual(book.rating("Bob"), r[1])
+        # the next day starts from the ratings of the end of this one
+        book.rate_leg(["Bob", "Ann"], 0, 2 * DAY)
+        r, rd, _ = batch_ratings([1, 1, 2], [0, 0, 1], [1, 1, 0], 2)
+        self.assertAlmostEqual(book.rating("Bob"), r[1])
+        self.assertAlmostEqual(book.rd("Bob"), rd[1])
+
+    def test_inactivity(self):
+        _, rd_active, _ = batch_ratings([0, 1, 2], [0, 0, 0], [1, 1, 1], 2)
+        _, rd_away, _ = batch_ratings([0, 1, 500], [0, 0, 0], [1, 1, 1], 2)
+        self.assertLess(rd_active[0], rd_away[0])
+        self.assertGreaterEqual(batch_ratings([0] * 500, [0] * 500, [1] * 500, 2)[1].min(), rating.MIN_RD)
+
+    def test_store(self):
+        store = MatchStore(os.path.join(self.directory, "matches.sqlite"), retention_days=None)
+        self.addCleanup(store.close)
+        t20 = throw_of(20, Multiplier.TRIPLE)
+        store.save_leg(Leg("X01", {}, ["Ann", "Bob", "Cid"], DAY, DAY, 1, [(1, 0, t20)]))
+        store.save_leg(Leg("X01", {}, ["Bob", "Ann"], 5 * DAY, 5 * DAY, 1, [(1, 0, t20)]))
+        store.save_leg(Leg("X01", {}, ["Bob", "Ann"], 6 * DAY, 6 * DAY, None, []))
+        store.flush()
+        names, periods, winners, losers = leg_games(store.leg_results())
+        self.assertEqual(sorted(names), ["Ann", "Bob", "Cid"])
+        games = sorted((int(p), names[w], names[l]) for p, w, l in zip(periods, winners, losers))
+        self.assertEqual(games, [(1, "Bob", "Ann"), (1, "Bob", "Cid"), (5, "Ann", "Bob")])
+        book = RatingBook(os.path.join(self.directory, "ratings.json"))
+        book.recompute(store)
+        self.assertGreater(book.rating("Ann"), book.rating("Cid"))
+        self.assertEqual(book.rating("Dan"), rating.INITIAL_RATING)
+
+    def test_handicap(self):
+        self.assertEqual(handicap_scores([1500, 1500]), [501, 501])
+        self.assertEqual(handicap_scores([1700, 1500, 200], 301), [301, 251, 301 - rating.MAX_HANDICAP])
+        game = GameX01(2, None, NullDisplayController(), start_scores=handicap_scores([1600, 1500]))
+        self.assertEqual(game.players_state(), (501, 476))
+        with self.assertRaises(ValueError):
+            GameX01(2, None, None, start_scores=[501])
+
+    def test_recorder(self):
+        book = RatingBook(os.path.join(self.directory, "ratings.json"))
+        game = GameX01(2, None, NullDisplayController(), init_score=60)
+        with game:
+            RatingRecorder.start(game, book, ["Ann", "Bob"])
+            game.apply(throw_to_events(throw_of(20, Multiplier.TRIPLE)))
+        self.assertGreater(RatingBook(book.path).rating("Ann"), rating.INITIAL_RATING)
+
+    def test_recorder_needs_names(self):
+        book = RatingBook(os.path.join(self.directory, "ratings.json"))
+        game = GameX01(2, None, NullDisplayController())
+        with self.assertRaises(ValueError):
+            RatingRecorder(book, None)
+        with self.assertRaises(ValueError):
+            RatingRecorder.start(game, book, ["Ann"])
+        self.assertEqual(book.players, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
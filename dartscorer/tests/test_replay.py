@@ -0,0 +1,99 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.codec import encode_state
+from dartscorer.persistence.journal import JournalRecorder, checkpoint_record, encode_event, encode_header
+from dartscorer.persistence.replay import find_journals, main, replay_all, replay_journal
+from dartscorer.tests.test_common import TestingPoller
+
+
+def record(path, game, events):
+    game.input_ctrl = TestingPoller(events)
+    with game:
+        JournalRecorder.start(game, path, checkpoint_interval=5, flush_interval=0.01)
+        game.loop()
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.dir = tmp_dir.name
+        os.mkdir(os.path.join(self.dir, "league"))
+        for i in range(6):
+            record(os.path.join(self.dir, "league", "x01-{}.dsj".format(i)), GameX01(2, None, NullDisplayController()),
+                   throw_to_events(throw_of(20, Multiplier.TRIPLE)) * (i + 3))
+        record(os.path.join(self.dir, "cricket.dsj"), Cricket(1, None, NullDisplayController()),
+               throw_to_events(throw_of(20, Multiplier.TRIPLE)) * 2)
+        with open(os.path.join(self.dir, "notes.txt"), "w") as notes:
+            notes.write("not a journal")
+
+    def forge(self, name, recorded_score):
+        """ A journal whose final checkpoint does not match the events. """
+        game = GameX01(1, None, None, init_score=101)
+        events = throw_to_events(throw_of(20, Multiplier.TRIPLE)) * 3
+        data = encode_header(game) + checkpoint_record(game) + bytes(encode_event(event) for event in events)
+        game.apply(events)
+        payload = encode_state(game.state()._replace(players=(recorded_score,)))
+        data += bytes([0xC0, len(payload), 0]) + payload
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as journal_file:
+            journal_file.write(data)
+        return path
+
+    def test_find_journals(self):
+        paths = list(find_journals(self.dir))
+        self.assertEqual(len(paths), 7)
+        self.assertTrue(paths[0].endswith("cricket.dsj"))
+
+    def test_replay(self):
+        result = replay_journal(os.path.join(self.dir, "league", "x01-2.dsj"))
+        self.assertEqual(result["violations"], [])
+        self.assertEqual(result["final"], (321, 501))
+        self.assertEqual(result["events"], 5 * 4)
+        self.assertFalse(result["over"])
+        result = replay_journal(os.path.join(self.dir, "cricket.dsj"))
+        self.assertEqual((result["game"], result["config"], result["current_player"]), ("Cricket", {"scoring": False}, 0))
+
+    def test_overthrow_is_no_violation(self):
+        result = replay_journal(self.forge("overthrow.dsj", 101))
+        self.assertEqual(result["violations"], [])
+        self.assertEqual(result["warnings"], 1)
+
+    def test_divergence(self):
+        result = replay_journal(self.forge("diverged.dsj", -79))
+        self.assertEqual(result["violations"], ["state after event 12 differs from the recorded one"])
+
+    def test_broken_journal(self):
+        path = os.path.join(self.dir, "broken.dsj")
+        with open(path, "wb") as journal_file:
+            journal_file.write(b"garbage")
+        self.assertIn("error", replay_journal(path))
+
+    def test_pool_matches_serial(self):
+        serial = list(replay_all(find_journals(self.dir), processes=1, chunk_size=2))
+        parallel = list(replay_all(find_journals(self.dir), processes=2, chunk_size=1))
+        self.assertEqual(len(serial), 7)
+        key = lambda result: result["path"]
+        self.assertEqual(sorted(serial, key=key), sorted(parallel, key=key))
+
+    def test_main(self):
+        out = io.StringIO()
+        with redirect_stderr(io.StringIO()):
+            self.assertEqual(main([self.dir, "-j", "1"], out), 0)
+            self.forge("diverged.dsj", 0)
+            self.assertEqual(main([self.dir, "-j", "2", "--chunk-size", "3"], out), 1)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(lines), 7 + 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
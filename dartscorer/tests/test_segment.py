@@ -0,0 +1,63 @@
+import unittest
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.display.segment import MAX7219, DECIMAL_POINT, GLYPHS, REG_DIGIT_0, text_to_digits
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.game_x01 import GameX01
+
+
+class FakeSpiBus:
+    def __init__(self):
+        self.calls = []
+
+    def write_rows(self, rows):
+        self.calls.append(list(rows))
+
+
+class WideDisplayController(NullDisplayController):
+    segment_digits = 16
+
+    def __init__(self):
+        self.segment = ""
+
+    def segment_set_text(self, text):
+        self.segment = text
+
+
+class TestSegment(unittest.TestCase):
+    def test_digits(self):
+        self.assertEqual(text_to_digits("501", 4), bytes((GLYPHS[ord("5")], GLYPHS[ord("0")], GLYPHS[ord("1")], 0)))
+        self.assertEqual(text_to_digits("1.5", 2), bytes((GLYPHS[ord("1")] | DECIMAL_POINT, GLYPHS[ord("5")])))
+        self.assertEqual(text_to_digits(".", 1), bytes((DECIMAL_POINT,)))
+        self.assertEqual(text_to_digits("123456789", 8)[-1], GLYPHS[ord("8")])
+        self.assertEqual(GLYPHS[ord("B")], GLYPHS[ord("b")])
+        self.assertEqual(GLYPHS[ord("#")], 0)
+
+    def test_chain_frame(self):
+        bus = FakeSpiBus()
+        display = MAX7219(cascaded=2, bus=bus)
+        bus.calls.clear()
+        display.show_message("1       2")
+        display.show_message("1       2")
+        self.assertEqual(len(bus.calls), 1)
+        rows = bus.calls[0]
+        self.assertEqual(len(rows), 8)
+        self.assertTrue(all(len(row) == 4 for row in rows))
+        # the leftmost digit of the leftmost (last) module is its digit register 8, sent first
+        self.assertEqual(rows[7][:2], bytes((REG_DIGIT_0 + 7, GLYPHS[ord("1")])))
+        self.assertEqual(rows[7][2:], bytes((REG_DIGIT_0 + 7, GLYPHS[ord("2")])))
+        self.assertEqual(rows[0], bytes((REG_DIGIT_0, 0, REG_DIGIT_0, 0)))
+        self.assertIs(display.frame("1       2"), display.frame("1       2"))
+
+    def test_x01_all_players(self):
+        ctrl = WideDisplayController()
+        game = GameX01(4, None, ctrl)
+        game.apply(throw_to_events(throw_of(20, Multiplier.TRIPLE)) * 4)
+        game.refresh()
+        self.assertEqual(ctrl.segment, "321 441 501 501")
+        narrow = GameX01(4, None, NullDisplayController())
+        self.assertEqual(narrow._GameX01__points_to_string(), "501 501")
+
+
+if __name__ == '__main__':
+    unittest.main()
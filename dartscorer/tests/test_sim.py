@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from dartscorer.logic.common import throw_to_events, Multiplier
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+
+if np is not None:
+    from dartscorer.sim.accuracy import AccuracyModel, OUTCOMES, NUM_OUTCOMES, outcome_index
+    from dartscorer.sim.cricket import simulate_cricket
+    from dartscorer.sim.pool import simulate_sharded
+    from dartscorer.sim.solver import solve_x01, load_or_solve_x01, cache_path
+    from dartscorer.sim.x01 import simulate_x01, greedy_x01_policy
+
+
+def leg_events(throws):
+    """ Keypresses of a leg recorded by a simulation with trace=True. """
+    events = []
+    for game_round in throws:
+        for outcome in game_round:
+            if outcome >= 0:
+                events += throw_to_events(OUTCOMES[outcome])
+    return events
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestAccuracyModel(unittest.TestCase):
+    def test_rows_are_distributions(self):
+        model = AccuracyModel.from_skill()
+        self.assertEqual(model.matrix.shape, (NUM_OUTCOMES, NUM_OUTCOMES))
+        self.assertTrue(np.allclose(model.matrix.sum(axis=1), 1.0))
+
+    def test_perfect_model(self):
+        aims = np.arange(NUM_OUTCOMES)
+        outcomes = AccuracyModel.perfect().sample(aims, np.random.default_rng(0))
+        self.assertTrue((outcomes == aims).all())
+
+    def test_invalid_matrix(self):
+        with self.assertRaises(ValueError):
+            AccuracyModel(np.zeros((NUM_OUTCOMES, NUM_OUTCOMES)))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSimulation(unittest.TestCase):
+    def test_greedy_policy_finishes(self):
+        policy = greedy_x01_policy()
+        self.assertEqual(policy[501], outcome_index(20, Multiplier.TRIPLE))
+        self.assertEqual(policy[50], outcome_index(25, Multiplier.DOUBLE))
+        self.assertEqual(policy[59], outcome_index(19, Multiplier.SINGLE))
+
+    def test_perfect_nine_darter(self):
+        model = AccuracyModel.perfect()
+        results = simulate_x01([model, model], 10)
+        self.assertTrue((results.winners == 0).all())
+        self.assertTrue((results.rounds == 5).all())
+
+    def test_x01_matches_game_rules(self):
+        models = [AccuracyModel.from_skill(), AccuracyModel.from_skill(0.6, 0.1, 0.1, 0.05, 0.2)]
+        results = simulate_x01(models, 200, init_score=301, rng=np.random.default_rng(1), trace=True)
+        for winner, throws in zip(results.winners, results.throws):
+            game = GameX01(2, None, None, init_score=301)
+            events = iter(leg_events(throws))
+            state, _ = game.apply(events)
+            self.assertTrue(state.over)
+            self.assertEqual(state.players[winner], 0)
+            self.assertEqual(list(events), [])
+
+    def test_cricket_matches_game_rules(self):
+        models = [AccuracyModel.from_skill()] * 3
+        results = simulate_cricket(models, 200, rng=np.random.default_rng(2), trace=True)
+        for winner, throws in zip(results.winners, results.throws):
+            game = Cricket(3, None, None)
+            events = iter(leg_events(throws))
+            state, _ = game.apply(events)
+            self.assertTrue(state.over)
+            self.assertTrue(all(marks == 3 for marks in state.players[winner]))
+            self.assertEqual(list(events), [])
+
+    def test_scoring_cricket_matches_game_rules(self):
+        models = [AccuracyModel.from_skill(0.6, 0.2, 0.15, 0.1, 0.2)] * 2
+        results = simulate_cricket(models, 200, rng=np.random.default_rng(3), trace=True, scoring=True)
+        self.assertGreater((results.winners >= 0).mean(), 0.9)
+        for winner, throws in zip(results.winners, results.throws):
+            if winner < 0:
+                continue
+            game = Cricket(2, None, None, scoring=True)
+            events = iter(leg_events(throws))
+            state, _ = game.apply(events)
+            self.assertTrue(state.over)
+            self.assertEqual(game.winner, winner)
+            self.assertEqual(list(events), [])
+
+    def test_scoring_cricket_start(self):
+        models = [AccuracyModel.from_skill()] * 2
+        marks = [[3] * 7, [3] * 6 + [0]]
+        # having closed everything is not enough without the points
+        results = simulate_cricket(models, 500, rng=np.random.default_rng(4), start_marks=marks)
+        self.assertTrue((results.winners == 0).all())
+        results = simulate_cricket(models, 500, rng=np.random.default_rng(4), start_marks=marks, scoring=True,
+                                   start_points=[0, 200])
+        self.assertGreater((results.winners == 1).mean(), 0.5)
+
+    def test_sharded(self):
+        model = AccuracyModel.from_skill()
+        results = simulate_sharded(simulate_x01, 101, processes=2, shards=3, seed=5, models=[model])
+        self.assertEqual(results.winners.shape, (101,))
+        self.assertTrue((results.winners == 0).all())
+        again = simulate_sharded(simulate_x01, 101, processes=2, shards=3, seed=5, models=[model])
+        self.assertTrue((results.rounds == again.rounds).all())
+
+
+def darts_to_finish(results):
+    """ Darts of single player legs, rounds ended by an overthrow count as three darts. """
+    last_round = results.throws[np.arange(len(results.rounds)), results.rounds - 1]
+    return 3 * (results.rounds - 1) + (last_round >= 0).sum(axis=1)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestSolver(unittest.TestCase):
+    def test_perfect_player(self):
+        policy = solve_x01(AccuracyModel.perfect())
+        self.assertAlmostEqual(policy.expected_darts[501], 9.0)
+        self.assertAlmostEqual(policy.expected_darts[180], 3.0)
+        self.assertAlmostEqual(policy.expected_darts[179], 4.0)
+        self.assertEqual(policy.aim(180, 180, 3).total_points(), 60)
+
+    def test_expected_darts_match_simulation(self):
+        model = AccuracyModel.from_skill()
+        policy = solve_x01(model, 101)
+        results = simulate_x01([model], 20000, init_score=101, policies=[policy],
+                               rng=np.random.default_rng(3), trace=True)
+        darts = darts_to_finish(results)
+        self.assertAlmostEqual(darts.mean(), policy.expected_darts[101], delta=4 * darts.std() / np.sqrt(len(darts)))
+
+    def test_better_than_greedy(self):
+        model = AccuracyModel.from_skill()
+        policy = solve_x01(model, 301)
+        rng = np.random.default_rng(4)
+        optimal = simulate_x01([model], 20000, init_score=301, policies=[policy], rng=rng)
+        greedy = simulate_x01([model], 20000, init_score=301, rng=rng)
+        self.assertLess(optimal.rounds.mean(), greedy.rounds.mean())
+
+    def test_cache(self):
+        model = AccuracyModel.from_skill()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            policy = load_or_solve_x01(model, 121, cache_dir)
+            self.assertTrue(os.path.exists(cache_path(model, cache_dir)))
+            smaller = load_or_solve_x01(model, 61, cache_dir)
+            self.assertEqual(smaller.init_score, 61)
+            self.assertTrue((smaller.aims == policy.aims[:62]).all())
+            other = AccuracyModel.from_skill(single=0.5)
+            self.assertNotEqual(cache_path(model, cache_dir), cache_path(other, cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+
+from dartscorer.display.null import NullDisplayController
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.common import throw_of, throw_to_events, Multiplier
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+from dartscorer.persistence.codec import CodecError
+from dartscorer.persistence.snapshot import Snapshot, SnapshotKeeper, SnapshotWriter, load_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "snapshot.bin")
+
+    def test_round_trip(self):
+        game = Cricket(3, None, None, scoring=True)
+        game.apply(throw_to_events(throw_of(20, Multiplier.TRIPLE)) * 4 + [Event(EventType.NUMBER, 1)])
+        snapshot = Snapshot.decode(Snapshot.of(game).encode())
+        self.assertEqual(snapshot.config, {"scoring": True})
+        restored = snapshot.new_game()
+        self.assertEqual(restored.state(), game.state())
+        self.assertEqual(restored.points, [120, 0, 0])
+        # the restored game goes on as the original one
+        events = throw_to_events(throw_of(20, Multiplier.TRIPLE)) * 3
+        self.assertEqual(restored.apply(events), game.apply(events))
+
+    def test_damaged(self):
+        data = bytearray(Snapshot.of(GameX01(2, None, None, init_score=301)).encode())
+        self.assertEqual(Snapshot.decode(bytes(data)).config, {"init_score": 301})
+        data[-1] ^= 1
+        with self.assertRaises(CodecError):
+            Snapshot.decode(bytes(data))
+        with open(self.path, "wb") as snapshot_file:
+            snapshot_file.write(data[:10])
+        self.assertIsNone(load_snapshot(self.path))
+        self.assertIsNone(load_snapshot(self.path + ".missing"))
+
+    def test_kept_after_every_throw(self):
+        game = GameX01(2, None, NullDisplayController())
+        keeper = SnapshotKeeper.start(game, self.path, fsync=False)
+        self.assertEqual(load_snapshot(self.path).state, game.state())
+        game.apply(throw_to_events(throw_of(20, Multiplier.TRIPLE)) + [Event(EventType.NUMBER, 5)])
+        self.assertTrue(keeper.flush(5.0))
+        # the unconfirmed digit is not saved yet
+        saved = load_snapshot(self.path).state
+        self.assertEqual(saved.position, 1)
+        self.assertEqual(saved.throws[0], throw_of(20, Multiplier.TRIPLE))
+        self.assertEqual(saved.throws[1].points, 0)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_kept_after_undo_and_redo(self):
+        game = GameX01(2, None, NullDisplayController())
+        keeper = SnapshotKeeper.start(game, self.path, fsync=False)
+        game.apply(throw_to_events(throw_of(20, Multiplier.TRIPLE)))
+        confirmed = game.state()
+        keeper.flush()
+        self.assertEqual(load_snapshot(self.path).state.position, 1)
+        game.apply([Event(EventType.ACTION, Action.UNDO)])
+        keeper.flush()
+        saved = load_snapshot(self.path)
+        self.assertEqual(saved.state, game.state())
+        self.assertEqual(saved.state.position, 0)
+        self.assertEqual(saved.state.throws[0].points, 0)
+        game.apply([Event(EventType.ACTION, Action.REDO)])
+        keeper.flush()
+        self.assertEqual(load_snapshot(self.path).state, confirmed)
+
+    def test_removed_when_over(self):
+        game = GameX01(1, None, NullDisplayController(), init_score=60)
+        with game:
+            SnapshotKeeper.start(game, self.path, fsync=False)
+            game.apply(throw_to_events(throw_of(20, Multiplier.SINGLE)))
+        # the game was left unfinished, it can be resumed
+        self.assertEqual(load_snapshot(self.path).new_game().players, [60])
+        with game:
+            game.apply(throw_to_events(throw_of(20, Multiplier.DOUBLE)))
+        self.assertTrue(game.over())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_latest_written(self):
+        writer = SnapshotWriter(self.path, fsync=False)
+        games = [GameX01(1, None, None, init_score=score) for score in range(101, 1101, 100)]
+        for game in games:
+            writer.write(Snapshot.of(game).encode())
+        writer.close()
+        self.assertEqual(load_snapshot(self.path).config, {"init_score": 1001})
+        writer.remove()
+        self.assertTrue(writer.flush(5.0))
+        self.assertIsNone(load_snapshot(self.path))
+        writer.close()
+
+    def test_restart_is_over(self):
+        game = GameX01(1, None, NullDisplayController())
+        with game:
+            SnapshotKeeper.start(game, self.path, fsync=False)
+            game.apply([Event(EventType.ACTION, Action.RESTART)])
+        self.assertIsNone(load_snapshot(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
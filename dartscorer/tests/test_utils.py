@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+from dartscorer.logic.utils import get_player_names, load_roster, offer_handicap
+from dartscorer.tests.test_common import *
+
+
+class NumberInput:
+    def __init__(self, numbers):
+        self.numbers = list(reversed(numbers))
+
+    def wait_for_next_number(self):
+        return self.numbers.pop()
+
+
+class TestPlayerNames(unittest.TestCase):
+    def setUp(self):
+        RENDERER.clear()
+
+    def test_roster(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "players.txt")
+            self.assertEqual(load_roster(path), [])
+            with open(path, "w") as roster_file:
+                roster_file.write("Ann\n\nBob\n Cid \nAnn\n")
+            self.assertEqual(load_roster(path), ["Ann", "Bob", "Cid"])
+
+    def test_names_picked(self):
+        roster = ["Ann", "Bob", "Cid"]
+        # the fourth player does not exist, Cid cannot play twice
+        names = get_player_names(RENDERER, NumberInput([1, 3, 4, 3, 1]), 2, roster)
+        self.assertEqual(names, ["Cid", "Ann"])
+        self.assertIsNone(get_player_names(RENDERER, NumberInput([2]), 2, roster))
+        # not enough names for everybody
+        self.assertIsNone(get_player_names(RENDERER, NumberInput([]), 4, roster))
+
+    def test_offer_handicap(self):
+        self.assertTrue(offer_handicap(RENDERER, NumberInput([1]), [501, 451]))
+        self.assertEqual(RENDERER.lcd_second_line, "501 451")
+
+
+if __name__ == '__main__':
+    unittest.main()
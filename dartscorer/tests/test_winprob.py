@@ -0,0 +1,130 @@
+import threading
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from dartscorer.input.input_controller import Event, EventType, Action
+from dartscorer.logic.cricket import Cricket
+from dartscorer.logic.game_x01 import GameX01
+
+if np is not None:
+    from dartscorer.sim.accuracy import AccuracyModel
+    from dartscorer.sim.x01 import simulate_x01
+    from dartscorer.sim.winprob import WinProbabilityEstimator, LruCache
+
+
+class Collector:
+    def __init__(self):
+        self.estimates = []
+        self.received = threading.Event()
+
+    def __call__(self, key, probabilities):
+        self.estimates.append((key, probabilities))
+        self.received.set()
+
+    def wait(self):
+        self.received.wait(30)
+        self.received.clear()
+        return self.estimates[-1]
+
+
+def round_events(points):
+    return [Event(EventType.NUMBER, points), Event(EventType.ACTION, Action.CONFIRM)] * 3
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestWinProbability(unittest.TestCase):
+    def test_start_scores(self):
+        model = AccuracyModel.from_skill()
+        results = simulate_x01([model, model], 1000, start_scores=[501, 2], first_player=1)
+        self.assertGreater((results.winners == 1).mean(), 0.9)
+
+    def test_lru_cache(self):
+        cache = LruCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_x01_estimate_is_memoized(self):
+        models = [AccuracyModel.from_skill(), AccuracyModel.from_skill(0.5, 0.1, 0.1, 0.05, 0.2)]
+        collector = Collector()
+        estimator = WinProbabilityEstimator(models, collector, time_budget=0.05, max_rollouts=2000, batch=1000)
+        try:
+            game = GameX01(2, None, None)
+            game.add_listener(estimator)
+            game.apply(round_events(9))
+            key, probabilities = collector.wait()
+            self.assertEqual(key, (GameX01, (474, 501), 1))
+            self.assertAlmostEqual(sum(probabilities), 1.0)
+            self.assertGreater(probabilities[0], probabilities[1])
+
+            other = GameX01(2, None, None)
+            other.add_listener(estimator)
+            other.apply(round_events(9))
+            # cached estimates are delivered synchronously
+            self.assertEqual(collector.estimates[-1], (key, probabilities))
+            self.assertEqual(len(collector.estimates), 2)
+        finally:
+            estimator.close()
+
+    def test_cricket_estimate(self):
+        models = [AccuracyModel.from_skill()] * 2
+        collector = Collector()
+        estimator = WinProbabilityEstimator(models, collector, time_budget=0.05, max_rollouts=2000, batch=1000)
+        try:
+            game = Cricket(2, None, None)
+            game.add_listener(estimator)
+            game.apply([Event(EventType.NUMBER, 2), Event(EventType.NUMBER, 0), Event(EventType.ACTION, Action.TRIPLE),
+                        Event(EventType.ACTION, Action.CONFIRM)] + round_events(0)[:4])
+            key, probabilities = collector.wait()
+            self.assertEqual(key[2], 1)
+            self.assertAlmostEqual(sum(probabilities), 1.0)
+            self.assertGreater(probabilities[0], 0.5)
+            self.assertIsNone(estimator.last_error)
+        finally:
+            estimator.close()
+
+    def test_scoring_cricket_estimate(self):
+        models = [AccuracyModel.from_skill()] * 2
+        collector = Collector()
+        estimator = WinProbabilityEstimator(models, collector, time_budget=0.05, max_rollouts=2000, batch=1000)
+        try:
+            game = Cricket(2, None, None, scoring=True)
+            game.add_listener(estimator)
+            triple_20 = [Event(EventType.NUMBER, 2), Event(EventType.NUMBER, 0), Event(EventType.ACTION, Action.TRIPLE),
+                         Event(EventType.ACTION, Action.CONFIRM)]
+            game.apply(triple_20 * 2 + round_events(0)[:2])
+            key, probabilities = collector.wait()
+            self.assertEqual(key[1][0], (0, 0, 0, 0, 0, 3, 0, 60))
+            self.assertAlmostEqual(sum(probabilities), 1.0)
+            self.assertGreater(probabilities[0], 0.5)
+        finally:
+            estimator.close()
+
+    def test_failure_reported(self):
+        # a model is missing for the third player
+        models = [AccuracyModel.from_skill()] * 2
+        collector = Collector()
+        estimator = WinProbabilityEstimator(models, collector, time_budget=0.05, max_rollouts=2000, batch=1000)
+        try:
+            game = Cricket(3, None, None)
+            game.add_listener(estimator)
+            game.apply(round_events(0))
+            key, probabilities = collector.wait()
+            self.assertEqual(key[2], 1)
+            self.assertIsNone(probabilities)
+            self.assertIsInstance(estimator.last_error, ValueError)
+            self.assertEqual(len(estimator.cache), 0)
+        finally:
+            estimator.close()
+
+
+if __name__ == "__main__":
+    unittest.main()